@@ -0,0 +1,13 @@
+"""Load generation and latency benchmarks for the backend API."""
+
+from __future__ import annotations
+
+__all__ = [
+    "cassette",
+    "cli",
+    "indexing",
+    "runner",
+    "standin",
+    "stats",
+    "workloads",
+]
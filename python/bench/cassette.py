@@ -0,0 +1,404 @@
+"""Record and replay HTTP traffic for repeatable performance tests.
+
+``record`` runs a proxy in front of an upstream (the backend, or the
+Snowflake REST API used by ``describe_agent``) and stores every exchange in
+a SQLite cassette. Bodies are zlib-compressed, and each response keeps its
+chunk boundaries and arrival offsets. ``replay`` serves the cassette
+without the upstream, either with the recorded timing (``--latency
+original``) or as fast as possible (``--latency zero``). Comparing the two
+separates local overhead from Snowflake's latency::
+
+    python -m python.bench.cassette record --upstream http://localhost:4000 --cassette chat.db --port 4100
+    python -m python.bench --backend-url http://localhost:4100 --mix chat=1 --requests 20
+    python -m python.bench.cassette replay --cassette chat.db --port 4100 --latency zero
+
+Requests are matched on method, target and a hash of the body (JSON bodies
+are compared with sorted keys, and the random boundary of multipart bodies
+such as uploads is masked). Repeated identical requests replay their
+recordings in order and wrap around when exhausted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple
+
+from python.cli.httpproxy import ProxyRequest, ProxyServer, ResponseWriter, end_to_end, forward, relay
+from python.cli.rest import RestSession
+
+from .stats import percentile
+
+LATENCY_MODES = ("original", "zero")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    target TEXT NOT NULL,
+    request_body BLOB,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    chunk_sizes TEXT NOT NULL,
+    chunk_offsets_ms TEXT NOT NULL,
+    first_byte_ms REAL NOT NULL,
+    total_ms REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS interactions_key ON interactions (key, seq);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# Never persisted: credentials and per-response bookkeeping.
+_DROPPED_HEADERS = frozenset({"set-cookie", "date", "authorization"})
+
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+
+
+class Interaction(NamedTuple):
+    """One recorded response."""
+
+    status: int
+    headers: List[Tuple[str, str]]
+    chunks: List[bytes]
+    offsets_ms: List[float]
+    first_byte_ms: float
+    total_ms: float
+
+
+def request_content_type(headers: Mapping[str, str]) -> str | None:
+    """The ``Content-Type`` of a request, whatever the header's case."""
+
+    return next((value for name, value in headers.items() if name.lower() == "content-type"), None)
+
+
+def request_key(method: str, target: str, body: bytes, content_type: str | None = None) -> str:
+    """Match key for a request; JSON and multipart bodies are canonicalised first."""
+
+    boundary = _BOUNDARY.search(content_type or "") if (content_type or "").lower().startswith("multipart/") else None
+    if boundary is not None:
+        canonical = body.replace(boundary.group(1).encode("latin-1"), b"BOUNDARY")
+    else:
+        try:
+            canonical = (
+                json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8") if body else b""
+            )
+        except ValueError:
+            canonical = body
+    return f"{method.upper()} {target} {hashlib.sha256(canonical).hexdigest()[:24]}"
+
+
+class Cassette:
+    """SQLite file of recorded interactions, indexed by request key."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+
+        with self._lock:
+            self._db.close()
+
+    def add(
+        self,
+        method: str,
+        target: str,
+        request_body: bytes,
+        status: int,
+        headers: List[Tuple[str, str]],
+        chunks: List[bytes],
+        offsets_ms: List[float],
+        first_byte_ms: float,
+        total_ms: float,
+        *,
+        request_content_type: str | None = None,
+    ) -> int:
+        """Store one exchange; returns its sequence number for the request key."""
+
+        key = request_key(method, target, request_body, request_content_type)
+        kept = [(name, value) for name, value in headers if name.lower() not in _DROPPED_HEADERS]
+        with self._lock, self._db:
+            seq = self._db.execute("SELECT COUNT(*) FROM interactions WHERE key = ?", (key,)).fetchone()[0]
+            self._db.execute(
+                "INSERT INTO interactions (key, seq, method, target, request_body, status, headers, body, "
+                "chunk_sizes, chunk_offsets_ms, first_byte_ms, total_ms, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    seq,
+                    method.upper(),
+                    target,
+                    zlib.compress(request_body, 6),
+                    status,
+                    json.dumps(kept),
+                    zlib.compress(b"".join(chunks), 6),
+                    json.dumps([len(chunk) for chunk in chunks]),
+                    json.dumps([round(offset, 3) for offset in offsets_ms]),
+                    round(first_byte_ms, 3),
+                    round(total_ms, 3),
+                    time.time(),
+                ),
+            )
+        return seq
+
+    def count(self, key: str) -> int:
+        """Number of recordings for ``key``."""
+
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM interactions WHERE key = ?", (key,)).fetchone()[0]
+
+    def get(self, key: str, seq: int) -> Interaction | None:
+        """The ``seq``-th recording for ``key``."""
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, chunk_sizes, chunk_offsets_ms, first_byte_ms, total_ms "
+                "FROM interactions WHERE key = ? AND seq = ?",
+                (key, seq),
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, body, sizes, offsets, first_byte_ms, total_ms = row
+        data = zlib.decompress(body)
+        chunks, position = [], 0
+        for size in json.loads(sizes):
+            chunks.append(data[position : position + size])
+            position += size
+        return Interaction(
+            status, [tuple(pair) for pair in json.loads(headers)], chunks, json.loads(offsets), first_byte_ms, total_ms
+        )
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Record cassette metadata such as the upstream URL."""
+
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-endpoint counts, sizes and recorded latency percentiles."""
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT method, target, first_byte_ms, total_ms, length(body), chunk_sizes FROM interactions"
+            ).fetchall()
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for method, target, first_byte_ms, total_ms, stored, sizes in rows:
+            path = target.split("?", 1)[0]
+            group = groups.setdefault(
+                (method, path),
+                {"method": method, "path": path, "count": 0, "bytes": 0, "stored": 0, "ttfb": [], "total": []},
+            )
+            group["count"] += 1
+            group["bytes"] += sum(json.loads(sizes))
+            group["stored"] += stored
+            group["ttfb"].append(first_byte_ms)
+            group["total"].append(total_ms)
+        summary = []
+        for group in groups.values():
+            ttfb, total = sorted(group.pop("ttfb")), sorted(group.pop("total"))
+            summary.append(
+                {**group, "p50_first_byte_ms": percentile(ttfb, 0.5), "p50_ms": percentile(total, 0.5), "max_ms": total[-1]}
+            )
+        return sorted(summary, key=lambda row: (row["path"], row["method"]))
+
+
+class Recorder:
+    """Proxy app that forwards to ``upstream`` and records each exchange."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        upstream: str,
+        *,
+        session: RestSession | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.cassette = cassette
+        self.upstream = upstream.rstrip("/")
+        self.session = session or RestSession()
+        self.timeout = timeout
+        self.recorded = 0
+        cassette.set_meta("upstream", self.upstream)
+
+    def __call__(self, request: ProxyRequest, writer: ResponseWriter) -> None:
+        started = time.perf_counter()
+        response = forward(self.session, self.upstream, request, timeout=self.timeout)
+        first_byte_ms = (time.perf_counter() - started) * 1000
+        chunks: List[bytes] = []
+        offsets: List[float] = []
+
+        def capture(chunk: bytes) -> None:
+            chunks.append(chunk)
+            offsets.append((time.perf_counter() - started) * 1000)
+
+        relay(response, writer, on_chunk=capture)
+        self.cassette.add(
+            request.method,
+            request.target,
+            request.body,
+            response.status,
+            list(response.headers.items()),
+            chunks,
+            offsets,
+            first_byte_ms,
+            (time.perf_counter() - started) * 1000,
+            request_content_type=request_content_type(request.headers),
+        )
+        self.recorded += 1
+
+
+class Player:
+    """Proxy app that answers from a cassette with original or zero latency."""
+
+    def __init__(self, cassette: Cassette, *, latency: str = "original") -> None:
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown latency mode {latency!r}")
+        self.cassette = cassette
+        self.latency = latency
+        self.hits = 0
+        self.misses = 0
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _take(self, key: str) -> Interaction | None:
+        count = self.cassette.count(key)
+        if not count:
+            return None
+        with self._lock:
+            seq = self._next.get(key, 0)
+            self._next[key] = seq + 1
+        return self.cassette.get(key, seq % count)
+
+    def __call__(self, request: ProxyRequest, writer: ResponseWriter) -> None:
+        started = time.perf_counter()
+        interaction = self._take(
+            request_key(request.method, request.target, request.body, request_content_type(request.headers))
+        )
+        if interaction is None:
+            self.misses += 1
+            writer.send_json(
+                404,
+                {"error": f"No recording for {request.method} {request.target}"},
+                [("X-Cassette", "miss")],
+            )
+            return
+        self.hits += 1
+        original = self.latency == "original"
+
+        def wait_until(offset_ms: float) -> None:
+            remaining = offset_ms / 1000 - (time.perf_counter() - started)
+            if original and remaining > 0:
+                time.sleep(remaining)
+
+        wait_until(interaction.first_byte_ms)
+        headers = [*end_to_end(interaction.headers), ("X-Cassette", "hit")]
+        if len(interaction.chunks) <= 1 and not original:
+            writer.send(interaction.status, headers, b"".join(interaction.chunks))
+            return
+        writer.start(interaction.status, headers)
+        for chunk, offset in zip(interaction.chunks, interaction.offsets_ms):
+            wait_until(offset)
+            writer.write(chunk)
+        wait_until(interaction.total_ms)
+        writer.finish()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    record = subparsers.add_parser("record", help="Proxy an upstream and record its responses.")
+    record.add_argument("--upstream", required=True, help="Base URL to proxy, e.g. http://localhost:4000.")
+    record.add_argument("--timeout", type=float, default=300.0, help="Upstream read timeout in seconds.")
+
+    replay = subparsers.add_parser("replay", help="Serve recorded responses without the upstream.")
+    replay.add_argument("--latency", choices=LATENCY_MODES, default="original", help="Reproduce or drop recorded timing.")
+
+    info = subparsers.add_parser("info", help="Summarise a cassette.")
+
+    for sub in (record, replay, info):
+        sub.add_argument("--cassette", type=Path, required=True, help="Cassette database file.")
+    for sub in (record, replay):
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=4100)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the cassette command."""
+
+    args = parse_args(argv)
+    if args.action != "record" and not args.cassette.exists():
+        raise SystemExit(f"Cassette not found: {args.cassette}")
+
+    with Cassette(args.cassette) as cassette:
+        if args.action == "info":
+            print(f"{'method':<7} {'path':<48} {'count':>6} {'KiB':>9} {'stored':>9} {'p50 ttfb':>9} {'p50 ms':>9} {'max ms':>9}")
+            for row in cassette.summary():
+                print(
+                    f"{row['method']:<7} {row['path'][:48]:<48} {row['count']:>6} {row['bytes'] / 1024:>9.1f} "
+                    f"{row['stored'] / 1024:>9.1f} {row['p50_first_byte_ms']:>9.1f} {row['p50_ms']:>9.1f} {row['max_ms']:>9.1f}"
+                )
+            return 0
+
+        if args.action == "record":
+            app: Any = Recorder(cassette, args.upstream, timeout=args.timeout)
+            message = f"Recording {args.upstream} into {args.cassette}"
+        else:
+            app = Player(cassette, latency=args.latency)
+            message = f"Replaying {args.cassette} with {args.latency} latency"
+        server = ProxyServer((args.host, args.port), app)
+        print(f"{message} on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        if isinstance(app, Recorder):
+            print(f"Recorded {app.recorded} interaction(s)")
+        else:
+            print(f"Replayed {app.hits} interaction(s), {app.misses} miss(es)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "Cassette",
+    "Interaction",
+    "LATENCY_MODES",
+    "Player",
+    "Recorder",
+    "main",
+    "parse_args",
+    "request_content_type",
+    "request_key",
+]
@@ -0,0 +1,109 @@
+"""Benchmark the backend API under concurrent load.
+
+Examples::
+
+    python -m python.bench --mix documents=5,chat=1 --concurrency 8 --duration 30
+    python -m python.bench --mix summarize --rate 4 --duration 60 --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from python.cli.backend import get_backend_url
+from python.cli.rest import RestSession
+
+from .runner import parse_mix, run_closed_loop, run_open_loop
+from .stats import format_table
+from .workloads import DEFAULT_MESSAGE, WorkloadContext
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument(
+        "--mix",
+        default="documents",
+        help="Weighted workloads, e.g. 'documents=5,chat=1'. "
+        "Choices: chat, chat_stream, documents, health, summarize, upload.",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Workers (closed loop) or in-flight cap (open loop).")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Open-loop arrival rate in requests/second; omit for a closed loop.",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Run length in seconds (0 for no limit).")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request read timeout in seconds.")
+    parser.add_argument("--message", default=DEFAULT_MESSAGE, help="Chat message for the chat workloads.")
+    parser.add_argument("--upload-file", type=Path, default=None, help="Document sent by the upload workload.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the mix and arrivals.")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Write the JSON report here ('-' for stdout).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the benchmark command."""
+
+    args = parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    if not args.duration and not args.requests:
+        raise SystemExit("Either --duration or --requests must bound the run.")
+
+    with RestSession(pool_size=max(1, args.concurrency)) as session:
+        ctx = WorkloadContext(
+            base_url=get_backend_url(args.backend_url),
+            session=session,
+            timeout=args.timeout,
+            message=args.message,
+            upload_file=args.upload_file,
+        )
+        if args.rate:
+            report = run_open_loop(
+                ctx,
+                mix,
+                rate=args.rate,
+                concurrency=args.concurrency,
+                duration=args.duration or None,
+                requests=args.requests,
+                seed=args.seed,
+            )
+        else:
+            report = run_closed_loop(
+                ctx,
+                mix,
+                concurrency=args.concurrency,
+                duration=args.duration or None,
+                requests=args.requests,
+                seed=args.seed,
+            )
+
+    rows = [*report["workloads"].items(), ("total", report["total"])]
+    table = format_table(rows)
+    rendered = json.dumps(report, indent=2)
+    if args.json == "-":
+        print(rendered)
+        print(table, file=sys.stderr)
+    else:
+        print(table)
+        if args.json:
+            Path(args.json).write_text(rendered + "\n", encoding="utf-8")
+            print(f"\nWrote JSON report to {args.json}")
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = ["main", "parse_args"]
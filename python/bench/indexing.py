@@ -0,0 +1,175 @@
+"""Benchmark building and querying the offline BM25 search index.
+
+Examples::
+
+    python -m python.bench.indexing --documents 100000
+    python -m python.bench.indexing --documents 20000 --words 300 --json index.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from python.cli.search import SearchIndex
+
+from .stats import percentile
+
+
+def make_vocabulary(size: int, *, seed: int = 11) -> List[str]:
+    """Pronounceable synthetic words; earlier entries are drawn more often."""
+
+    rng = random.Random(seed)
+    consonants, vowels = "bcdfghjklmnprstvz", "aeiou"
+    words: set[str] = set()
+    while len(words) < size:
+        syllables = rng.randint(1, 4)
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(syllables)))
+    return sorted(words, key=lambda word: (len(word), word))
+
+
+def synthetic_corpus(count: int, *, words: int, vocabulary: List[str], seed: int = 7) -> Iterator[Tuple[str, str]]:
+    """Yield ``(file_path, text)`` with Zipf-distributed word frequencies."""
+
+    rng = random.Random(seed)
+    weights = list(accumulate(1.0 / rank for rank in range(1, len(vocabulary) + 1)))
+    for index in range(count):
+        length = max(1, int(rng.gauss(words, words / 4)))
+        yield f"doc_{index:06d}.pdf", " ".join(rng.choices(vocabulary, cum_weights=weights, k=length))
+
+
+def run(
+    path: Path,
+    *,
+    documents: int,
+    words: int,
+    vocabulary_size: int,
+    batch: int,
+    queries: int,
+    update_fraction: float,
+    seed: int,
+) -> Dict[str, Any]:
+    """Build an index at ``path``, query it and apply one incremental update."""
+
+    vocabulary = make_vocabulary(vocabulary_size, seed=seed)
+    rng = random.Random(seed)
+    report: Dict[str, Any] = {"documents": documents, "words_per_document": words, "vocabulary": vocabulary_size}
+
+    with SearchIndex(path) as index:
+        started = time.perf_counter()
+        tokens = 0
+        for position, (file_path, text) in enumerate(synthetic_corpus(documents, words=words, vocabulary=vocabulary, seed=seed), 1):
+            index.add(file_path, text, version="v1")
+            tokens += text.count(" ") + 1
+            if position % batch == 0:
+                index.commit()
+        index.commit()
+        build = time.perf_counter() - started
+        report["build_s"] = round(build, 3)
+        report["build_docs_per_s"] = round(documents / build, 1) if build else None
+        report["build_tokens_per_s"] = round(tokens / build, 1) if build else None
+
+        started = time.perf_counter()
+        index.optimize()
+        report["optimize_s"] = round(time.perf_counter() - started, 3)
+        report["index"] = index.stats()
+        report["index"]["bytes_per_token"] = round(report["index"]["postings_bytes"] / max(1, tokens), 3)
+
+        report["query_ms"] = {}
+        head = vocabulary[:100]
+        tail = vocabulary[1000:] or vocabulary
+        for kind in ("selective", "broad"):
+            latencies: List[float] = []
+            for _ in range(queries):
+                # Selective queries name rare words ("which document mentions X");
+                # broad ones include a top-100 word present in most documents.
+                terms = [rng.choice(tail) for _ in range(rng.randint(1, 2))]
+                if kind == "broad":
+                    terms.append(rng.choice(head))
+                started = time.perf_counter()
+                index.search(" ".join(terms), limit=10)
+                latencies.append((time.perf_counter() - started) * 1000)
+            latencies.sort()
+            report["query_ms"][kind] = {
+                "count": queries,
+                "p50": round(percentile(latencies, 0.50), 3),
+                "p95": round(percentile(latencies, 0.95), 3),
+                "p99": round(percentile(latencies, 0.99), 3),
+                "max": round(latencies[-1], 3) if latencies else None,
+            }
+
+        changed = int(documents * update_fraction)
+        started = time.perf_counter()
+        for file_path, text in synthetic_corpus(changed, words=words, vocabulary=vocabulary, seed=seed + 1):
+            index.add(file_path, text, version="v2")
+        index.commit()
+        report["update"] = {"documents": changed, "seconds": round(time.perf_counter() - started, 3)}
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000, help="Synthetic corpus size.")
+    parser.add_argument("--words", type=int, default=150, help="Mean words per document.")
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="Distinct words in the corpus.")
+    parser.add_argument("--batch", type=int, default=10_000, help="Documents per committed segment.")
+    parser.add_argument("--queries", type=int, default=500, help="Queries to time after the build.")
+    parser.add_argument("--update-fraction", type=float, default=0.01, help="Share of documents re-indexed afterwards.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--index", type=Path, default=None, help="Keep the index here instead of a temporary file.")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Write the JSON report here ('-' for stdout).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the index benchmark."""
+
+    args = parse_args(argv)
+    options = dict(
+        documents=args.documents,
+        words=args.words,
+        vocabulary_size=args.vocabulary,
+        batch=max(1, args.batch),
+        queries=args.queries,
+        update_fraction=args.update_fraction,
+        seed=args.seed,
+    )
+    if args.index is not None:
+        args.index.unlink(missing_ok=True)
+        report = run(args.index, **options)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            report = run(Path(directory) / "search.sqlite", **options)
+
+    print(
+        f"Indexed {report['documents']} documents in {report['build_s']} s "
+        f"({report['build_docs_per_s']} docs/s, {report['build_tokens_per_s']} tokens/s)"
+    )
+    print(
+        f"Index: {report['index']['terms']} terms, {report['index']['postings_bytes']} posting bytes "
+        f"({report['index']['bytes_per_token']} bytes/token), optimize {report['optimize_s']} s"
+    )
+    for kind, query in report["query_ms"].items():
+        print(f"{kind.capitalize()} query latency ms: p50 {query['p50']}  p95 {query['p95']}  p99 {query['p99']}  max {query['max']}")
+    print(f"Incremental update of {report['update']['documents']} documents: {report['update']['seconds']} s")
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = ["main", "make_vocabulary", "parse_args", "run", "synthetic_corpus"]
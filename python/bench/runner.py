@@ -0,0 +1,166 @@
+"""Closed- and open-loop load generation over a weighted workload mix."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from .stats import LatencyRecorder
+from .workloads import WORKLOADS, WorkloadContext
+
+Mix = List[Tuple[str, float]]
+
+
+def parse_mix(spec: str) -> Mix:
+    """Parse ``name[=weight],...`` into a weighted workload list."""
+
+    mix: Mix = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise ValueError(f"Unknown workload {name!r}; choose from {', '.join(sorted(WORKLOADS))}.")
+        value = float(weight) if weight else 1.0
+        if value <= 0:
+            raise ValueError(f"Workload weight must be positive: {item}")
+        mix.append((name, value))
+    if not mix:
+        raise ValueError("At least one workload is required.")
+    return mix
+
+
+class BenchRun:
+    """State shared by the workers of one benchmark run."""
+
+    def __init__(self, ctx: WorkloadContext, mix: Mix, *, requests: int | None, seed: int | None) -> None:
+        self.ctx = ctx
+        self.names = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.recorders: Dict[str, LatencyRecorder] = {name: LatencyRecorder() for name in self.names}
+        self.limit = requests
+        self.issued = 0
+        self.elapsed = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def claim(self) -> str | None:
+        """Reserve the next request slot, returning its workload or ``None`` when done."""
+
+        with self._lock:
+            if self.limit is not None and self.issued >= self.limit:
+                return None
+            self.issued += 1
+            return self._random.choices(self.names, self.weights)[0]
+
+    def interarrival(self, rate: float) -> float:
+        """Exponentially distributed gap for a Poisson arrival process."""
+
+        with self._lock:
+            return self._random.expovariate(rate)
+
+    def execute(self, name: str, started: float) -> None:
+        """Run one request; latency is measured from ``started``."""
+
+        ok = True
+        nbytes = 0
+        try:
+            nbytes = WORKLOADS[name](self.ctx)
+        except Exception:  # noqa: BLE001 - any failure is an errored sample, never a lost one
+            ok = False
+        self.recorders[name].record(time.perf_counter() - started, ok=ok, nbytes=nbytes)
+
+    def report(self, *, mode: str, concurrency: int, rate: float | None) -> Dict[str, Any]:
+        """Summaries per workload plus the combined total."""
+
+        total = LatencyRecorder()
+        for recorder in self.recorders.values():
+            for sample in recorder.samples:
+                total.record(sample)
+            total.errors += recorder.errors
+            total.bytes += recorder.bytes
+        return {
+            "mode": mode,
+            "concurrency": concurrency,
+            "rate": rate,
+            "elapsed_s": round(self.elapsed, 3),
+            "workloads": {name: recorder.summary(self.elapsed) for name, recorder in self.recorders.items()},
+            "total": total.summary(self.elapsed),
+        }
+
+
+def run_closed_loop(
+    ctx: WorkloadContext,
+    mix: Mix,
+    *,
+    concurrency: int,
+    duration: float | None,
+    requests: int | None = None,
+    seed: int | None = None,
+) -> Dict[str, Any]:
+    """Each of ``concurrency`` workers issues its next request as soon as the last completes."""
+
+    run = BenchRun(ctx, mix, requests=requests, seed=seed)
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    def worker() -> None:
+        while deadline is None or time.perf_counter() < deadline:
+            name = run.claim()
+            if name is None:
+                return
+            run.execute(name, time.perf_counter())
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, concurrency))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    run.elapsed = time.perf_counter() - started
+    return run.report(mode="closed", concurrency=concurrency, rate=None)
+
+
+def run_open_loop(
+    ctx: WorkloadContext,
+    mix: Mix,
+    *,
+    rate: float,
+    concurrency: int,
+    duration: float | None,
+    requests: int | None = None,
+    seed: int | None = None,
+) -> Dict[str, Any]:
+    """Issue requests on a Poisson schedule of ``rate`` per second.
+
+    Latency is measured from each request's scheduled arrival, so time spent
+    queued behind a saturated backend counts (no coordinated omission).
+    """
+
+    if rate <= 0:
+        raise ValueError("Open-loop rate must be positive.")
+    run = BenchRun(ctx, mix, requests=requests, seed=seed)
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+    next_arrival = started
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while True:
+            next_arrival += run.interarrival(rate)
+            if deadline is not None and next_arrival >= deadline:
+                break
+            name = run.claim()
+            if name is None:
+                break
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run.execute, name, next_arrival)
+    run.elapsed = time.perf_counter() - started
+    return run.report(mode="open", concurrency=concurrency, rate=rate)
+
+
+__all__ = ["BenchRun", "Mix", "parse_mix", "run_closed_loop", "run_open_loop"]
@@ -0,0 +1,568 @@
+"""Local Snowflake stand-in for offline performance testing.
+
+Emulates the parts of Snowflake this project talks to:
+
+* the agents REST endpoints used by ``describe_agent``
+  (``/api/v2/databases/<db>/schemas/<schema>/agents[/<name>]``);
+* the SQL API (``POST /api/v2/statements``);
+* the driver protocol used by ``snowflake-sdk`` in the backend
+  (``/session/v1/login-request``, ``/queries/v1/query-request``), so the
+  backend can be pointed at it with ``SNOWFLAKE_ACCESS_URL``.
+
+Statements are answered from a synthetic in-memory document set. Only the
+shapes the project issues are understood: ``DESCRIBE AGENT``,
+``SNOWFLAKE.CORTEX.AGENT``, ``AI_COMPLETE``, ``SELECT ... FROM
+SFE_DOCUMENT_METADATA``, the agent tool procedures and ``ALTER STAGE``.
+``PUT`` is not emulated because the driver transfers files client side.
+
+Run with ``python -m python.bench.standin --port 8099 --latency agent=1500``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Sequence, Tuple
+
+DEFAULT_PORT = 8099
+
+_WORDS = (
+    "revenue growth region supply chain risk forecast contract clause renewal "
+    "liability pilot programme customer churn margin audit compliance policy "
+    "invoice vendor payment schedule milestone delivery warranty termination "
+    "quarterly annual report findings recommendation strategy budget headcount"
+).split()
+
+_LITERAL = re.compile(r"'((?:[^']|'')*)'")
+_PLACEHOLDER = re.compile(r"'(?:[^']|'')*'|\?")
+_CONDITION = re.compile(r"(\w+)\s*(>=|<=|=|>|<)\s*'((?:[^']|'')*)'")
+_SELECT_ITEM = re.compile(r"^(?P<expr>.+?)(?:\s+AS\s+(?P<alias>\w+))?$", re.IGNORECASE | re.DOTALL)
+_FUNCTION = re.compile(r"^(?P<name>\w+)\s*\(\s*(?P<arg>[\w*]+)\s*(?:,\s*'[^']*'\s*)?\)$", re.IGNORECASE)
+
+
+class StatementError(Exception):
+    """A statement the stand-in cannot answer."""
+
+
+def _unquote(value: str) -> str:
+    return value.replace("''", "'")
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not nested in parentheses or quotes."""
+
+    items, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            items.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        items.append("".join(current).strip())
+    return items
+
+
+def _bind(sql: str, bindings: Sequence[Any]) -> str:
+    """Replace each ``?`` outside a quoted literal with the next binding."""
+
+    values = iter(bindings)
+    missing = object()
+
+    def replace(match: re.Match[str]) -> str:
+        value = next(values, missing) if match.group() == "?" else missing
+        if value is missing:
+            return match.group()
+        return "NULL" if value is None else "'" + str(value).replace("'", "''") + "'"
+
+    return _PLACEHOLDER.sub(replace, sql)
+
+
+def make_documents(count: int, *, seed: int = 7, words: int = 400) -> List[Dict[str, Any]]:
+    """Build a deterministic synthetic ``SFE_DOCUMENT_METADATA`` table."""
+
+    rng = random.Random(seed)
+    start = datetime(2025, 11, 1)
+    rows = []
+    for index in range(count):
+        paragraphs = []
+        remaining = words
+        while remaining > 0:
+            size = min(remaining, rng.randint(40, 120))
+            paragraphs.append(" ".join(rng.choice(_WORDS) for _ in range(size)).capitalize() + ".")
+            remaining -= size
+        text = "\n\n".join(paragraphs)
+        stamp = start + timedelta(minutes=index)
+        name = f"doc_{index:05d}.pdf"
+        rows.append(
+            {
+                "FILE_PATH": name,
+                "FILE_NAME": name,
+                "FILE_SIZE": len(text) * 3,
+                "LAST_MODIFIED": stamp.isoformat(sep=" "),
+                "PAGE_COUNT": max(1, len(text) // 3000),
+                "EXTRACTION_TIMESTAMP": (stamp + timedelta(seconds=45)).isoformat(sep=" "),
+                "EXTRACTED_TEXT": text,
+            }
+        )
+    return rows
+
+
+class StandInState:
+    """Configuration, data and counters shared by all request handlers."""
+
+    def __init__(
+        self,
+        *,
+        documents: List[Dict[str, Any]],
+        agents_per_schema: int = 1,
+        spec_kb: int = 4,
+        latency_ms: Dict[str, float] | None = None,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.documents = documents
+        self.agents_per_schema = max(1, agents_per_schema)
+        self.spec_kb = spec_kb
+        self.latency_ms = latency_ms or {}
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.counts: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, kind: str) -> None:
+        """Sleep for the configured latency of ``kind`` (or the default)."""
+
+        base = self.latency_ms.get(kind, self.latency_ms.get("default", 0.0))
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        pause = max(0.0, base + jitter) / 1000
+        if pause:
+            time.sleep(pause)
+
+    def should_fail(self, kind: str) -> bool:
+        """Count the request and decide whether to inject an error."""
+
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    # -- agents REST --------------------------------------------------------------
+
+    def agent_names(self) -> List[str]:
+        return ["DoctorChris"] + [f"AGENT_{index:03d}" for index in range(1, self.agents_per_schema)]
+
+    def agent_spec(self, database: str, schema: str, name: str) -> Dict[str, Any]:
+        """A describe response padded to roughly ``spec_kb`` kilobytes."""
+
+        padding = " ".join(_WORDS) + " "
+        instructions = (padding * (self.spec_kb * 1024 // len(padding) + 1))[: self.spec_kb * 1024]
+        return {
+            "name": name,
+            "database_name": database,
+            "schema_name": schema,
+            "comment": "Stand-in Cortex Agent",
+            "profile": {"display_name": name},
+            "instructions": {"response": instructions, "orchestration": "Use the tools."},
+            "models": {"orchestration": "claude-4-sonnet"},
+            "tools": [
+                {"tool_spec": {"type": "cortex_search", "name": "DOCUMENT_SEARCH"}},
+                {"tool_spec": {"type": "generic", "name": "ANSWER_DOCUMENT_QUESTION"}},
+                {"tool_spec": {"type": "generic", "name": "TRANSLATE_DOCUMENT"}},
+            ],
+            "created_on": "2025-11-25T00:00:00Z",
+        }
+
+    # -- SQL ------------------------------------------------------------------------
+
+    def execute(self, sql: str, bindings: Sequence[Any] = ()) -> Tuple[str, List[str], List[List[Any]]]:
+        """Answer a statement; returns ``(kind, columns, rows)``."""
+
+        sql = _bind(sql, bindings)
+        normalised = " ".join(sql.split())
+        upper = normalised.upper()
+        literals = [_unquote(match) for match in _LITERAL.findall(normalised)]
+
+        if upper.startswith("DESCRIBE AGENT"):
+            name = normalised.split()[-1].split(".")[-1]
+            spec = self.agent_spec("DB", "SCHEMA", name)
+            return "describe", ["property", "value"], [[key, json.dumps(value)] for key, value in spec.items()]
+        if "SNOWFLAKE.CORTEX.AGENT(" in upper:
+            message = literals[1] if len(literals) > 1 else ""
+            answer = json.dumps({"content": f"Stand-in answer to: {message}"})
+            return "agent", [self._alias(normalised, "RESPONSE")], [[answer]]
+        if "AI_COMPLETE(" in upper:
+            text = literals[-1] if literals else ""
+            words = text.split()
+            summary = f"Stand-in summary of {len(text)} characters: " + " ".join(words[:40])
+            return "complete", [self._alias(normalised, "SUMMARY")], [[summary]]
+        if upper.startswith("CALL TRANSLATE_DOCUMENT"):
+            path, language = (literals + ["", ""])[:2]
+            text = self._document_text(path)
+            return "translate", ["TRANSLATE_DOCUMENT"], [[f"[{language}] {text[:2000]}"]]
+        if upper.startswith("CALL ANSWER_DOCUMENT_QUESTION"):
+            question = literals[0] if literals else ""
+            return "answer", ["ANSWER_DOCUMENT_QUESTION"], [[f"Stand-in answer to: {question}"]]
+        if "FROM SFE_DOCUMENT_METADATA" in upper:
+            columns, rows = self._select_documents(normalised)
+            return "documents", columns, rows
+        if upper.startswith(("ALTER ", "USE ", "SELECT 1")):
+            return "status", ["status"], [["Statement executed successfully."]]
+        raise StatementError(f"Stand-in does not support statement: {normalised[:80]}")
+
+    @staticmethod
+    def _alias(sql: str, default: str) -> str:
+        match = re.search(r"\)\s+AS\s+(\w+)", sql, re.IGNORECASE)
+        return match.group(1).upper() if match else default
+
+    def _document_text(self, path: str) -> str:
+        for row in self.documents:
+            if row["FILE_PATH"] == path:
+                return row["EXTRACTED_TEXT"]
+        return ""
+
+    def _select_documents(self, sql: str) -> Tuple[List[str], List[List[Any]]]:
+        match = re.match(
+            r"SELECT (?P<select>.+?) FROM SFE_DOCUMENT_METADATA"
+            r"(?: WHERE (?P<where>.+?))?(?: ORDER BY (?P<order>\w+)(?P<desc> DESC| ASC)?)?(?: LIMIT (?P<limit>\d+))?\s*;?$",
+            sql,
+            re.IGNORECASE,
+        )
+        if not match:
+            raise StatementError("Unsupported SFE_DOCUMENT_METADATA query shape.")
+
+        rows = self.documents
+        for column, operator, raw in _CONDITION.findall(match.group("where") or ""):
+            column, value = column.upper(), _unquote(raw)
+            compare = {
+                "=": lambda a: a == value,
+                ">": lambda a: a > value,
+                ">=": lambda a: a >= value,
+                "<": lambda a: a < value,
+                "<=": lambda a: a <= value,
+            }[operator]
+            rows = [row for row in rows if compare(str(row.get(column, "")))]
+        if match.group("order"):
+            key = match.group("order").upper()
+            rows = sorted(rows, key=lambda row: row.get(key) or "", reverse=(match.group("desc") or "").strip().upper() == "DESC")
+        if match.group("limit"):
+            rows = rows[: int(match.group("limit"))]
+
+        columns: List[str] = []
+        getters = []
+        aggregate = False
+        for item in _split_top_level(match.group("select")):
+            parts = _SELECT_ITEM.match(item.strip())
+            expr = parts.group("expr").strip() if parts else item
+            alias = parts.group("alias") if parts else None
+            function = _FUNCTION.match(expr)
+            if function:
+                name, arg = function.group("name").upper(), function.group("arg").upper()
+                columns.append((alias or f"{name}({arg})").upper())
+                if name == "LENGTH":
+                    getters.append(lambda row, arg=arg: len(row.get(arg) or ""))
+                elif name == "SHA2":
+                    getters.append(
+                        lambda row, arg=arg: None
+                        if row.get(arg) is None
+                        else hashlib.sha256(str(row[arg]).encode("utf-8")).hexdigest()
+                    )
+                elif name == "TO_VARCHAR":
+                    getters.append(lambda row, arg=arg: None if row.get(arg) is None else str(row[arg]))
+                elif name in ("COUNT", "MAX", "MIN"):
+                    aggregate = True
+                    getters.append((name, arg))
+                else:
+                    raise StatementError(f"Unsupported function {name}.")
+            else:
+                column = expr.upper()
+                columns.append((alias or column).upper())
+                getters.append(lambda row, column=column: row.get(column))
+
+        if aggregate:
+            values: List[Any] = []
+            for getter in getters:
+                if not isinstance(getter, tuple):
+                    values.append(getter(rows[0]) if rows else None)
+                    continue
+                name, arg = getter
+                if name == "COUNT":
+                    values.append(len(rows))
+                else:
+                    present = [row[arg] for row in rows if row.get(arg) is not None]
+                    values.append((max if name == "MAX" else min)(present) if present else None)
+            return columns, [values]
+        return columns, [[getter(row) for getter in getters] for row in rows]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StandInServer"
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+    # -- helpers ----------------------------------------------------------------------
+
+    def _send_json(self, status: int, payload: Any, headers: Dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        if "gzip" in (self.headers.get("Accept-Encoding") or "") and len(body) > 1024:
+            body = gzip.compress(body, compresslevel=5)
+            headers = {**(headers or {}), "Content-Encoding": "gzip"}
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if (self.headers.get("Content-Encoding") or "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+        return json.loads(raw) if raw else {}
+
+    # -- routes -----------------------------------------------------------------------
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        state = self.server.state
+        path = urllib.parse.urlsplit(self.path).path
+        parts = [urllib.parse.unquote_plus(part) for part in path.strip("/").split("/")]
+        if path == "/__standin/stats":
+            self._send_json(200, {"counts": state.counts})
+            return
+        if len(parts) in (7, 8) and parts[:3] == ["api", "v2", "databases"] and parts[4] == "schemas" and parts[6] == "agents":
+            kind = "list_agents" if len(parts) == 7 else "describe_agent"
+            failed = state.should_fail(kind)
+            state.delay(kind)
+            if failed:
+                self._send_json(503, {"code": "390001", "message": "Injected stand-in failure"})
+                return
+            database, schema = parts[3], parts[5]
+            if len(parts) == 7:
+                self._send_json(200, [{"name": name, "database_name": database, "schema_name": schema} for name in state.agent_names()])
+                return
+            if parts[7] not in state.agent_names():
+                self._send_json(404, {"code": "399504", "message": f"Agent '{parts[7]}' does not exist."})
+                return
+            etag = f'"{database}.{schema}.{parts[7]}.{state.spec_kb}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send_json(200, state.agent_spec(database, schema, parts[7]), {"ETag": etag})
+            return
+        self._send_json(404, {"message": f"Unknown stand-in path {path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        path = urllib.parse.urlsplit(self.path).path
+        if path == "/api/v2/statements":
+            self._sql_api()
+        elif path == "/session/v1/login-request":
+            self._read_json()
+            self._send_json(
+                200,
+                {
+                    "success": True,
+                    "data": {
+                        "token": "standin-session-token",
+                        "masterToken": "standin-master-token",
+                        "validityInSeconds": 3600,
+                        "masterValidityInSeconds": 14400,
+                        "sessionId": 1,
+                        "parameters": [],
+                        "sessionInfo": {"databaseName": None, "schemaName": None, "warehouseName": None, "roleName": None},
+                    },
+                },
+            )
+        elif path == "/queries/v1/query-request":
+            self._driver_query()
+        elif path in ("/session/heartbeat", "/session/token-request", "/session"):
+            self._read_json()
+            self._send_json(200, {"success": True, "data": {}})
+        else:
+            self._send_json(404, {"message": f"Unknown stand-in path {path}"})
+
+    def _run(self, sql: str, bindings: Sequence[Any]) -> Tuple[str, List[str], List[List[Any]]]:
+        state = self.server.state
+        kind, columns, rows = state.execute(sql, bindings)
+        failed = state.should_fail(kind)
+        state.delay(kind)
+        if failed:
+            raise StatementError("Injected stand-in failure")
+        return kind, columns, rows
+
+    def _sql_api(self) -> None:
+        request = self._read_json()
+        bindings_map = request.get("bindings") or {}
+        bindings = [bindings_map[key]["value"] for key in sorted(bindings_map, key=int)]
+        try:
+            _, columns, rows = self._run(request.get("statement", ""), bindings)
+        except StatementError as exc:
+            self._send_json(422, {"code": "002003", "sqlState": "02000", "message": str(exc)})
+            return
+        self._send_json(
+            200,
+            {
+                "code": "090001",
+                "statementHandle": str(uuid.uuid4()),
+                "message": "Statement executed successfully.",
+                "resultSetMetaData": {
+                    "numRows": len(rows),
+                    "format": "jsonv2",
+                    "rowType": [{"name": name, "type": "text", "nullable": True} for name in columns],
+                },
+                "data": [[None if value is None else str(value) for value in row] for row in rows],
+            },
+        )
+
+    def _driver_query(self) -> None:
+        request = self._read_json()
+        binds = request.get("bindings") or {}
+        bindings = [binds[key]["value"] for key in sorted(binds, key=int)] if isinstance(binds, dict) else list(binds)
+        try:
+            _, columns, rows = self._run(request.get("sqlText", ""), bindings)
+        except StatementError as exc:
+            self._send_json(200, {"success": False, "code": "002003", "message": str(exc), "data": {"sqlState": "02000"}})
+            return
+        self._send_json(
+            200,
+            {
+                "success": True,
+                "data": {
+                    "queryId": str(uuid.uuid4()),
+                    "rowtype": [
+                        {"name": name, "type": "text", "nullable": True, "length": 16777216, "scale": None, "precision": None, "byteLength": 16777216}
+                        for name in columns
+                    ],
+                    "rowset": [[None if value is None else str(value) for value in row] for row in rows],
+                    "total": len(rows),
+                    "returned": len(rows),
+                    "statementTypeId": 4096,
+                    "parameters": [],
+                },
+            },
+        )
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying the stand-in state."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: StandInState) -> None:
+        super().__init__(address, _Handler)
+        self.state = state
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(state: StandInState, *, host: str = "127.0.0.1", port: int = 0) -> StandInServer:
+    """Start a stand-in on a background thread and return it."""
+
+    server = StandInServer((host, port), state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_latency(spec: str | None) -> Dict[str, float]:
+    """Parse ``kind=ms,...`` (or a bare number for every kind)."""
+
+    latency: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        kind, _, value = item.rpartition("=")
+        latency[kind.strip() or "default"] = float(value)
+    return latency
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--documents", type=int, default=50, help="Number of synthetic documents.")
+    parser.add_argument("--words", type=int, default=400, help="Words of extracted text per document.")
+    parser.add_argument("--agents", type=int, default=1, help="Agents listed in every schema.")
+    parser.add_argument("--spec-kb", type=int, default=4, help="Approximate size of each agent description.")
+    parser.add_argument(
+        "--latency",
+        default=None,
+        help="Latency in ms, e.g. '20' or 'default=20,agent=1500,complete=800,documents=50'. "
+        "Kinds: list_agents, describe_agent, describe, agent, complete, translate, answer, documents, status.",
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter in ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail.")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the stand-in server."""
+
+    args = parse_args(argv)
+    state = StandInState(
+        documents=make_documents(args.documents, words=args.words),
+        agents_per_schema=args.agents,
+        spec_kb=args.spec_kb,
+        latency_ms=parse_latency(args.latency),
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server = StandInServer((args.host, args.port), state)
+    print(f"Snowflake stand-in listening on {server.url}")
+    print(f"  describe-agent: --base-url {server.url}")
+    print(f"  backend:        SNOWFLAKE_ACCESS_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "StandInServer",
+    "StandInState",
+    "StatementError",
+    "main",
+    "make_documents",
+    "parse_args",
+    "parse_latency",
+    "start_server",
+]
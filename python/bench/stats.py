@@ -0,0 +1,95 @@
+"""Latency recording and percentile reporting."""
+
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence
+
+from python.cli.stats import DEFAULT_BUCKETS, percentile
+
+
+class LatencyRecorder:
+    """Thread-safe collection of latency samples for one workload."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.samples = array("d")
+        self.errors = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, *, ok: bool = True, nbytes: int = 0) -> None:
+        """Add one completed request."""
+
+        with self._lock:
+            self.samples.append(seconds)
+            self.bytes += nbytes
+            if not ok:
+                self.errors += 1
+
+    def histogram(self) -> List[Dict[str, Any]]:
+        """Cumulative bucket counts, Prometheus style."""
+
+        values = sorted(self.samples)
+        counts = []
+        index = 0
+        for bound in self.buckets:
+            while index < len(values) and values[index] <= bound:
+                index += 1
+            counts.append({"le": bound, "count": index})
+        counts.append({"le": "+Inf", "count": len(values)})
+        return counts
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """Throughput, error and percentile figures over ``elapsed`` seconds."""
+
+        values = sorted(self.samples)
+        count = len(values)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "throughput_rps": round(count / elapsed, 3) if elapsed else 0.0,
+            "bytes": self.bytes,
+            "mean_ms": round(sum(values) / count * 1000, 2) if count else None,
+            "p50_ms": _ms(percentile(values, 0.50)),
+            "p95_ms": _ms(percentile(values, 0.95)),
+            "p99_ms": _ms(percentile(values, 0.99)),
+            "max_ms": _ms(values[-1]) if count else None,
+            "histogram": self.histogram(),
+        }
+
+
+def _ms(seconds: float) -> float | None:
+    return None if math.isnan(seconds) else round(seconds * 1000, 2)
+
+
+def format_table(rows: Iterable[tuple[str, Dict[str, Any]]]) -> str:
+    """Render summaries as an aligned terminal table."""
+
+    header = ("workload", "requests", "errors", "rps", "p50 ms", "p95 ms", "p99 ms", "max ms")
+    lines = [header]
+    for name, summary in rows:
+        lines.append(
+            (
+                name,
+                str(summary["requests"]),
+                str(summary["errors"]),
+                f"{summary['throughput_rps']:.2f}",
+                *(
+                    "-" if summary[key] is None else f"{summary[key]:.1f}"
+                    for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+                ),
+            )
+        )
+    widths = [max(len(line[column]) for line in lines) for column in range(len(header))]
+    rendered = [
+        "  ".join(cell.ljust(width) if column == 0 else cell.rjust(width) for column, (cell, width) in enumerate(zip(line, widths)))
+        for line in lines
+    ]
+    rendered.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(rendered)
+
+
+__all__ = ["DEFAULT_BUCKETS", "LatencyRecorder", "format_table", "percentile"]
@@ -0,0 +1,132 @@
+"""Single-request workloads against the Express backend endpoints."""
+
+from __future__ import annotations
+
+import http.client
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict
+
+from python.cli.backend import request_json
+from python.cli.chat import SSEEvent, SSEParser
+from python.cli.rest import RestSession
+from python.cli.upload import MultipartFile
+
+DEFAULT_MESSAGE = "What are the main findings in the uploaded report?"
+DEFAULT_SUMMARY_TEXT = (
+    "The quarterly report describes revenue growth across all regions, "
+    "highlights supply chain risks and recommends expanding the pilot programme. "
+) * 20
+
+
+@dataclass
+class WorkloadContext:
+    """Shared settings for every request issued by a benchmark run."""
+
+    base_url: str
+    session: RestSession
+    timeout: float | None = None
+    message: str = DEFAULT_MESSAGE
+    summary_text: str = DEFAULT_SUMMARY_TEXT
+    upload_file: Path | None = None
+
+
+Workload = Callable[[WorkloadContext], int]
+
+
+def _post(ctx: WorkloadContext, path: str, payload: Dict[str, object]) -> int:
+    result = request_json(
+        "POST",
+        f"{ctx.base_url}{path}",
+        payload=payload,
+        session=ctx.session,
+        timeout=ctx.timeout,
+    )
+    return len(json.dumps(result))
+
+
+def chat(ctx: WorkloadContext) -> int:
+    """``POST /api/chat`` with the configured message."""
+
+    return _post(ctx, "/api/chat", {"message": ctx.message})
+
+
+def _is_error(event: SSEEvent) -> bool:
+    try:
+        data = json.loads(event.data) if event.data.strip() else None
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("type") == "error"
+
+
+def chat_stream(ctx: WorkloadContext) -> int:
+    """``POST /api/chat/stream`` and drain the SSE stream."""
+
+    body = json.dumps({"message": ctx.message}).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+    received = 0
+    parser = SSEParser()
+    try:
+        with ctx.session.post(
+            f"{ctx.base_url}/api/chat/stream", headers=headers, body=body, timeout=ctx.timeout
+        ) as response:
+            if response.status >= 400:
+                raise RuntimeError(f"Backend error {response.status}: {response.text(errors='ignore')}")
+            for chunk in response.iter_chunks():
+                received += len(chunk)
+                if any(_is_error(event) for event in parser.feed(chunk)):
+                    raise RuntimeError("Agent stream reported an error event")
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"Failed to reach backend: {exc}") from exc
+    return received
+
+
+def upload(ctx: WorkloadContext) -> int:
+    """``POST /api/upload`` of the configured sample document."""
+
+    if ctx.upload_file is None:
+        raise RuntimeError("The upload workload needs --upload-file.")
+    multipart = MultipartFile(ctx.upload_file)
+    request_json(
+        "POST",
+        f"{ctx.base_url}/api/upload",
+        body=multipart,
+        headers=multipart.headers,
+        session=ctx.session,
+        timeout=ctx.timeout,
+    )
+    return multipart.size
+
+
+def documents(ctx: WorkloadContext) -> int:
+    """``GET /api/documents``."""
+
+    result = request_json("GET", f"{ctx.base_url}/api/documents", session=ctx.session, timeout=ctx.timeout)
+    return len(json.dumps(result))
+
+
+def summarize(ctx: WorkloadContext) -> int:
+    """``POST /api/summarize`` with inline content."""
+
+    return _post(ctx, "/api/summarize", {"content": ctx.summary_text})
+
+
+def health(ctx: WorkloadContext) -> int:
+    """``GET /health``."""
+
+    result = request_json("GET", f"{ctx.base_url}/health", session=ctx.session, timeout=ctx.timeout)
+    return len(json.dumps(result))
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "chat": chat,
+    "chat_stream": chat_stream,
+    "documents": documents,
+    "health": health,
+    "summarize": summarize,
+    "upload": upload,
+}
+
+
+__all__ = ["WORKLOADS", "Workload", "WorkloadContext"]
@@ -5,6 +5,28 @@ from __future__ import annotations
 __all__ = [
     "setup",
     "deploy",
+    "httpproxy",
     "describe_agent",
+    "upload",
+    "chat",
+    "chatcache",
+    "summarize",
+    "mirror",
+    "monitor",
+    "search",
+    "ask",
+    "translate",
+    "check",
+    "profiles",
+    "auth",
+    "backend",
+    "cache",
+    "dedup",
+    "jsonstream",
+    "profiling",
+    "rest",
+    "sqlapi",
+    "summarycache",
+    "supervisor",
 ]
 
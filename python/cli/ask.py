@@ -0,0 +1,260 @@
+"""Answer questions from the passages most relevant to them.
+
+``ANSWER_DOCUMENT_QUESTION`` sends the first 2,000 characters of the five
+newest documents whatever the question. This command ranks passages of the
+mirrored text against the question with BM25. It packs only the best
+passages into a token budget and sends that compact context through
+``/api/summarize``. Every passage is labelled with its document and
+character offsets, so the answer can cite them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence
+
+from .backend import get_backend_url, request_json
+from .mirror import DocumentMirror, default_mirror_path
+from .search import BM25_B, BM25_K1, SearchIndex, default_index_path, tokenize
+from .summarize import SERVER_CONTENT_LIMIT
+
+DEFAULT_PASSAGE_CHARS = 800
+DEFAULT_PASSAGE_OVERLAP = 120
+DEFAULT_TOKEN_BUDGET = 3000
+DEFAULT_TOP_K = 8
+DEFAULT_CANDIDATES = 25
+CHARS_PER_TOKEN = 4
+
+ANSWER_PROMPT = (
+    "Answer the question using only the numbered passages below. Cite the passages you use "
+    "with their [n] labels. If the passages do not contain the answer, say so.\n\nQuestion: {question}"
+)
+
+_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+
+class Passage(NamedTuple):
+    """A span of one document's extracted text."""
+
+    file_path: str
+    start: int
+    end: int
+    text: str
+
+
+def split_passages(
+    file_path: str,
+    text: str,
+    *,
+    size: int = DEFAULT_PASSAGE_CHARS,
+    overlap: int = DEFAULT_PASSAGE_OVERLAP,
+) -> List[Passage]:
+    """Cut ``text`` into overlapping passages that end on sentence boundaries where possible."""
+
+    passages: List[Passage] = []
+    length = len(text)
+    start = 0
+    while start < length:
+        end = min(length, start + size)
+        if end < length:
+            boundaries = [match.end() for match in _BOUNDARY.finditer(text, start + size // 2, end)]
+            if boundaries:
+                end = boundaries[-1]
+            else:
+                space = text.rfind(" ", start + size // 2, end)
+                end = space + 1 if space > 0 else end
+        chunk = text[start:end].strip()
+        if chunk:
+            offset = start + (len(text[start:end]) - len(text[start:end].lstrip()))
+            passages.append(Passage(file_path, offset, offset + len(chunk), chunk))
+        if end >= length:
+            break
+        start = max(start + 1, end - overlap)
+        space = text.find(" ", start, end)
+        if 0 <= space < end:
+            start = space + 1
+    return passages
+
+
+def rank_passages(passages: Sequence[Passage], question: str) -> List[tuple[float, Passage]]:
+    """Score ``passages`` against ``question`` with BM25; best first, zero scores dropped."""
+
+    terms = set(tokenize(question))
+    if not passages or not terms:
+        return []
+    counts = [Counter(token for token in tokenize(passage.text) if token in terms) for passage in passages]
+    lengths = [len(tokenize(passage.text)) for passage in passages]
+    average = sum(lengths) / len(lengths) or 1.0
+    total = len(passages)
+    df = Counter(term for count in counts for term in count)
+    scored = []
+    for passage, count, length in zip(passages, counts, lengths):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+        score = sum(
+            math.log(1 + (total - df[term] + 0.5) / (df[term] + 0.5)) * tf * (BM25_K1 + 1) / (tf + norm)
+            for term, tf in count.items()
+        )
+        if score > 0:
+            scored.append((score, passage))
+    scored.sort(key=lambda item: (-item[0], item[1].file_path, item[1].start))
+    return scored
+
+
+def pack_passages(ranked: Iterable[tuple[float, Passage]], *, top_k: int, token_budget: int) -> List[Passage]:
+    """Take the best passages that fit ``token_budget``, skipping overlapping spans."""
+
+    budget = min(token_budget * CHARS_PER_TOKEN, SERVER_CONTENT_LIMIT)
+    chosen: List[Passage] = []
+    used = 0
+    for _, passage in ranked:
+        if len(chosen) >= top_k:
+            break
+        if any(
+            other.file_path == passage.file_path and other.start < passage.end and passage.start < other.end
+            for other in chosen
+        ):
+            continue
+        cost = len(passage.text) + 48  # label and separators
+        if used + cost > budget:
+            continue
+        chosen.append(passage)
+        used += cost
+    return chosen
+
+
+def build_context(passages: Sequence[Passage]) -> str:
+    """Label each passage ``[n] path @start-end`` for citation."""
+
+    return "\n\n".join(
+        f"[{number}] {passage.file_path} @{passage.start}-{passage.end}\n{passage.text}"
+        for number, passage in enumerate(passages, start=1)
+    )
+
+
+def candidate_documents(
+    question: str,
+    mirror: DocumentMirror,
+    *,
+    index_path: Path | None,
+    limit: int,
+) -> List[str]:
+    """Documents worth splitting: the search index's top hits, or every mirrored document.
+
+    The whole mirror is also used when the index has no hit for the question,
+    so a populated mirror is never reported as empty.
+    """
+
+    if index_path is not None and index_path.exists():
+        with SearchIndex(index_path) as index:
+            if index.document_count:
+                hits = [hit.file_path for hit in index.search(question, limit=limit)]
+                if hits:
+                    return hits
+    return [row["file_path"] for row in mirror.list()]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("question", nargs="+", help="Question to answer.")
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument("--mirror", type=Path, default=None, help="Mirror database (default: .cache/documents.sqlite).")
+    parser.add_argument("--index", type=Path, default=None, help="Search index used to pick candidate documents.")
+    parser.add_argument("--candidates", type=int, default=DEFAULT_CANDIDATES, help="Documents to split into passages.")
+    parser.add_argument("-k", "--top-k", type=int, default=DEFAULT_TOP_K, help="Maximum passages in the prompt.")
+    parser.add_argument("--budget", type=int, default=DEFAULT_TOKEN_BUDGET, help="Approximate context token budget.")
+    parser.add_argument("--passage-chars", type=int, default=DEFAULT_PASSAGE_CHARS, help="Passage length.")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Request timeout in seconds.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the prompt context without calling the backend.")
+    parser.add_argument("--json", action="store_true", help="Print the answer and citations as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the ask command."""
+
+    args = parse_args(argv)
+    question = " ".join(args.question)
+    started = time.perf_counter()
+    with DocumentMirror(args.mirror or default_mirror_path()) as mirror:
+        paths = candidate_documents(
+            question, mirror, index_path=args.index or default_index_path(), limit=args.candidates
+        )
+        passages: List[Passage] = []
+        for path in paths:
+            record = mirror.get(path)
+            if record:
+                passages.extend(split_passages(path, record["text"], size=args.passage_chars))
+    if not passages:
+        raise SystemExit("No mirrored documents to answer from; run 'master.py mirror sync' first.")
+
+    chosen = pack_passages(rank_passages(passages, question), top_k=args.top_k, token_budget=args.budget)
+    if not chosen:
+        print("No passage mentions the question's terms.", file=sys.stderr)
+        return 1
+    context = build_context(chosen)
+    retrieval_ms = round((time.perf_counter() - started) * 1000, 1)
+    citations = [
+        {"label": number, "path": passage.file_path, "start": passage.start, "end": passage.end}
+        for number, passage in enumerate(chosen, start=1)
+    ]
+
+    if args.dry_run:
+        print(context)
+        print(f"\n[{len(chosen)} passages, {len(context)} chars, retrieval {retrieval_ms} ms]", file=sys.stderr)
+        return 0
+
+    try:
+        result = request_json(
+            "POST",
+            f"{get_backend_url(args.backend_url)}/api/summarize",
+            payload={"content": context, "prompt": ANSWER_PROMPT.format(question=question)},
+            timeout=args.timeout,
+        )
+    except RuntimeError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    answer = (result or {}).get("summary") or ""
+    total_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    if args.json:
+        output: Dict[str, Any] = {
+            "question": question,
+            "answer": answer,
+            "citations": citations,
+            "context_chars": len(context),
+            "retrieval_ms": retrieval_ms,
+            "total_ms": total_ms,
+        }
+        print(json.dumps(output, indent=2))
+        return 0
+    print(answer)
+    print()
+    for citation in citations:
+        print(f"  [{citation['label']}] {citation['path']} @{citation['start']}-{citation['end']}")
+    print(f"[{len(context)} context chars, retrieval {retrieval_ms} ms, total {total_ms} ms]", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "Passage",
+    "build_context",
+    "candidate_documents",
+    "main",
+    "pack_passages",
+    "parse_args",
+    "rank_passages",
+    "split_passages",
+]
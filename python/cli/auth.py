@@ -0,0 +1,239 @@
+"""Snowflake key-pair JWT authentication for the REST and SQL APIs.
+
+``tools/01_setup_keypair_auth.py`` provisions ``.secrets/keys/rsa_key.p8``
+and registers its public key with the Snowflake user. :class:`KeyPairAuth`
+signs short-lived JWTs with that key. The parsed key is cached per file, and
+the signed token is cached in memory and under ``.cache/auth`` until shortly
+before it expires, so repeated CLI calls skip both PEM parsing and RSA
+signing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from .cache import DiskCache, get_cache_dir
+from .utils import get_project_root
+
+DEFAULT_TOKEN_LIFETIME = 59 * 60  # Snowflake rejects JWTs valid for more than one hour
+DEFAULT_REFRESH_MARGIN = 120
+KEYPAIR_TOKEN_TYPE = "KEYPAIR_JWT"
+PAT_TOKEN_TYPE = "PROGRAMMATIC_ACCESS_TOKEN"
+
+_key_cache: Dict[Tuple[str, int, int], Tuple[Any, str]] = {}
+_key_lock = threading.Lock()
+
+
+def default_private_key_path() -> Path:
+    """``SNOWFLAKE_PRIVATE_KEY_PATH`` or the key written by the setup tool."""
+
+    configured = os.environ.get("SNOWFLAKE_PRIVATE_KEY_PATH")
+    return Path(configured) if configured else get_project_root() / ".secrets" / "keys" / "rsa_key.p8"
+
+
+def jwt_account(account: str) -> str:
+    """Account identifier as Snowflake expects it in JWT claims.
+
+    The host suffix and any region segment of a legacy locator are dropped
+    and the result is upper-cased (``xy12345.us-east-1`` -> ``XY12345``).
+    """
+
+    trimmed = account.strip()
+    if trimmed.endswith(".snowflakecomputing.com"):
+        trimmed = trimmed[: -len(".snowflakecomputing.com")]
+    return trimmed.split(".", 1)[0].upper()
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def load_private_key(path: Path, passphrase: str | None = None) -> Tuple[Any, str]:
+    """Return ``(private key, "SHA256:<public key fingerprint>")``, cached per file version."""
+
+    try:
+        from cryptography.hazmat.primitives import serialization
+    except ImportError as exc:  # pragma: no cover - dependency listed in requirements.txt
+        raise RuntimeError("Key-pair authentication needs 'cryptography' (pip install -r python/requirements.txt).") from exc
+
+    try:
+        stat = path.stat()
+    except OSError as exc:
+        raise RuntimeError(f"Private key not found at {path}: {exc}") from exc
+    cache_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _key_lock:
+        cached = _key_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            key = serialization.load_pem_private_key(
+                path.read_bytes(),
+                password=passphrase.encode("utf-8") if passphrase else None,
+            )
+        except (TypeError, ValueError) as exc:
+            raise RuntimeError(f"Could not load private key {path}: {exc}") from exc
+        public = key.public_key().public_bytes(
+            serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        fingerprint = "SHA256:" + base64.b64encode(hashlib.sha256(public).digest()).decode("ascii")
+        _key_cache[cache_key] = (key, fingerprint)
+        return key, fingerprint
+
+
+class KeyPairAuth:
+    """Thread-safe source of Snowflake key-pair JWTs for one account and user."""
+
+    def __init__(
+        self,
+        account: str,
+        user: str,
+        private_key_path: Path,
+        *,
+        passphrase: str | None = None,
+        lifetime: int = DEFAULT_TOKEN_LIFETIME,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+        cache: DiskCache | None = None,
+    ) -> None:
+        if not user.strip():
+            raise ValueError("Snowflake user is required for key-pair authentication.")
+        self.account = jwt_account(account)
+        self.user = user.strip().upper()
+        self.private_key_path = private_key_path
+        self.passphrase = passphrase
+        self.lifetime = lifetime
+        self.refresh_margin = refresh_margin
+        self.cache = cache
+        self.signed = 0
+        self._lock = threading.Lock()
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._version: str | None = None
+
+    def _key_version(self) -> str:
+        # Part of every cache key, so a key rotated in place at the same path
+        # is never answered with a token carrying the old fingerprint.
+        try:
+            stat = self.private_key_path.stat()
+        except OSError as exc:
+            raise RuntimeError(f"Private key not found at {self.private_key_path}: {exc}") from exc
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _cache_key(self, version: str) -> str:
+        return f"jwt/{self.account}/{self.user}/{self.private_key_path.resolve()}/{version}"
+
+    def _usable(self, expires_at: float) -> bool:
+        return expires_at - self.refresh_margin > time.time()
+
+    def _sign(self) -> Tuple[str, float, str]:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        key, fingerprint = load_private_key(self.private_key_path, self.passphrase)
+        now = int(time.time())
+        qualified_user = f"{self.account}.{self.user}"
+        header = {"alg": "RS256", "typ": "JWT"}
+        claims = {"iss": f"{qualified_user}.{fingerprint}", "sub": qualified_user, "iat": now, "exp": now + self.lifetime}
+        signing_input = (
+            _b64url(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+            + "."
+            + _b64url(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        )
+        signature = key.sign(signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256())
+        self.signed += 1
+        return f"{signing_input}.{_b64url(signature)}", float(claims["exp"]), fingerprint
+
+    def token(self) -> str:
+        """Return a JWT with at least ``refresh_margin`` seconds of validity left."""
+
+        with self._lock:
+            version = self._key_version()
+            if self._token is not None and self._version == version and self._usable(self._expires_at):
+                return self._token
+            if self.cache is not None:
+                entry = self.cache.get(self._cache_key(version))
+                if entry is not None and self._usable(entry.get("expires_at", 0)):
+                    self._token, self._expires_at, self._version = entry["token"], entry["expires_at"], version
+                    return self._token
+            token, expires_at, fingerprint = self._sign()
+            self._token, self._expires_at, self._version = token, expires_at, version
+            if self.cache is not None:
+                self.cache.put(
+                    self._cache_key(version),
+                    {"token": token, "expires_at": expires_at, "fingerprint": fingerprint},
+                )
+            return token
+
+    def headers(self) -> Dict[str, str]:
+        """Authorization headers for one request."""
+
+        return {
+            "Authorization": f"Bearer {self.token()}",
+            "X-Snowflake-Authorization-Token-Type": KEYPAIR_TOKEN_TYPE,
+        }
+
+
+Credential = str | KeyPairAuth
+
+
+def auth_headers(credential: Credential, *, token_type: str | None = None) -> Dict[str, str]:
+    """Authorization headers for a bearer token string or a :class:`KeyPairAuth`."""
+
+    if isinstance(credential, KeyPairAuth):
+        return credential.headers()
+    headers = {"Authorization": f"Bearer {credential.strip()}"}
+    if token_type:
+        headers["X-Snowflake-Authorization-Token-Type"] = token_type
+    return headers
+
+
+def add_auth_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the key-pair options used when no ``--token`` is given."""
+
+    parser.add_argument("--user", default=os.environ.get("SNOWFLAKE_USER", ""), help="User for key-pair authentication.")
+    parser.add_argument(
+        "--private-key-path",
+        type=Path,
+        default=None,
+        help="RSA private key (default: SNOWFLAKE_PRIVATE_KEY_PATH or .secrets/keys/rsa_key.p8).",
+    )
+
+
+def credential_from_args(args: argparse.Namespace) -> Credential | None:
+    """``--token`` if given, else key-pair auth when a user and key file are available."""
+
+    if getattr(args, "token", ""):
+        return args.token
+    key_path = getattr(args, "private_key_path", None) or default_private_key_path()
+    user = getattr(args, "user", "")
+    if not user or not key_path.exists():
+        return None
+    return KeyPairAuth(
+        args.account,
+        user,
+        key_path,
+        passphrase=os.environ.get("SNOWFLAKE_PRIVATE_KEY_PASSPHRASE") or None,
+        cache=DiskCache(get_cache_dir("auth"), max_bytes=1024 * 1024),
+    )
+
+
+__all__ = [
+    "Credential",
+    "DEFAULT_TOKEN_LIFETIME",
+    "KEYPAIR_TOKEN_TYPE",
+    "KeyPairAuth",
+    "PAT_TOKEN_TYPE",
+    "add_auth_arguments",
+    "auth_headers",
+    "credential_from_args",
+    "default_private_key_path",
+    "jwt_account",
+    "load_private_key",
+]
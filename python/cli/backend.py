@@ -0,0 +1,56 @@
+"""Helpers for calling the Express backend in ``server/``."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+from typing import Any, Mapping
+
+from .rest import Body, RestSession, get_default_session
+
+DEFAULT_BACKEND_URL = "http://localhost:4000"
+
+
+def get_backend_url(value: str | None = None) -> str:
+    """Resolve the backend base URL from an option, the environment or the default."""
+
+    url = value or os.environ.get("REACT_APP_BACKEND_URL") or DEFAULT_BACKEND_URL
+    return url.rstrip("/")
+
+
+def request_json(
+    method: str,
+    url: str,
+    *,
+    payload: Any = None,
+    body: Body = None,
+    headers: Mapping[str, str] | None = None,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+) -> Any:
+    """Call a backend endpoint and decode its JSON response.
+
+    ``payload`` is serialised as a JSON body; ``body`` is sent as-is (for
+    example a streamed multipart upload) together with ``headers``.
+    """
+
+    request_headers = {"Accept": "application/json", **(headers or {})}
+    if payload is not None:
+        body = json.dumps(payload).encode("utf-8")
+        request_headers["Content-Type"] = "application/json"
+
+    client = session or get_default_session()
+    try:
+        with client.request(method, url, headers=request_headers, body=body, timeout=timeout) as response:
+            data = response.read()
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"Failed to reach backend {url}: {exc}") from exc
+
+    if response.status >= 400:
+        detail = data.decode("utf-8", errors="ignore")
+        raise RuntimeError(f"Backend error {response.status}: {detail or response.reason}")
+    return json.loads(data) if data else None
+
+
+__all__ = ["DEFAULT_BACKEND_URL", "get_backend_url", "request_json"]
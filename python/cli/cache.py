@@ -0,0 +1,171 @@
+"""Size-bounded on-disk caches for CLI results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+from .utils import get_project_root
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_METADATA_TTL = 300.0
+
+
+def get_cache_dir(name: str) -> Path:
+    """Return ``.cache/<name>`` under the project root."""
+
+    return get_project_root() / ".cache" / name
+
+
+class DiskCache:
+    """Directory of JSON entries with a total size cap.
+
+    Entries are stored one file per key (named by the key's SHA-256). Reads
+    touch the file so eviction, which removes the oldest modification times
+    first, behaves as least-recently-used.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        """Return the stored entry for ``key`` or ``None``."""
+
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: Mapping[str, Any]) -> None:
+        """Store ``entry`` atomically and evict old entries past the size cap."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({**entry, "key": key}, separators=(",", ":")).encode("utf-8")
+        handle, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                stream.write(data)
+            os.replace(temp_name, self._path(key))
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for ``key`` if present."""
+
+        self._path(key).unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under ``max_bytes``."""
+
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+class MetadataCache:
+    """Agent metadata cache with TTL freshness and HTTP revalidation state."""
+
+    def __init__(self, store: DiskCache, *, ttl: float = DEFAULT_METADATA_TTL) -> None:
+        self.store = store
+        self.ttl = ttl
+
+    @staticmethod
+    def key(agent_url: str) -> str:
+        """Build the cache key for one agent from its resolved REST URL.
+
+        The URL carries the endpoint as well as the account, so runs against
+        a stand-in or a cassette replay never share entries with the real
+        account.
+        """
+
+        return f"agent/{agent_url.strip()}"
+
+    def lookup(self, key: str) -> tuple[Dict[str, Any] | None, bool]:
+        """Return ``(entry, fresh)``; stale entries still carry validators."""
+
+        entry = self.store.get(key)
+        if entry is None:
+            return None, False
+        fresh = time.time() - entry.get("fetched_at", 0) < self.ttl
+        return entry, fresh
+
+    @staticmethod
+    def validators(entry: Mapping[str, Any] | None) -> Dict[str, str]:
+        """Conditional request headers for revalidating ``entry``."""
+
+        headers: Dict[str, str] = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store_response(
+        self,
+        key: str,
+        body: Any,
+        *,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        """Record a fresh 200 response."""
+
+        self.store.put(
+            key,
+            {
+                "body": body,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+            },
+        )
+
+    def touch(self, key: str, entry: Dict[str, Any]) -> None:
+        """Mark ``entry`` fresh again after a 304 response."""
+
+        self.store.put(key, {**entry, "fetched_at": time.time()})
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_METADATA_TTL",
+    "DiskCache",
+    "MetadataCache",
+    "get_cache_dir",
+]
@@ -0,0 +1,311 @@
+"""Chat with the Cortex Agent through the backend's SSE stream and time each turn."""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+from .backend import get_backend_url
+from .rest import RestSession, get_default_session
+
+
+class SSEEvent(NamedTuple):
+    """One dispatched server-sent event."""
+
+    event: str
+    data: str
+    id: str | None
+
+
+class SSEParser:
+    """Incremental ``text/event-stream`` parser.
+
+    Bytes are appended to a single reusable buffer and scanned in place;
+    only field values are copied out, and the consumed prefix is dropped
+    once per :meth:`feed` call.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._data: List[bytes] = []
+        self._event = ""
+        self._id: str | None = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consume bytes and return the events completed by them."""
+
+        buffer = self._buffer
+        buffer += chunk
+        events: List[SSEEvent] = []
+        start = 0
+        view = memoryview(buffer)
+        try:
+            while True:
+                newline = buffer.find(b"\n", start)
+                if newline < 0:
+                    break
+                end = newline - 1 if newline > start and buffer[newline - 1] == 0x0D else newline
+                if end == start:
+                    if self._data or self._event:
+                        events.append(self._dispatch())
+                elif buffer[start] != 0x3A:  # lines starting with ':' are comments
+                    colon = buffer.find(b":", start, end)
+                    if colon < 0:
+                        field, value = bytes(view[start:end]), b""
+                    else:
+                        field = bytes(view[start:colon])
+                        value_start = colon + 2 if colon + 1 < end and buffer[colon + 1] == 0x20 else colon + 1
+                        value = bytes(view[value_start:end])
+                    self._field(field, value)
+                start = newline + 1
+        finally:
+            view.release()
+        if start:
+            del buffer[:start]
+        return events
+
+    def _field(self, field: bytes, value: bytes) -> None:
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value.decode("utf-8", errors="replace")
+        elif field == b"id":
+            self._id = value.decode("utf-8", errors="replace")
+
+    def _dispatch(self) -> SSEEvent:
+        event = SSEEvent(
+            self._event or "message",
+            b"\n".join(self._data).decode("utf-8", errors="replace"),
+            self._id,
+        )
+        self._data = []
+        self._event = ""
+        return event
+
+
+class TurnResult(NamedTuple):
+    """Outcome and latency of one chat turn."""
+
+    message: str
+    response: str
+    thread_id: str | None
+    message_id: int | None
+    first_event_ms: float | None
+    first_response_ms: float | None
+    total_ms: float
+    error: str | None
+
+
+def stream_events(
+    url: str,
+    payload: Dict[str, Any],
+    *,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """POST to the SSE endpoint and yield each decoded JSON event."""
+
+    client = session or get_default_session()
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+    parser = SSEParser()
+    try:
+        with client.post(url, headers=headers, body=body, timeout=timeout) as response:
+            if response.status >= 400:
+                detail = response.read().decode("utf-8", errors="ignore")
+                raise RuntimeError(f"Backend error {response.status}: {detail or response.reason}")
+            for chunk in response.iter_chunks(chunk_size=8192):
+                for event in parser.feed(chunk):
+                    if not event.data.strip():
+                        continue
+                    try:
+                        yield json.loads(event.data)
+                    except ValueError:
+                        continue
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"Failed to reach backend {url}: {exc}") from exc
+
+
+def run_turn(
+    base_url: str,
+    message: str,
+    *,
+    thread_id: str | None = None,
+    parent_message_id: int = 0,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+    echo: bool = True,
+) -> TurnResult:
+    """Send one message and time the first event, first response and completion."""
+
+    payload = {"message": message, "thread_id": thread_id, "parent_message_id": parent_message_id}
+    started = time.perf_counter()
+    first_event: float | None = None
+    first_response: float | None = None
+    parts: List[str] = []
+    done: Dict[str, Any] = {}
+    error: str | None = None
+
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    try:
+        for event in stream_events(f"{base_url}/api/chat/stream", payload, session=session, timeout=timeout):
+            if first_event is None:
+                first_event = elapsed_ms()
+            kind = event.get("type")
+            if kind == "thinking" and echo:
+                print(f"  ... {event.get('content', '')}", file=sys.stderr)
+            elif kind == "response":
+                if first_response is None:
+                    first_response = elapsed_ms()
+                content = str(event.get("content", ""))
+                parts.append(content)
+                if echo:
+                    sys.stdout.write(content)
+                    sys.stdout.flush()
+            elif kind == "error":
+                error = str(event.get("content", "agent error"))
+            elif kind == "done":
+                done = event
+                break
+    except RuntimeError as exc:
+        error = str(exc)
+    if echo and parts:
+        print()
+
+    return TurnResult(
+        message=message,
+        response="".join(parts),
+        thread_id=done.get("thread_id", thread_id),
+        message_id=done.get("message_id"),
+        first_event_ms=first_event,
+        first_response_ms=first_response,
+        total_ms=elapsed_ms(),
+        error=error,
+    )
+
+
+def _questions(args: argparse.Namespace) -> Iterator[str]:
+    if args.message:
+        yield from args.message
+        return
+    if args.script is not None:
+        for line in args.script.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+        return
+    while True:
+        try:
+            line = input("you> ").strip()
+        except EOFError:
+            return
+        if line in ("exit", "quit"):
+            return
+        if line:
+            yield line
+
+
+def _describe(values: List[float]) -> str:
+    if not values:
+        return "n/a"
+    return f"median {statistics.median(values):.0f} ms, max {max(values):.0f} ms"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument("-m", "--message", action="append", default=None, help="Message to send (repeatable).")
+    parser.add_argument("--script", type=Path, default=None, help="File of questions to replay, one per line.")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the questions this many times.")
+    parser.add_argument(
+        "--new-thread",
+        action="store_true",
+        help="Start a new thread for every question instead of continuing one conversation.",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="Read timeout in seconds.")
+    parser.add_argument("--quiet", action="store_true", help="Do not print agent output, only timings.")
+    parser.add_argument("--json", type=Path, default=None, help="Append per-turn timings as NDJSON to this file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the chat command."""
+
+    args = parse_args(argv)
+    base_url = get_backend_url(args.backend_url)
+    questions = list(_questions(args)) if (args.message or args.script) else None
+    results: List[TurnResult] = []
+    thread_id: str | None = None
+    parent_id = 0
+
+    def play(stream: Iterator[str]) -> None:
+        nonlocal thread_id, parent_id
+        for question in stream:
+            if questions is not None and not args.quiet:
+                print(f"you> {question}")
+            result = run_turn(
+                base_url,
+                question,
+                thread_id=None if args.new_thread else thread_id,
+                parent_message_id=0 if args.new_thread else parent_id,
+                timeout=args.timeout,
+                echo=not args.quiet,
+            )
+            if not args.new_thread:
+                thread_id, parent_id = result.thread_id, result.message_id or parent_id
+            results.append(result)
+            status = f"error: {result.error}" if result.error else "ok"
+            print(
+                f"[first event {result.first_event_ms} ms | first response {result.first_response_ms} ms | "
+                f"total {result.total_ms} ms | {status}]",
+                file=sys.stderr,
+            )
+            if args.json is not None:
+                with args.json.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(result._asdict()) + "\n")
+
+    if questions is None:
+        play(_questions(args))
+    else:
+        for _ in range(max(1, args.repeat)):
+            play(iter(questions))
+
+    if len(results) > 1:
+        print(f"\nTurns: {len(results)}  errors: {sum(1 for r in results if r.error)}", file=sys.stderr)
+        print(
+            "  time to first event:    "
+            + _describe([r.first_event_ms for r in results if r.first_event_ms is not None]),
+            file=sys.stderr,
+        )
+        print(
+            "  time to first response: "
+            + _describe([r.first_response_ms for r in results if r.first_response_ms is not None]),
+            file=sys.stderr,
+        )
+        print("  total:                  " + _describe([r.total_ms for r in results]), file=sys.stderr)
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "SSEEvent",
+    "SSEParser",
+    "TurnResult",
+    "main",
+    "parse_args",
+    "run_turn",
+    "stream_events",
+]
@@ -0,0 +1,352 @@
+"""Caching proxy for repeated agent questions.
+
+``POST /api/chat`` and ``POST /api/chat/stream`` are answered from a cache
+keyed on the normalised message and the document-set version. The version
+is ``(MAX(EXTRACTION_TIMESTAMP), COUNT(*))`` over ``SFE_DOCUMENT_METADATA``,
+so uploading, re-extracting or deleting a document retires every cached
+answer. Hits replay the backend's event shapes (``thinking``, ``response``,
+``done``) with a fresh ``thread_id`` and ``message_id``; everything else is
+proxied. Point the frontend (``REACT_APP_BACKEND_URL``) at it::
+
+    python python/cli/master.py chat-cache --upstream http://localhost:4000 --port 4020
+
+Send ``Cache-Control: no-cache`` to skip the lookup and refresh the entry.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+from .cache import DiskCache, get_cache_dir
+from .chat import SSEParser
+from .httpproxy import ProxyRequest, ProxyServer, ResponseWriter, forward, relay
+from .rest import RestSession
+from .sqlapi import SqlApiClient, add_connection_arguments, client_from_args
+
+DEFAULT_VERSION_TTL = 5.0
+VERSION_STATEMENT = (
+    "SELECT MAX(EXTRACTION_TIMESTAMP) AS EXTRACTED, COUNT(FILE_PATH) AS DOCUMENTS FROM SFE_DOCUMENT_METADATA"
+)
+CHAT_PATHS = ("/api/chat", "/api/chat/stream")
+THINKING = "Processing your request..."
+OUTCOMES = ("hit", "miss", "bypass")
+
+Version = Tuple[str | None, int]
+
+_SPACE = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.]+$")
+
+
+def normalize_message(message: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing ``?!.``."""
+
+    return _TRAILING.sub("", _SPACE.sub(" ", message).strip().casefold())
+
+
+def chat_key(message: str, version: Version) -> str:
+    """Cache key for a normalised message against one document-set version."""
+
+    digest = hashlib.sha256()
+    for part in (normalize_message(message), str(version[0] or ""), str(version[1])):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"chat/{digest.hexdigest()}"
+
+
+def backend_version(upstream: str, session: RestSession, *, timeout: float | None = None) -> Callable[[], Version]:
+    """Version from the backend's ``GET /api/documents`` listing."""
+
+    def fetch() -> Version:
+        with session.get(f"{upstream.rstrip('/')}/api/documents", timeout=timeout) as response:
+            if response.status >= 400:
+                raise RuntimeError(f"Backend error {response.status} listing documents")
+            rows = response.json() or []
+        stamps = [str(row["extractedAt"]) for row in rows if row.get("extractedAt") is not None]
+        return (max(stamps) if stamps else None), len(rows)
+
+    return fetch
+
+
+def sql_version(client: SqlApiClient) -> Callable[[], Version]:
+    """Version from one aggregate query through the SQL API."""
+
+    def fetch() -> Version:
+        rows = client.execute(VERSION_STATEMENT)
+        row = rows[0] if rows else {}
+        extracted = row.get("EXTRACTED")
+        return (None if extracted is None else str(extracted)), int(row.get("DOCUMENTS") or 0)
+
+    return fetch
+
+
+class DocumentSetVersion:
+    """Memoises a version fetcher for ``ttl`` seconds.
+
+    :meth:`current` returns ``None`` when the version cannot be read, and
+    callers then bypass the cache rather than risk a stale answer.
+    """
+
+    def __init__(self, fetch: Callable[[], Version], *, ttl: float = DEFAULT_VERSION_TTL) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self.fetches = 0
+        self.last_error: str | None = None
+        self._value: Version | None = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Version | None:
+        """The cached version, re-read once ``ttl`` has passed."""
+
+        with self._lock:
+            now = time.monotonic()
+            if self._value is not None and now < self._expires:
+                return self._value
+            self.fetches += 1
+            try:
+                self._value = self.fetch()
+                self.last_error = None
+            except (OSError, RuntimeError, ValueError, KeyError) as exc:
+                self._value, self.last_error = None, str(exc)
+                return None
+            self._expires = now + self.ttl
+            return self._value
+
+
+def _content(response: Any) -> str:
+    """What ``/api/chat/stream`` sends for a raw agent response (see server/src/index.js)."""
+
+    parsed = response
+    if isinstance(response, str):
+        try:
+            parsed = json.loads(response)
+        except ValueError:
+            parsed = {"content": response}
+    if isinstance(parsed, dict) and (parsed.get("content") or parsed.get("message")):
+        return str(parsed.get("content") or parsed.get("message"))
+    return "null" if response is None else str(response)
+
+
+def _sse(event: Dict[str, Any]) -> bytes:
+    return b"data: " + json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n\n"
+
+
+def _turn(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """``thread_id`` and ``message_id`` exactly as the backend derives them."""
+
+    try:
+        parent = int(payload.get("parent_message_id") or 0)
+    except (TypeError, ValueError):
+        parent = 0
+    return {"thread_id": payload.get("thread_id") or str(uuid.uuid4()), "message_id": parent + 1}
+
+
+class ChatCache:
+    """Proxy app answering repeated chat questions from a :class:`DiskCache`.
+
+    Entries hold the streamed ``content`` and, when the answer came through
+    ``/api/chat``, the raw ``response`` too. The stream endpoint can replay
+    either kind; ``/api/chat`` needs the raw form and otherwise fills it in.
+    """
+
+    def __init__(
+        self,
+        store: DiskCache,
+        upstream: str,
+        version: DocumentSetVersion,
+        *,
+        session: RestSession | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.store = store
+        self.upstream = upstream.rstrip("/")
+        self.version = version
+        self.session = session or RestSession()
+        self.timeout = timeout
+        self.counts: Dict[str, int] = {outcome: 0 for outcome in OUTCOMES}
+        self._lock = threading.Lock()
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counters, hit ratio and the current document-set version."""
+
+        with self._lock:
+            counts = dict(self.counts)
+        lookups = counts["hit"] + counts["miss"]
+        return {
+            **counts,
+            "hit_ratio": round(counts["hit"] / lookups, 4) if lookups else None,
+            "version": self.version.current(),
+            "version_fetches": self.version.fetches,
+            "version_error": self.version.last_error,
+        }
+
+    def __call__(self, request: ProxyRequest, writer: ResponseWriter) -> None:
+        if request.method == "GET" and request.path == "/__cache/stats":
+            writer.send_json(200, self.stats())
+            return
+        payload = request.json() if request.method == "POST" and request.path in CHAT_PATHS else None
+        message = payload.get("message") if isinstance(payload, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            relay(forward(self.session, self.upstream, request, timeout=self.timeout), writer)
+            return
+
+        stream = request.path == "/api/chat/stream"
+        version = self.version.current()
+        refresh = any(
+            name.lower() == "cache-control" and "no-cache" in value.lower() for name, value in request.headers.items()
+        )
+        if version is None:
+            self._count("bypass")
+            relay(forward(self.session, self.upstream, request, timeout=self.timeout), writer)
+            return
+        key = chat_key(message, version)
+        entry = None if refresh else self.store.get(key)
+        if entry is not None and (stream or "response" in entry):
+            self._count("hit")
+            self._replay(entry, payload, stream, writer)
+            return
+
+        self._count("miss")
+        record = {"message": normalize_message(message), "version": list(version), "created": time.time()}
+        if stream:
+            content = self._stream_through(request, writer)
+            if content is not None:
+                self.store.put(key, {**record, "content": content})
+            return
+        with forward(self.session, self.upstream, request, timeout=self.timeout) as response:
+            body = response.read()
+            writer.send(response.status, [*response.headers.items(), ("X-Chat-Cache", "miss")], body)
+        try:
+            result = json.loads(body) if response.status == 200 else None
+        except ValueError:
+            result = None
+        if isinstance(result, dict) and "response" in result:
+            self.store.put(key, {**record, "response": result["response"], "content": _content(result["response"])})
+
+    def _replay(self, entry: Dict[str, Any], payload: Dict[str, Any], stream: bool, writer: ResponseWriter) -> None:
+        turn = _turn(payload)
+        if not stream:
+            writer.send_json(200, {"response": entry["response"], **turn}, [("X-Chat-Cache", "hit")])
+            return
+        writer.start(
+            200,
+            [("Content-Type", "text/event-stream"), ("Cache-Control", "no-cache"), ("X-Chat-Cache", "hit")],
+        )
+        writer.write(_sse({"type": "thinking", "content": THINKING}))
+        writer.write(_sse({"type": "response", "content": entry["content"]}))
+        writer.write(_sse({"type": "done", **turn}))
+        writer.finish()
+
+    def _stream_through(self, request: ProxyRequest, writer: ResponseWriter) -> str | None:
+        """Relay the upstream stream and return its content if it completed cleanly."""
+
+        parser = SSEParser()
+        parts: List[str] = []
+        outcome = {"done": False, "error": False}
+
+        def on_chunk(chunk: bytes) -> None:
+            for event in parser.feed(chunk):
+                try:
+                    data = json.loads(event.data) if event.data.strip() else None
+                except ValueError:
+                    continue
+                kind = data.get("type") if isinstance(data, dict) else None
+                if kind == "response":
+                    parts.append(str(data.get("content", "")))
+                elif kind in ("done", "error"):
+                    outcome[kind] = True
+
+        response = forward(self.session, self.upstream, request, timeout=self.timeout)
+        status = response.status
+        writer.start(status, [*response.headers.items(), ("X-Chat-Cache", "miss")])
+        with response:
+            for chunk in response.iter_chunks():
+                on_chunk(chunk)
+                writer.write(chunk)
+        writer.finish()
+        if status != 200 or outcome["error"] or not outcome["done"] or not parts:
+            return None
+        return "".join(parts)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--upstream", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4020)
+    parser.add_argument(
+        "--version-source",
+        choices=("backend", "sql"),
+        default="backend",
+        help="Read the document-set version from the backend's /api/documents or through the SQL API.",
+    )
+    parser.add_argument(
+        "--version-ttl",
+        type=float,
+        default=DEFAULT_VERSION_TTL,
+        help="Seconds to reuse a document-set version before reading it again.",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="Backend read timeout in seconds.")
+    add_connection_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the chat cache proxy."""
+
+    from .backend import get_backend_url
+
+    args = parse_args(argv)
+    upstream = get_backend_url(args.upstream)
+    session = RestSession()
+    if args.version_source == "sql":
+        fetch = sql_version(client_from_args(args, session=session))
+    else:
+        fetch = backend_version(upstream, session, timeout=args.timeout)
+    proxy = ChatCache(
+        DiskCache(get_cache_dir("chat")),
+        upstream,
+        DocumentSetVersion(fetch, ttl=args.version_ttl),
+        session=session,
+        timeout=args.timeout,
+    )
+    server = ProxyServer((args.host, args.port), proxy)
+    print(f"Chat cache for {proxy.upstream} on {server.url} (stats at {server.url}/__cache/stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(json.dumps(proxy.stats()))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "ChatCache",
+    "DocumentSetVersion",
+    "backend_version",
+    "chat_key",
+    "main",
+    "normalize_message",
+    "parse_args",
+    "sql_version",
+]
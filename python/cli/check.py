@@ -0,0 +1,153 @@
+"""Health, agent and document checks for one Snowflake environment.
+
+``master.py --envs dev,prod check`` runs this command once per profile
+and merges the ``--json`` output of each run into one report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple
+
+from .auth import credential_from_args
+from .backend import get_backend_url, request_json
+from .describe_agent import build_agent_url, fetch_agent_metadata
+from .profiling import span
+from .rest import RestSession
+from .sqlapi import add_connection_arguments, client_from_args
+
+CHECKS = ("health", "describe", "documents")
+DOCUMENTS_STATEMENT = (
+    "SELECT COUNT(FILE_PATH) AS DOCUMENTS, MAX(LAST_MODIFIED) AS LAST_MODIFIED FROM SFE_DOCUMENT_METADATA"
+)
+
+
+class CheckResult(NamedTuple):
+    """Outcome of one check; ``status`` is ``ok``, ``failed`` or ``skipped``."""
+
+    name: str
+    status: str
+    ms: float
+    detail: str
+
+
+class Skip(Exception):
+    """Raised by a check whose configuration is missing."""
+
+
+def check_health(args: argparse.Namespace, session: RestSession) -> str:
+    """The backend's ``/health`` endpoint, which also opens a Snowflake connection."""
+
+    result = request_json("GET", f"{get_backend_url(args.backend_url)}/health", session=session, timeout=args.timeout)
+    return f"{result.get('status')} ({result.get('snowflake', 'unknown')})"
+
+
+def check_describe(args: argparse.Namespace, session: RestSession) -> str:
+    """Describe the configured Cortex Agent over the REST API."""
+
+    if not (args.account or args.base_url) or not (args.database and args.schema and args.agent):
+        raise Skip("account, database, schema and agent are required")
+    credential = credential_from_args(args)
+    if credential is None:
+        raise Skip("no token or key-pair credentials")
+    url = build_agent_url(args.account, args.database, args.schema, args.agent, base_url=args.base_url)
+    metadata = fetch_agent_metadata(url, credential, verbose=False, session=session, timeout=args.timeout)
+    tools = (metadata.get("agent_spec") or {}).get("tools") or metadata.get("tools") or []
+    return f"{metadata.get('name', args.agent)} ({len(tools)} tools)"
+
+
+def check_documents(args: argparse.Namespace, session: RestSession) -> str:
+    """Count the extracted documents through the SQL API."""
+
+    if not (args.account or args.base_url):
+        raise Skip("account is required")
+    if credential_from_args(args) is None:
+        raise Skip("no token or key-pair credentials")
+    rows = client_from_args(args, session=session).execute(DOCUMENTS_STATEMENT)
+    row = rows[0] if rows else {}
+    return f"{row.get('DOCUMENTS', 0)} documents, newest {row.get('LAST_MODIFIED') or 'n/a'}"
+
+
+_CHECKS: Dict[str, Callable[[argparse.Namespace, RestSession], str]] = {
+    "health": check_health,
+    "describe": check_describe,
+    "documents": check_documents,
+}
+
+
+def run_check(name: str, args: argparse.Namespace, session: RestSession) -> CheckResult:
+    """Run one named check and time it."""
+
+    started = time.perf_counter()
+    try:
+        with span(f"check:{name}"):
+            detail, status = _CHECKS[name](args, session), "ok"
+    except Skip as exc:
+        detail, status = str(exc), "skipped"
+    except (Exception, SystemExit) as exc:  # noqa: BLE001 - one broken check must not abort the others
+        detail, status = str(exc) or type(exc).__name__, "failed"
+    return CheckResult(name, status, round((time.perf_counter() - started) * 1000, 1), detail)
+
+
+def run_checks(args: argparse.Namespace, names: List[str]) -> List[CheckResult]:
+    """Run ``names`` concurrently over one pooled session."""
+
+    with RestSession() as session, ThreadPoolExecutor(max_workers=len(names) or 1) as pool:
+        return list(pool.map(lambda name: run_check(name, args, session), names))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_connection_arguments(parser)
+    parser.add_argument("--agent", default=os.environ.get("SNOWFLAKE_AGENT", ""))
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument(
+        "--checks",
+        default=",".join(CHECKS),
+        help=f"Comma separated checks to run (default: {','.join(CHECKS)}).",
+    )
+    parser.add_argument("--timeout", type=float, default=15.0, help="Read timeout in seconds for each call.")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object instead of a table.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the check command."""
+
+    args = parse_args(argv)
+    names = [name.strip() for name in args.checks.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(CHECKS))
+    if unknown:
+        raise SystemExit(f"Unknown checks: {', '.join(unknown)} (choose from {', '.join(CHECKS)}).")
+
+    results = run_checks(args, names)
+    if args.json:
+        print(json.dumps({"checks": [result._asdict() for result in results]}))
+    else:
+        for result in results:
+            print(f"{result.name:<10} {result.status:<8} {result.ms:>8.1f} ms  {result.detail}")
+    return 1 if any(result.status == "failed" for result in results) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "CHECKS",
+    "CheckResult",
+    "check_describe",
+    "check_documents",
+    "check_health",
+    "main",
+    "parse_args",
+    "run_check",
+    "run_checks",
+]
@@ -0,0 +1,121 @@
+"""SQLite index of uploaded document content used to skip identical re-uploads."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Tuple
+
+from .cache import get_cache_dir
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    stage_path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    source_path TEXT NOT NULL,
+    uploaded_at REAL NOT NULL
+)
+"""
+
+
+def default_index_path() -> Path:
+    """Location of the shared upload index."""
+
+    return get_cache_dir("uploads") / "index.sqlite"
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DedupIndex:
+    """Digest, size and mtime of the last upload to each stage path.
+
+    The backend stores documents under their file name with
+    ``OVERWRITE=TRUE``, so the index is keyed by stage path. A file whose
+    size and mtime match the recorded upload is treated as unchanged without
+    reading it; otherwise it is hashed and compared with the stored digest.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self) -> "DedupIndex":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+
+        with self._lock:
+            self._db.close()
+
+    def is_unchanged(self, path: Path, stage_path: str) -> Tuple[bool, str | None]:
+        """Return ``(unchanged, digest)`` for uploading ``path`` to ``stage_path``.
+
+        ``digest`` is ``None`` when the answer was reached without hashing.
+        """
+
+        stat = path.stat()
+        resolved = str(path.resolve())
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sha256, size, mtime_ns, source_path FROM uploads WHERE stage_path = ?",
+                (stage_path,),
+            ).fetchone()
+        if row is None or row[1] != stat.st_size:
+            return False, None
+        if row[2] == stat.st_mtime_ns and row[3] == resolved:
+            return True, None
+
+        digest = hash_file(path)
+        if digest != row[0]:
+            return False, digest
+        # Same bytes with a new mtime or location: refresh so the next check is fast.
+        with self._lock:
+            self._db.execute(
+                "UPDATE uploads SET mtime_ns = ?, source_path = ? WHERE stage_path = ?",
+                (stat.st_mtime_ns, resolved, stage_path),
+            )
+            self._db.commit()
+        return True, digest
+
+    def record(self, path: Path, stage_path: str, digest: str | None = None) -> None:
+        """Store the upload of ``path`` to ``stage_path``."""
+
+        stat = path.stat()
+        digest = digest or hash_file(path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO uploads "
+                "(stage_path, sha256, size, mtime_ns, source_path, uploaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (stage_path, digest, stat.st_size, stat.st_mtime_ns, str(path.resolve()), time.time()),
+            )
+            self._db.commit()
+
+
+__all__ = ["DedupIndex", "default_index_path", "hash_file"]
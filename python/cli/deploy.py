@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 from typing import Dict, Iterable, Tuple
 
+from .profiling import span
 from .utils import get_project_root, run_command
 
 EnvRecord = Dict[str, str]
@@ -177,7 +178,8 @@ def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
     project_root = get_project_root()
     print(f"Project root: {project_root}")
-    ensure_env_files(project_root, verbose=args.verbose, dry_run=args.dry_run)
+    with span("ensure_env_files"):
+        ensure_env_files(project_root, verbose=args.verbose, dry_run=args.dry_run)
     # The build step is now part of the standard `npm start` flow for development,
     # so we no longer call it explicitly here for the local run case.
     # return build_application(project_root, verbose=args.verbose, dry_run=args.dry_run)
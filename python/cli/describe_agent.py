@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import codecs
+import http.client
 import json
 import os
 import sys
-import urllib.error
+import time
 import urllib.parse
-import urllib.request
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from .auth import Credential, add_auth_arguments, auth_headers, credential_from_args
+from .cache import DEFAULT_METADATA_TTL, DiskCache, MetadataCache, get_cache_dir
+from .jsonstream import JsonStreamer, parse_selector
+from .rest import RestSession, get_default_session
 
 
 def normalise_account(account: str) -> str:
@@ -23,11 +31,14 @@ def normalise_account(account: str) -> str:
     return f"{trimmed}.snowflakecomputing.com"
 
 
-def build_agent_url(account: str, database: str, schema: str, agent: str) -> str:
-    """Construct the REST endpoint for the describe request."""
+def build_agents_url(account: str, database: str, schema: str, *, base_url: str | None = None) -> str:
+    """Construct the REST endpoint that lists the agents in a schema.
+
+    ``base_url`` replaces ``https://<account>.snowflakecomputing.com``, for
+    example to target the local stand-in server.
+    """
 
-    host = normalise_account(account)
-    base = f"https://{host}"
+    base = base_url.rstrip("/") if base_url else f"https://{normalise_account(account)}"
     path = "/".join(
         [
             "api",
@@ -37,36 +48,265 @@ def build_agent_url(account: str, database: str, schema: str, agent: str) -> str
             "schemas",
             urllib.parse.quote_plus(schema.strip()),
             "agents",
-            urllib.parse.quote_plus(agent.strip()),
         ]
     )
     return f"{base}/{path}"
 
 
-def fetch_agent_metadata(url: str, token: str, *, verbose: bool) -> Dict[str, Any]:
-    """Perform the HTTP GET request."""
+def build_agent_url(
+    account: str,
+    database: str,
+    schema: str,
+    agent: str,
+    *,
+    base_url: str | None = None,
+) -> str:
+    """Construct the REST endpoint for the describe request."""
+
+    base = build_agents_url(account, database, schema, base_url=base_url)
+    return f"{base}/{urllib.parse.quote_plus(agent.strip())}"
+
+
+def fetch_agent_metadata(
+    url: str,
+    token: Credential,
+    *,
+    verbose: bool,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+    cache: MetadataCache | None = None,
+    cache_key: str | None = None,
+) -> Dict[str, Any]:
+    """Perform the HTTP GET request over a pooled keep-alive connection.
+
+    With a ``cache``, a fresh entry is returned without any request and a
+    stale one is revalidated with ``If-None-Match``/``If-Modified-Since``.
+    """
+
+    key = cache_key or MetadataCache.key(url)
+    entry: Dict[str, Any] | None = None
+    if cache is not None:
+        entry, fresh = cache.lookup(key)
+        if entry is not None and fresh:
+            if verbose:
+                print(f"Cached {url}")
+            return entry["body"]
+    # Built only when a request is made: key-pair credentials sign a JWT here.
+    headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        **auth_headers(token),
+    }
+    if cache is not None:
+        headers.update(cache.validators(entry))
+    client = session or get_default_session()
+
+    if verbose:
+        print(f"GET {url}")
+
+    try:
+        with client.get(url, headers=headers, timeout=timeout) as response:
+            payload = response.read()
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"Failed to reach Snowflake endpoint: {exc}") from exc
+
+    if response.status == 304 and cache is not None and entry is not None:
+        cache.touch(key, entry)
+        return entry["body"]
+
+    if response.status >= 400:
+        detail = payload.decode("utf-8", errors="ignore")
+        message = detail or response.reason or "HTTP error"
+        raise RuntimeError(f"Snowflake API error {response.status}: {message}")
+
+    result = json.loads(payload)
+    if cache is not None:
+        cache.store_response(
+            key,
+            result,
+            etag=response.header("ETag"),
+            last_modified=response.header("Last-Modified"),
+        )
+    return result
+
+
+def stream_agent_metadata(
+    url: str,
+    token: Credential,
+    *,
+    write: Callable[[str], object],
+    indent: int | None = 2,
+    select: str | None = None,
+    verbose: bool,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+) -> bool:
+    """Fetch agent metadata and re-emit it as the bytes arrive.
+
+    The body is decoded incrementally and never materialised, so memory stays
+    flat for large specifications. Keys keep the server's order. Returns
+    ``False`` when ``select`` names a path that is not in the document.
+    """
 
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
-        "Authorization": f"Bearer {token.strip()}",
+        **auth_headers(token),
     }
-    request = urllib.request.Request(url, headers=headers, method="GET")
+    client = session or get_default_session()
 
     if verbose:
         print(f"GET {url}")
 
     try:
-        with urllib.request.urlopen(request) as response:  # type: ignore[arg-type]
-            payload = response.read().decode("utf-8")
-    except urllib.error.HTTPError as exc:
-        detail = exc.read().decode("utf-8", errors="ignore")
-        message = detail or exc.reason or "HTTP error"
-        raise RuntimeError(f"Snowflake API error {exc.code}: {message}") from exc
-    except urllib.error.URLError as exc:
-        raise RuntimeError(f"Failed to reach Snowflake endpoint: {exc.reason}") from exc
+        with client.get(url, headers=headers, timeout=timeout) as response:
+            if response.status >= 400:
+                detail = response.read().decode("utf-8", errors="ignore")
+                message = detail or response.reason or "HTTP error"
+                raise RuntimeError(f"Snowflake API error {response.status}: {message}")
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            streamer = JsonStreamer(write, indent=indent, select=parse_selector(select))
+            for chunk in response.iter_chunks():
+                streamer.feed(decoder.decode(chunk))
+            streamer.feed(decoder.decode(b"", final=True))
+            return streamer.close()
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"Failed to reach Snowflake endpoint: {exc}") from exc
+
+
+class AgentRef(NamedTuple):
+    """Fully qualified name of a Cortex Agent."""
+
+    database: str
+    schema: str
+    name: str
+
+
+def _split_names(value: str) -> List[str]:
+    """Split a comma separated option value into trimmed names."""
+
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def load_agent_refs(path: Path) -> List[AgentRef]:
+    """Read ``DATABASE.SCHEMA.AGENT`` lines from a file, ignoring comments."""
+
+    refs: List[AgentRef] = []
+    for number, raw_line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [part.strip() for part in line.split(".")]
+        if len(parts) != 3 or not all(parts):
+            raise ValueError(f"{path}:{number}: expected DATABASE.SCHEMA.AGENT, got {line!r}")
+        refs.append(AgentRef(*parts))
+    return refs
+
+
+def list_agents(
+    account: str,
+    database: str,
+    schema: str,
+    token: Credential,
+    *,
+    verbose: bool,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+    base_url: str | None = None,
+) -> List[AgentRef]:
+    """Return the agents defined in a schema."""
+
+    url = build_agents_url(account, database, schema, base_url=base_url)
+    payload: Any = fetch_agent_metadata(url, token, verbose=verbose, session=session, timeout=timeout)
+    if isinstance(payload, dict):
+        payload = payload.get("data", [])
+    try:
+        return [AgentRef(database, schema, item["name"]) for item in payload]
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"Unexpected agent listing for {database}.{schema}: {exc!r}") from exc
+
+
+async def describe_agents(
+    account: str,
+    token: Credential,
+    *,
+    refs: List[AgentRef],
+    schemas: List[tuple[str, str]],
+    concurrency: int,
+    timeout: float | None,
+    verbose: bool,
+    session: RestSession | None = None,
+    cache: MetadataCache | None = None,
+    base_url: str | None = None,
+    out: Any = None,
+) -> int:
+    """Describe many agents concurrently, streaming one NDJSON line per agent.
+
+    Listing calls for ``schemas`` and describe calls share one semaphore, so at
+    most ``concurrency`` REST requests are in flight. Each describe is emitted
+    as soon as it finishes; the return value is the number of failures.
+    """
+
+    stream = out if out is not None else sys.stdout
+    client = session or get_default_session()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    failures = 0
+
+    def emit(record: Dict[str, Any]) -> None:
+        nonlocal failures
+        if not record["ok"]:
+            failures += 1
+        stream.write(json.dumps(record, sort_keys=True) + "\n")
+        stream.flush()
+
+    async def call(func: Any, *args: Any, **kwargs: Any) -> Any:
+        # The slot is held until the worker thread returns, so ``concurrency``
+        # bounds the requests actually in flight; ``timeout`` is enforced by
+        # the socket read timeout rather than by abandoning the thread.
+        async with semaphore:
+            return await asyncio.to_thread(func, *args, session=client, timeout=timeout, **kwargs)
+
+    async def describe(ref: AgentRef) -> None:
+        url = build_agent_url(account, ref.database, ref.schema, ref.name, base_url=base_url)
+        record: Dict[str, Any] = {"database": ref.database, "schema": ref.schema, "agent": ref.name}
+        started = time.perf_counter()
+        try:
+            record["metadata"] = await call(
+                fetch_agent_metadata,
+                url,
+                token,
+                verbose=verbose,
+                cache=cache,
+                cache_key=MetadataCache.key(url),
+            )
+            record["ok"] = True
+        except (RuntimeError, ValueError, OSError) as exc:
+            record["ok"] = False
+            record["error"] = str(exc) or type(exc).__name__
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        emit(record)
 
-    return json.loads(payload)
+    async def expand(database: str, schema: str) -> None:
+        try:
+            found = await call(list_agents, account, database, schema, token, verbose=verbose, base_url=base_url)
+        except (RuntimeError, ValueError, KeyError, TypeError, OSError) as exc:
+            emit(
+                {
+                    "database": database,
+                    "schema": schema,
+                    "agent": None,
+                    "ok": False,
+                    "error": f"listing failed: {exc or type(exc).__name__}",
+                }
+            )
+            return
+        await asyncio.gather(*(describe(ref) for ref in found))
+
+    await asyncio.gather(
+        *(describe(ref) for ref in refs),
+        *(expand(database, schema) for database, schema in schemas),
+    )
+    return failures
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -74,14 +314,85 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--account", default=os.environ.get("SNOWFLAKE_ACCOUNT", ""))
-    parser.add_argument("--database", default=os.environ.get("SNOWFLAKE_DATABASE", ""))
-    parser.add_argument("--schema", default=os.environ.get("SNOWFLAKE_SCHEMA", ""))
+    parser.add_argument(
+        "--database",
+        default=os.environ.get("SNOWFLAKE_DATABASE", ""),
+        help="Database name; with --all, a comma separated list.",
+    )
+    parser.add_argument(
+        "--schema",
+        default=os.environ.get("SNOWFLAKE_SCHEMA", ""),
+        help="Schema name; with --all, a comma separated list.",
+    )
     parser.add_argument("--agent", default=os.environ.get("SNOWFLAKE_AGENT", ""))
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("SNOWFLAKE_API_URL") or None,
+        help="Override the https://<account>.snowflakecomputing.com base, e.g. a local stand-in.",
+    )
     parser.add_argument(
         "--token",
         default=os.environ.get("SNOWFLAKE_PAT", os.environ.get("SNOWFLAKE_TOKEN", "")),
         help="Programmatic access token or bearer token for the API.",
     )
+    add_auth_arguments(parser)
+    fleet = parser.add_mutually_exclusive_group()
+    fleet.add_argument(
+        "--all",
+        action="store_true",
+        help="List and describe every agent in each --database/--schema combination.",
+    )
+    fleet.add_argument(
+        "--from-file",
+        type=Path,
+        default=None,
+        help="Describe the DATABASE.SCHEMA.AGENT names listed in this file.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of REST calls in flight with --all/--from-file.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Read timeout in seconds for each REST call.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the response incrementally as it downloads (bypasses the cache).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Emit compact JSON instead of indented output (implies --stream).",
+    )
+    parser.add_argument(
+        "--select",
+        default=None,
+        metavar="PATH",
+        help="Only print the subtree at a dotted path such as 'tools' or 'tools.0' (implies --stream).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk agent metadata cache.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_METADATA_TTL,
+        help="Seconds a cached description is served without revalidation.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=64,
+        help="Size cap for the metadata cache; least recently used entries are evicted.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -95,6 +406,57 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def _build_cache(args: argparse.Namespace) -> MetadataCache | None:
+    """Create the metadata cache requested on the command line."""
+
+    if args.no_cache:
+        return None
+    store = DiskCache(get_cache_dir("agent-metadata"), max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    return MetadataCache(store, ttl=args.cache_ttl)
+
+
+def _main_fleet(args: argparse.Namespace) -> int:
+    """Describe many agents and stream NDJSON results."""
+
+    refs: List[AgentRef] = []
+    schemas: List[tuple[str, str]] = []
+    if args.from_file is not None:
+        try:
+            refs = load_agent_refs(args.from_file)
+        except (OSError, ValueError) as exc:
+            raise SystemExit(str(exc)) from exc
+    else:
+        databases = _split_names(args.database)
+        if not databases:
+            raise SystemExit("Snowflake database is required (use --database or SNOWFLAKE_DATABASE).")
+        names = _split_names(args.schema)
+        if not names:
+            raise SystemExit("Snowflake schema is required (use --schema or SNOWFLAKE_SCHEMA).")
+        schemas = [(database, schema) for database in databases for schema in names]
+
+    if args.dry_run:
+        for database, schema in schemas:
+            print("Dry run: would list", build_agents_url(args.account, database, schema, base_url=args.base_url))
+        for ref in refs:
+            print("Dry run: would call", build_agent_url(args.account, *ref, base_url=args.base_url))
+        return 0
+
+    failures = asyncio.run(
+        describe_agents(
+            args.account,
+            args.credential,
+            refs=refs,
+            schemas=schemas,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            verbose=args.verbose,
+            cache=_build_cache(args),
+            base_url=args.base_url,
+        )
+    )
+    return 1 if failures else 0
+
+
 def main(argv: list[str] | None = None) -> int:
     """Entry point for describing a Cortex Agent."""
 
@@ -102,22 +464,50 @@ def main(argv: list[str] | None = None) -> int:
 
     if not args.account:
         raise SystemExit("Snowflake account is required (use --account or SNOWFLAKE_ACCOUNT).")
+    args.credential = credential_from_args(args)
+    if args.credential is None:
+        raise SystemExit(
+            "A programmatic access token (--token or SNOWFLAKE_PAT) or key-pair credentials "
+            "(--user and .secrets/keys/rsa_key.p8) are required."
+        )
+    if args.all or args.from_file is not None:
+        return _main_fleet(args)
     if not args.database:
         raise SystemExit("Snowflake database is required (use --database or SNOWFLAKE_DATABASE).")
     if not args.schema:
         raise SystemExit("Snowflake schema is required (use --schema or SNOWFLAKE_SCHEMA).")
     if not args.agent:
         raise SystemExit("Cortex agent name is required (use --agent or SNOWFLAKE_AGENT).")
-    if not args.token:
-        raise SystemExit("Programmatic access token is required (use --token or SNOWFLAKE_PAT).")
 
-    url = build_agent_url(args.account, args.database, args.schema, args.agent)
+    url = build_agent_url(args.account, args.database, args.schema, args.agent, base_url=args.base_url)
 
     if args.dry_run:
         print("Dry run: would call", url)
         return 0
 
-    result = fetch_agent_metadata(url, args.token, verbose=args.verbose)
+    if args.stream or args.compact or args.select:
+        found = stream_agent_metadata(
+            url,
+            args.credential,
+            write=sys.stdout.write,
+            indent=None if args.compact else 2,
+            select=args.select,
+            verbose=args.verbose,
+            timeout=args.timeout,
+        )
+        if not found:
+            print(f"Path not found in agent metadata: {args.select}", file=sys.stderr)
+            return 1
+        return 0
+
+    result = fetch_agent_metadata(
+        url,
+        args.credential,
+        verbose=args.verbose,
+        timeout=args.timeout,
+        cache=_build_cache(args),
+        cache_key=MetadataCache.key(url),
+    )
     print(json.dumps(result, indent=2, sort_keys=True))
     return 0
 
@@ -127,10 +517,16 @@ if __name__ == "__main__":  # pragma: no cover - module entry point
 
 
 __all__ = [
+    "AgentRef",
     "build_agent_url",
+    "build_agents_url",
+    "describe_agents",
     "fetch_agent_metadata",
+    "list_agents",
+    "load_agent_refs",
     "main",
     "normalise_account",
     "parse_args",
+    "stream_agent_metadata",
 ]
 
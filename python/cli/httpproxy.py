@@ -0,0 +1,233 @@
+"""Building blocks for small HTTP proxies and replay servers.
+
+:class:`ProxyServer` hands every request to an ``app`` callable as a
+:class:`ProxyRequest` together with a :class:`ResponseWriter`. ``forward``
+sends a request upstream over a pooled :class:`~python.cli.rest.RestSession`,
+and ``relay`` streams the answer back chunk by chunk, so server-sent events
+pass through as they arrive.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from .rest import RestResponse, RestSession
+
+# Headers that describe one connection rather than the message (RFC 9110 7.6.1),
+# plus those the proxy recomputes because bodies are forwarded decoded.
+HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+        "content-encoding",
+        "accept-encoding",
+    }
+)
+
+Headers = List[Tuple[str, str]]
+
+
+class ProxyRequest(NamedTuple):
+    """A fully read incoming request."""
+
+    method: str
+    target: str
+    headers: Dict[str, str]
+    body: bytes
+
+    @property
+    def path(self) -> str:
+        """The target without its query string."""
+
+        return self.target.split("?", 1)[0]
+
+    def json(self) -> Any:
+        """The body parsed as JSON (``None`` when empty or invalid)."""
+
+        try:
+            return json.loads(self.body) if self.body else None
+        except ValueError:
+            return None
+
+
+def end_to_end(headers: Iterable[Tuple[str, str]]) -> Headers:
+    """Drop hop-by-hop and length/encoding headers."""
+
+    return [(name, value) for name, value in headers if name.lower() not in HOP_BY_HOP]
+
+
+class ResponseWriter:
+    """Writes one response, either whole or as a chunked stream."""
+
+    def __init__(self, handler: BaseHTTPRequestHandler) -> None:
+        self._handler = handler
+        self._chunked = False
+        self.started = False
+
+    def send(self, status: int, headers: Iterable[Tuple[str, str]], body: bytes) -> None:
+        """Send a complete response with ``Content-Length``."""
+
+        self._handler.send_response(status)
+        for name, value in end_to_end(headers):
+            self._handler.send_header(name, value)
+        self._handler.send_header("Content-Length", str(len(body)))
+        self._handler.end_headers()
+        self.started = True
+        if body and self._handler.command != "HEAD":
+            self._handler.wfile.write(body)
+
+    def send_json(self, status: int, payload: Any, headers: Iterable[Tuple[str, str]] = ()) -> None:
+        """Send ``payload`` as a JSON response."""
+
+        body = json.dumps(payload).encode("utf-8")
+        self.send(status, [*headers, ("Content-Type", "application/json")], body)
+
+    def start(self, status: int, headers: Iterable[Tuple[str, str]]) -> None:
+        """Begin a chunked response; follow with :meth:`write` and :meth:`finish`."""
+
+        self._handler.send_response(status)
+        for name, value in end_to_end(headers):
+            self._handler.send_header(name, value)
+        self._handler.send_header("Transfer-Encoding", "chunked")
+        self._handler.end_headers()
+        self._chunked = self._handler.command != "HEAD"
+        self.started = True
+
+    def write(self, data: bytes) -> None:
+        """Send one chunk immediately."""
+
+        if data and self._chunked:
+            self._handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self._handler.wfile.flush()
+
+    def finish(self) -> None:
+        """Terminate a chunked response."""
+
+        if self._chunked:
+            self._handler.wfile.write(b"0\r\n\r\n")
+            self._handler.wfile.flush()
+            self._chunked = False
+
+
+App = Callable[[ProxyRequest, ResponseWriter], None]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "ProxyServer"
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+    def _read_body(self) -> bytes:
+        if "chunked" in (self.headers.get("Transfer-Encoding") or "").lower():
+            parts = []
+            while True:
+                size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(parts)
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self) -> None:
+        request = ProxyRequest(self.command, self.path, dict(self.headers.items()), self._read_body())
+        writer = ResponseWriter(self)
+        try:
+            self.server.app(request, writer)
+        except (OSError, http.client.HTTPException, RuntimeError) as exc:
+            if writer.started:
+                self.close_connection = True
+                return
+            writer.send_json(502, {"error": f"Proxy error: {exc}"})
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _dispatch
+
+
+class ProxyServer(ThreadingHTTPServer):
+    """Threaded server that passes every request to ``app``."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], app: App) -> None:
+        super().__init__(address, _Handler)
+        self.app = app
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ProxyServer":
+        """Serve on a daemon thread; returns ``self``."""
+
+        threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+
+        self.shutdown()
+        self.server_close()
+
+
+def forward(
+    session: RestSession,
+    upstream: str,
+    request: ProxyRequest,
+    *,
+    timeout: float | None = None,
+) -> RestResponse:
+    """Send ``request`` to ``upstream`` (a base URL) and return the open response."""
+
+    headers = dict(end_to_end(request.headers.items()))
+    return session.request(
+        request.method,
+        upstream.rstrip("/") + request.target,
+        headers=headers,
+        body=request.body if request.body or request.method not in ("GET", "HEAD") else None,
+        timeout=timeout,
+    )
+
+
+def relay(
+    response: RestResponse,
+    writer: ResponseWriter,
+    *,
+    on_chunk: Callable[[bytes], None] | None = None,
+) -> None:
+    """Stream an upstream response to the client, calling ``on_chunk`` per chunk."""
+
+    writer.start(response.status, response.headers.items())
+    with response:
+        for chunk in response.iter_chunks():
+            if on_chunk is not None:
+                on_chunk(chunk)
+            writer.write(chunk)
+    writer.finish()
+
+
+__all__ = [
+    "App",
+    "HOP_BY_HOP",
+    "ProxyRequest",
+    "ProxyServer",
+    "ResponseWriter",
+    "end_to_end",
+    "forward",
+    "relay",
+]
@@ -0,0 +1,297 @@
+"""Incremental JSON re-formatter for streaming large REST payloads.
+
+The streamer tokenises text as it arrives and writes it back out, pretty or
+compact, without ever building Python objects. Scalars are copied verbatim,
+so memory use is bounded by the input chunk size rather than the document
+size, and output starts before the response has finished downloading.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Callable, List, Sequence
+
+_WHITESPACE = " \t\r\n"
+_STRING_RUN = re.compile(r'[^"\\]*')
+_SCALAR_RUN = re.compile(r"[^\s,\]\}:]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?\Z")
+_LITERALS = frozenset(("true", "false", "null"))
+
+
+class _Frame:
+    """Parser state for one open object or array."""
+
+    __slots__ = ("is_map", "state", "key", "count")
+
+    def __init__(self, is_map: bool) -> None:
+        self.is_map = is_map
+        self.state = "key" if is_map else "value"
+        self.key = ""
+        self.count = 0
+
+
+def parse_selector(path: str | None) -> List[str] | None:
+    """Split a dotted selector such as ``tools.0.tool_spec`` into segments."""
+
+    if not path:
+        return None
+    return [segment for segment in path.split(".") if segment]
+
+
+class JsonStreamer:
+    """Re-emit a JSON document incrementally, optionally only a subtree.
+
+    Feed decoded text with :meth:`feed` and call :meth:`close` at the end.
+    ``indent=None`` produces compact output. ``select`` is a list of object
+    keys and array indices; only the value at that path is written.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str], object],
+        *,
+        indent: int | None = 2,
+        select: Sequence[str] | None = None,
+    ) -> None:
+        self._write = write
+        self._indent = indent
+        self._select = list(select) if select else None
+        self._stack: List[_Frame] = []
+        self._pending = ""
+        self._mode: str | None = None
+        self._string_is_key = False
+        self._key_parts: List[str] = []
+        self._scalar_parts: List[str] = []
+        self._finished = False
+        # Writer state: counts of items written per open container, relative
+        # to the capture root, and whether a key is awaiting its value.
+        self._capture_depth: int | None = None if self._select else 0
+        self._out_counts: List[int] = []
+        self._after_key = False
+        self.matched = self._select is None
+
+    # -- writer -----------------------------------------------------------------
+
+    @property
+    def _emitting(self) -> bool:
+        return self._capture_depth is not None
+
+    def _newline(self, depth: int) -> None:
+        if self._indent is not None:
+            self._write("\n" + " " * (self._indent * depth))
+
+    def _begin_value(self) -> None:
+        if self._after_key:
+            self._after_key = False
+            return
+        if self._out_counts:
+            if self._out_counts[-1]:
+                self._write(",")
+            self._out_counts[-1] += 1
+            self._newline(len(self._out_counts))
+
+    def _emit_key(self, raw: str) -> None:
+        if self._out_counts[-1]:
+            self._write(",")
+        self._out_counts[-1] += 1
+        self._newline(len(self._out_counts))
+        self._write(raw)
+        self._write(": " if self._indent is not None else ":")
+        self._after_key = True
+
+    # -- parser -----------------------------------------------------------------
+
+    def _error(self, detail: str) -> ValueError:
+        return ValueError(f"Malformed JSON: {detail}")
+
+    def _enter_value(self) -> None:
+        """Validate a value position and start a capture when the path matches."""
+
+        if self._finished:
+            raise self._error("unexpected data after the top-level value")
+        if self._stack:
+            frame = self._stack[-1]
+            if frame.state != "value":
+                raise self._error("value where a key or separator was expected")
+        if self._capture_depth is None and self._select is not None and len(self._stack) == len(self._select):
+            path = [frame.key if frame.is_map else str(frame.count) for frame in self._stack]
+            if path == self._select:
+                self._capture_depth = len(self._stack)
+                self.matched = True
+
+    def _leave_value(self) -> None:
+        """Advance the parent container after a value completes."""
+
+        if self._capture_depth is not None and len(self._stack) == self._capture_depth and self._select:
+            self._capture_depth = None
+            self._out_counts = []
+        if not self._stack:
+            self._finished = True
+            return
+        frame = self._stack[-1]
+        frame.count += 1
+        frame.state = "comma"
+
+    def _open(self, is_map: bool) -> None:
+        self._enter_value()
+        if self._emitting:
+            self._begin_value()
+            self._write("{" if is_map else "[")
+            self._out_counts.append(0)
+        self._stack.append(_Frame(is_map))
+
+    def _close(self, is_map: bool) -> None:
+        if not self._stack or self._stack[-1].is_map != is_map:
+            raise self._error(f"unbalanced {'}' if is_map else ']'}")
+        frame = self._stack[-1]
+        expected = ("key", "comma") if is_map else ("value", "comma")
+        if frame.state not in expected or (frame.state != "comma" and frame.count):
+            raise self._error("trailing separator")
+        self._stack.pop()
+        if self._emitting:
+            count = self._out_counts.pop()
+            if count:
+                self._newline(len(self._out_counts))
+            self._write("}" if is_map else "]")
+        self._leave_value()
+
+    def _start_string(self) -> None:
+        frame = self._stack[-1] if self._stack else None
+        self._string_is_key = frame is not None and frame.is_map and frame.state == "key"
+        if self._string_is_key:
+            self._key_parts = ['"']
+        else:
+            self._enter_value()
+            if self._emitting:
+                self._begin_value()
+                self._write('"')
+        self._mode = "string"
+
+    def _string_part(self, text: str) -> None:
+        if self._string_is_key:
+            self._key_parts.append(text)
+        elif self._emitting and text:
+            self._write(text)
+
+    def _end_string(self) -> None:
+        self._mode = None
+        if self._string_is_key:
+            self._key_parts.append('"')
+            raw = "".join(self._key_parts)
+            self._key_parts = []
+            frame = self._stack[-1]
+            # Keys are short; decode them so selectors can match escaped names.
+            frame.key = _decode_key(raw)
+            frame.state = "colon"
+            if self._emitting:
+                self._emit_key(raw)
+            return
+        if self._emitting:
+            self._write('"')
+        self._leave_value()
+
+    def _end_scalar(self) -> None:
+        self._mode = None
+        text = "".join(self._scalar_parts)
+        self._scalar_parts = []
+        if text not in _LITERALS and not _NUMBER.match(text):
+            raise self._error(f"invalid literal {text[:32]!r}")
+        if self._emitting:
+            self._begin_value()
+            self._write(text)
+        self._leave_value()
+
+    def feed(self, text: str) -> None:
+        """Consume the next piece of decoded document text."""
+
+        buf = self._pending + text if self._pending else text
+        self._pending = ""
+        pos = 0
+        end = len(buf)
+        while pos < end:
+            if self._mode == "string":
+                run = _STRING_RUN.match(buf, pos)
+                stop = run.end() if run else pos
+                if stop > pos:
+                    self._string_part(buf[pos:stop])
+                    pos = stop
+                if pos >= end:
+                    break
+                if buf[pos] == '"':
+                    pos += 1
+                    self._end_string()
+                    continue
+                # Backslash: copy the escape pair intact; wait if it is split.
+                if pos + 1 >= end:
+                    self._pending = buf[pos:]
+                    return
+                self._string_part(buf[pos : pos + 2])
+                pos += 2
+                continue
+
+            if self._mode == "scalar":
+                run = _SCALAR_RUN.match(buf, pos)
+                stop = run.end() if run else pos
+                self._scalar_parts.append(buf[pos:stop])
+                pos = stop
+                if pos >= end:
+                    break
+                self._end_scalar()
+                continue
+
+            char = buf[pos]
+            if char in _WHITESPACE:
+                pos += 1
+            elif char == "{":
+                self._open(True)
+                pos += 1
+            elif char == "[":
+                self._open(False)
+                pos += 1
+            elif char == "}":
+                self._close(True)
+                pos += 1
+            elif char == "]":
+                self._close(False)
+                pos += 1
+            elif char == '"':
+                self._start_string()
+                pos += 1
+            elif char == ",":
+                frame = self._stack[-1] if self._stack else None
+                if frame is None or frame.state != "comma":
+                    raise self._error("unexpected ','")
+                frame.state = "key" if frame.is_map else "value"
+                pos += 1
+            elif char == ":":
+                frame = self._stack[-1] if self._stack else None
+                if frame is None or frame.state != "colon":
+                    raise self._error("unexpected ':'")
+                frame.state = "value"
+                pos += 1
+            else:
+                self._enter_value()
+                self._mode = "scalar"
+
+    def close(self) -> bool:
+        """Finish the document; returns whether the selector matched."""
+
+        if self._mode == "scalar" and not self._stack:
+            self._end_scalar()
+        if self._mode is not None or self._pending or self._stack or not self._finished:
+            raise self._error("document ended unexpectedly")
+        if self.matched:
+            self._write("\n")
+        return self.matched
+
+
+def _decode_key(raw: str) -> str:
+    """Decode a raw JSON string token."""
+
+    if "\\" not in raw:
+        return raw[1:-1]
+    return json.loads(raw)
+
+
+__all__ = ["JsonStreamer", "parse_selector"]
@@ -7,69 +7,161 @@ point for all automation.
 from __future__ import annotations
 
 import argparse
+import importlib
 import os
-import subprocess
 import sys
-from pathlib import Path
+from collections.abc import Callable
 
-# Add project root to the Python path to allow absolute imports
-project_root = Path(__file__).resolve().parents[2]
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from python.cli import deploy, describe_agent, setup
+# Subcommands that forward their remaining options to ``<module>.main(argv)``.
+# Modules are imported only when their command runs, so ``--help`` and status
+# wrappers do not pay for HTTP, JSON or SQLite imports they never use.
+COMMANDS: dict[str, tuple[str, str]] = {
+    "setup": ("python.cli.setup", "Install all project dependencies (Python and Node.js)."),
+    "configure": ("python.cli.deploy", "Interactively create the .env file for secrets."),
+    # use --all or --from-file to describe many agents concurrently
+    "describe-agent": ("python.cli.describe_agent", "Fetch and display the description of the configured Cortex Agent."),
+    "chat": ("python.cli.chat", "Chat with the agent over the streaming endpoint and time each turn."),
+    "chat-cache": ("python.cli.chatcache", "Answer repeated agent questions from a cache tied to the document set."),
+    "summarize": ("python.cli.summarize", "Summarize a whole document with a map-reduce pass over /api/summarize."),
+    "summary-cache": ("python.cli.summarycache", "Serve /api/summarize from a shared content-addressed cache."),
+    "mirror": ("python.cli.mirror", "Sync and query a local mirror of the document metadata table."),
+    "search": ("python.cli.search", "Search the mirrored document text with a local BM25 index."),
+    "ask": ("python.cli.ask", "Answer a question from the best-matching passages of the mirrored documents."),
+    "check": ("python.cli.check", "Check backend health, the agent and the document table of an environment."),
+    "monitor": ("python.cli.monitor", "Probe backend endpoints on a schedule and serve Prometheus latency metrics."),
+    "translate": ("python.cli.translate", "Translate documents into several languages with bounded parallelism and a cache."),
+    "upload": ("python.cli.upload", "Upload a directory or glob of documents through the backend."),
+    "bench": ("python.bench.cli", "Load-test the backend API and report latency percentiles."),
+    "cassette": ("python.bench.cassette", "Record backend or REST traffic and replay it with original or zero latency."),
+    "standin": ("python.bench.standin", "Serve a local Snowflake stand-in for offline performance tests."),
+}
 
 
-def _run_script(script_path: Path, *args: str) -> int:
+def _forward(module_name: str) -> Callable[[argparse.Namespace], int]:
+    """Return a handler that imports ``module_name`` and runs its ``main``."""
+
+    def handler(args: argparse.Namespace) -> int:
+        module = importlib.import_module(module_name)
+        return module.main(args.argv)
+
+    return handler
+
+
+def _fan_out(args: argparse.Namespace) -> int:
+    """Run ``args.command`` once per selected profile (``--envs``)."""
+    from pathlib import Path
+
+    from python.cli import profiles
+
+    path = Path(args.envs_file) if args.envs_file else None
+    return profiles.fan_out(args.envs, [args.command, *args.argv], path=path)
+
+
+def _run_script(script_path: str, *args: str) -> int:
     """Execute a shell or batch script."""
-    if not script_path.exists():
+    import subprocess
+
+    if not os.path.exists(script_path):
         print(f"Error: Script not found at {script_path}")
         return 1
     
-    command = [str(script_path), *args]
+    command = [script_path, *args]
     try:
         process = subprocess.run(command, check=True)
         return process.returncode
     except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        print(f"Error running script {script_path.name}: {e}")
+        print(f"Error running script {os.path.basename(script_path)}: {e}")
         # On Unix, the file might not be executable
         if sys.platform != "win32" and isinstance(e, FileNotFoundError):
              print(f"Hint: Try running 'chmod +x {script_path}'")
         return 1
 
 
-def main() -> int:
-    """Main command dispatcher."""
+def _start_script() -> str:
+    """Path of ``tools/mac/02_start.sh`` or ``tools/win/02_start.bat``."""
+    if sys.platform == "win32":
+        return os.path.join(project_root, "tools", "win", "02_start.bat")
+    return os.path.join(project_root, "tools", "mac", "02_start.sh")
+
+
+def _run(args: argparse.Namespace) -> int:
+    """Start the services under the supervisor, or with the start script."""
+    if "--script" in args.argv:
+        return _run_script(_start_script(), *[arg for arg in args.argv if arg != "--script"])
+    return _forward("python.cli.supervisor")(args)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the master command line.
+
+    Options after the subcommand name are not interpreted here; they are kept
+    in ``args.argv`` and forwarded to the subcommand's own parser.
+    """
     parser = argparse.ArgumentParser(description="Master control script for the React Agent application.")
+    parser.add_argument("--profile", action="store_true", help="Time every step, subprocess and HTTP call of the command.")
+    parser.add_argument("--profile-out", default=None, help="Trace file (default: .cache/profile/<command>-<time>.trace.json).")
+    parser.add_argument("--profile-python", action="store_true", help="Also run cProfile in every thread and print the top functions.")
+    parser.add_argument("--profile-memory", action="store_true", help="Also trace Python allocations with tracemalloc.")
+    parser.add_argument(
+        "--envs",
+        default=None,
+        metavar="NAMES",
+        help="Run the command in each of these comma separated environment profiles (or 'all') concurrently.",
+    )
+    parser.add_argument(
+        "--envs-file", default=None, help="Environment profiles INI file (default: .secrets/profiles.ini)."
+    )
     subparsers = parser.add_subparsers(dest="command", required=True, help="Available commands")
 
-    # Setup command
-    setup_parser = subparsers.add_parser("setup", help="Install all project dependencies (Python and Node.js).")
-    setup_parser.set_defaults(func=lambda args: setup.main(None))
+    for name, (module_name, help_text) in COMMANDS.items():
+        command_parser = subparsers.add_parser(name, add_help=False, help=help_text)
+        command_parser.set_defaults(func=_forward(module_name))
 
-    # Configure command
-    config_parser = subparsers.add_parser("configure", help="Interactively create the .env file for secrets.")
-    config_parser.set_defaults(func=lambda args: deploy.main(None))
+    # Run command: the Python supervisor, or the platform start script with --script
+    run_parser = subparsers.add_parser(
+        "run", add_help=False, help="Start the backend and frontend servers (--script for the shell script)."
+    )
+    run_parser.set_defaults(func=_run)
+
+    args, forwarded = parser.parse_known_args(argv)
+    args.argv = forwarded
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main command dispatcher."""
+    args = parse_args(argv)
+    if args.envs:
+        args.func = _fan_out
+    if not (args.profile or args.profile_python or args.profile_memory):
+        return args.func(args)
 
-    # Run command
-    run_parser = subparsers.add_parser("run", help="Start the backend and frontend servers.")
-    run_parser.set_defaults(func=lambda args: _run_script(project_root / "tools" / f"02_start.{'bat' if sys.platform == 'win32' else 'sh'}"))
+    from pathlib import Path
 
-    # Describe agent command
-    describe_parser = subparsers.add_parser("describe-agent", help="Fetch and display the description of the configured Cortex Agent.")
-    describe_parser.set_defaults(func=lambda args: describe_agent.main(None))
+    from python.cli import profiling
 
-    args = parser.parse_args()
-    return args.func(args)
+    with profiling.profile_run(
+        args.command,
+        output=Path(args.profile_out) if args.profile_out else None,
+        python_profile=args.profile_python,
+        memory_profile=args.profile_memory,
+    ):
+        return args.func(args)
 
 
 if __name__ == "__main__":
-    # Ensure PYTHONPATH is set for discoverability if run directly
-    os.environ["PYTHONPATH"] = str(project_root)
+    # Running this file directly: make ``python.*`` importable for the lazily
+    # loaded subcommands (and for any Python subprocesses they start).
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    os.environ["PYTHONPATH"] = project_root
     sys.exit(main())
 
 
 __all__ = [
+    "COMMANDS",
     "do_build",
     "do_deploy",
     "do_describe_agent",
@@ -0,0 +1,356 @@
+"""Local SQLite mirror of ``SFE_DOCUMENT_METADATA``.
+
+``sync`` pulls only rows whose ``EXTRACTION_TIMESTAMP`` is at or after the
+newest one already mirrored, so routine refreshes read a handful of rows
+instead of the whole table. ``list`` and ``show`` are then served from the
+local file without waking the warehouse. Extracted text is stored
+zlib-compressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+from .cache import get_cache_dir
+from .sqlapi import SqlApiClient, add_connection_arguments, client_from_args
+
+DEFAULT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    file_path TEXT PRIMARY KEY,
+    file_name TEXT,
+    file_size INTEGER,
+    last_modified TEXT,
+    page_count INTEGER,
+    extraction_timestamp TEXT,
+    text_length INTEGER NOT NULL,
+    text BLOB
+);
+CREATE INDEX IF NOT EXISTS documents_extracted ON documents (extraction_timestamp);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_SELECT_COLUMNS = (
+    "FILE_PATH, FILE_NAME, FILE_SIZE, "
+    "TO_VARCHAR(LAST_MODIFIED, 'YYYY-MM-DD HH24:MI:SS.FF3') AS LAST_MODIFIED, PAGE_COUNT, "
+    "TO_VARCHAR(EXTRACTION_TIMESTAMP, 'YYYY-MM-DD HH24:MI:SS.FF9') AS EXTRACTION_TIMESTAMP, EXTRACTED_TEXT"
+)
+
+_LIST_COLUMNS = "file_path, file_name, file_size, last_modified, page_count, extraction_timestamp, text_length"
+
+
+def default_mirror_path() -> Path:
+    """Location of the shared document mirror."""
+
+    return get_cache_dir("documents.sqlite")
+
+
+def _to_int(value: Any) -> int | None:
+    if value in (None, ""):
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class DocumentMirror:
+    """SQLite copy of the document metadata table with compressed text."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "DocumentMirror":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+
+        with self._lock:
+            self._db.close()
+
+    # -- writing ----------------------------------------------------------------------
+
+    def upsert(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Insert or replace rows shaped like ``SFE_DOCUMENT_METADATA``; returns the count."""
+
+        records = []
+        for row in rows:
+            text = row.get("EXTRACTED_TEXT") or ""
+            records.append(
+                (
+                    row["FILE_PATH"],
+                    row.get("FILE_NAME"),
+                    _to_int(row.get("FILE_SIZE")),
+                    row.get("LAST_MODIFIED"),
+                    _to_int(row.get("PAGE_COUNT")),
+                    row.get("EXTRACTION_TIMESTAMP"),
+                    len(text),
+                    zlib.compress(text.encode("utf-8"), 6),
+                )
+            )
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+        return len(records)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Delete mirrored documents whose path is not in ``keep``."""
+
+        keep_set = set(keep)
+        with self._lock, self._db:
+            stale = [row[0] for row in self._db.execute("SELECT file_path FROM documents") if row[0] not in keep_set]
+            self._db.executemany("DELETE FROM documents WHERE file_path = ?", [(path,) for path in stale])
+        return len(stale)
+
+    def set_state(self, key: str, value: str) -> None:
+        """Record a sync bookkeeping value."""
+
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+
+    # -- reading ----------------------------------------------------------------------
+
+    def state(self, key: str) -> str | None:
+        """Return a sync bookkeeping value."""
+
+        with self._lock:
+            row = self._db.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def watermark(self) -> str | None:
+        """Newest ``EXTRACTION_TIMESTAMP`` in the mirror."""
+
+        with self._lock:
+            row = self._db.execute("SELECT MAX(extraction_timestamp) FROM documents").fetchone()
+        return row[0]
+
+    def version(self) -> tuple[str | None, int]:
+        """``(watermark, document count)``, which changes whenever the mirror does."""
+
+        with self._lock:
+            row = self._db.execute("SELECT MAX(extraction_timestamp), COUNT(*) FROM documents").fetchone()
+        return row[0], row[1]
+
+    def list(self, *, limit: int | None = None) -> List[Dict[str, Any]]:
+        """Document metadata, newest ``last_modified`` first (like ``GET /api/documents``)."""
+
+        sql = f"SELECT {_LIST_COLUMNS} FROM documents ORDER BY last_modified DESC"
+        params: tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def get(self, file_path: str, *, include_text: bool = True) -> Dict[str, Any] | None:
+        """Metadata (and decompressed text) for one document."""
+
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_LIST_COLUMNS}, text FROM documents WHERE file_path = ?", (file_path,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        blob = record.pop("text")
+        if include_text:
+            record["text"] = zlib.decompress(blob).decode("utf-8") if blob else ""
+        return record
+
+    def iter_texts(self) -> Iterator[tuple[str, str, str | None]]:
+        """Yield ``(file_path, text, extraction_timestamp)`` for every document."""
+
+        with self._lock:
+            rows = self._db.execute("SELECT file_path, text, extraction_timestamp FROM documents").fetchall()
+        for path, blob, extracted in rows:
+            yield path, zlib.decompress(blob).decode("utf-8") if blob else "", extracted
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count, text volume and on-disk size."""
+
+        with self._lock:
+            count, characters, stored = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(text_length), 0), COALESCE(SUM(LENGTH(text)), 0) FROM documents"
+            ).fetchone()
+        return {
+            "documents": count,
+            "text_characters": characters,
+            "text_bytes_stored": stored,
+            "watermark": self.watermark(),
+            "last_sync": self.state("last_sync"),
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+
+def sync(
+    mirror: DocumentMirror,
+    client: SqlApiClient,
+    *,
+    full: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Pull new or re-extracted rows into ``mirror``.
+
+    Pages are ordered by ``EXTRACTION_TIMESTAMP`` and each page starts at the
+    newest timestamp seen so far (inclusive), because one extraction task run
+    stamps many rows with the same timestamp. Re-fetched boundary rows are
+    harmless upserts. If an entire page shares one timestamp, that group is
+    fetched without a limit before moving strictly past it.
+    """
+
+    started = time.perf_counter()
+    watermark = None if full else mirror.watermark()
+    seen: set[str] = set()
+    fetched = 0
+    pages = 0
+    inclusive = True
+    while True:
+        if watermark is None:
+            sql = f"SELECT {_SELECT_COLUMNS} FROM SFE_DOCUMENT_METADATA ORDER BY EXTRACTION_TIMESTAMP LIMIT {batch_size}"
+            bindings: List[Any] = []
+        else:
+            operator = ">=" if inclusive else ">"
+            sql = (
+                f"SELECT {_SELECT_COLUMNS} FROM SFE_DOCUMENT_METADATA "
+                f"WHERE EXTRACTION_TIMESTAMP {operator} ? ORDER BY EXTRACTION_TIMESTAMP LIMIT {batch_size}"
+            )
+            bindings = [watermark]
+        rows = client.execute(sql, bindings)
+        pages += 1
+        fresh = [row for row in rows if row.get("FILE_PATH") not in seen]
+        mirror.upsert(fresh)
+        fetched += len(rows)
+        seen.update(row["FILE_PATH"] for row in rows)
+        if len(rows) < batch_size:
+            break
+        first, last = rows[0].get("EXTRACTION_TIMESTAMP"), rows[-1].get("EXTRACTION_TIMESTAMP")
+        if first == last and last == watermark:
+            group = client.execute(
+                f"SELECT {_SELECT_COLUMNS} FROM SFE_DOCUMENT_METADATA WHERE EXTRACTION_TIMESTAMP = ?",
+                [last],
+            )
+            pages += 1
+            mirror.upsert(row for row in group if row.get("FILE_PATH") not in seen)
+            fetched += len(group)
+            seen.update(row["FILE_PATH"] for row in group)
+            inclusive = False
+        else:
+            inclusive = True
+        watermark = last
+
+    pruned = mirror.prune(seen) if full else 0
+    mirror.set_state("last_sync", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+    return {
+        "rows_fetched": fetched,
+        "documents_updated": len(seen),
+        "documents_pruned": pruned,
+        "pages": pages,
+        "watermark": mirror.watermark(),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _format_size(value: Any) -> str:
+    size = float(value or 0)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return str(value)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=None, help="Mirror database (default: .cache/documents.sqlite).")
+    commands = parser.add_subparsers(dest="action", required=True)
+
+    sync_parser = commands.add_parser("sync", help="Pull new and re-extracted documents.")
+    sync_parser.add_argument("--full", action="store_true", help="Re-read the whole table and drop deleted documents.")
+    sync_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per SQL API page.")
+    add_connection_arguments(sync_parser)
+
+    list_parser = commands.add_parser("list", help="List mirrored documents.")
+    list_parser.add_argument("--limit", type=int, default=None)
+    list_parser.add_argument("--json", action="store_true", help="Print JSON instead of a table.")
+
+    show_parser = commands.add_parser("show", help="Show one mirrored document.")
+    show_parser.add_argument("path", help="FILE_PATH of the document.")
+    show_parser.add_argument("--text", action="store_true", help="Print the extracted text as well.")
+
+    commands.add_parser("stats", help="Summarise the mirror contents.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the mirror command."""
+
+    args = parse_args(argv)
+    with DocumentMirror(args.db or default_mirror_path()) as mirror:
+        if args.action == "sync":
+            client = client_from_args(args)
+            try:
+                result = sync(mirror, client, full=args.full, batch_size=args.batch_size)
+            except RuntimeError as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                return 1
+            print(json.dumps(result, indent=2))
+        elif args.action == "list":
+            rows = mirror.list(limit=args.limit)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                for row in rows:
+                    print(
+                        f"{row['last_modified'] or '':<24} {_format_size(row['file_size']):>9} "
+                        f"{row['text_length']:>9} chars  {row['file_path']}"
+                    )
+                print(f"{len(rows)} documents", file=sys.stderr)
+        elif args.action == "show":
+            record = mirror.get(args.path, include_text=args.text)
+            if record is None:
+                print(f"Document {args.path!r} is not in the mirror; run 'mirror sync' first.", file=sys.stderr)
+                return 1
+            text = record.pop("text", None)
+            print(json.dumps(record, indent=2))
+            if text is not None:
+                print(text)
+        else:
+            print(json.dumps(mirror.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DocumentMirror",
+    "default_mirror_path",
+    "main",
+    "parse_args",
+    "sync",
+]
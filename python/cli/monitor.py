@@ -0,0 +1,407 @@
+"""Probe backend endpoints on a schedule and export latency metrics.
+
+Each probe keeps its most recent samples in fixed-size ring buffers (two
+``array('d')`` blocks, so memory does not grow with uptime) next to
+cumulative Prometheus histograms and error counters. ``/metrics`` serves
+them in the Prometheus text format::
+
+    python python/cli/master.py monitor --interval 15 --listen 127.0.0.1:9464
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from .backend import get_backend_url
+from .rest import RestSession
+from .stats import DEFAULT_BUCKETS, percentile
+
+DEFAULT_INTERVAL = 15.0
+DEFAULT_WINDOW = 1024
+DEFAULT_LISTEN = "127.0.0.1:9464"
+DEFAULT_TIMEOUT = 10.0
+WINDOW_QUANTILES = (0.5, 0.9, 0.99)
+METRIC_PREFIX = "sfe_probe"
+
+
+class Probe(NamedTuple):
+    """One endpoint to time, relative to the backend URL."""
+
+    name: str
+    path: str
+
+
+DEFAULT_PROBES: Tuple[Probe, ...] = (
+    Probe("health", "/health"),
+    Probe("config", "/api/config"),
+    Probe("documents", "/api/documents"),
+)
+
+
+class RingBuffer:
+    """The last ``capacity`` ``(timestamp, value)`` samples in preallocated arrays."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be positive.")
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Store a sample, overwriting the oldest once full."""
+
+        self.timestamps[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def samples(self, since: float | None = None) -> List[float]:
+        """Values in insertion order, optionally only those at or after ``since``."""
+
+        start = (self._next - self.count) % self.capacity
+        order = [(start + offset) % self.capacity for offset in range(self.count)]
+        if since is None:
+            return [self.values[index] for index in order]
+        return [self.values[index] for index in order if self.timestamps[index] >= since]
+
+
+class ProbeStats:
+    """Window samples, cumulative histogram and error counts for one probe."""
+
+    def __init__(self, probe: Probe, *, window: int, buckets: Sequence[float]) -> None:
+        self.probe = probe
+        self.window = RingBuffer(window)
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self.total_seconds = 0.0
+        self.errors: Dict[str, int] = {}
+        self.up = 0
+        self.last_status = 0
+        self.last_success = 0.0
+
+    def record(self, timestamp: float, seconds: float, status: int, error: str | None) -> None:
+        """Add one probe outcome; ``error`` is ``None`` on success."""
+
+        self.window.append(timestamp, seconds)
+        index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+        self.bucket_counts[index] += 1
+        self.total += 1
+        self.total_seconds += seconds
+        self.last_status = status
+        if error is None:
+            self.up = 1
+            self.last_success = timestamp
+        else:
+            self.up = 0
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Window percentiles and counters as plain values."""
+
+        values = sorted(self.window.samples())
+        return {
+            "probe": self.probe.name,
+            "path": self.probe.path,
+            "up": self.up,
+            "last_status": self.last_status,
+            "requests": self.total,
+            "errors": dict(self.errors),
+            "window": len(values),
+            **{f"p{round(q * 100)}_ms": _ms(percentile(values, q)) for q in WINDOW_QUANTILES},
+        }
+
+
+def _ms(seconds: float) -> float | None:
+    return None if math.isnan(seconds) else round(seconds * 1000, 2)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+class Monitor:
+    """Probe a backend on a fixed schedule and render Prometheus metrics."""
+
+    def __init__(
+        self,
+        base_url: str,
+        probes: Sequence[Probe] = DEFAULT_PROBES,
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        window: int = DEFAULT_WINDOW,
+        timeout: float = DEFAULT_TIMEOUT,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        session: RestSession | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.probes = list(probes)
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session or RestSession(pool_size=len(self.probes))
+        self.stats = {probe.name: ProbeStats(probe, window=window, buckets=buckets) for probe in self.probes}
+        self.rounds = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def probe_once(self, probe: Probe) -> Tuple[float, int, str | None]:
+        """Time one request; returns ``(seconds, status, error kind or None)``."""
+
+        started = time.perf_counter()
+        status, error = 0, None
+        try:
+            with self.session.get(self.base_url + probe.path, timeout=self.timeout) as response:
+                response.read()
+                status = response.status
+        except TimeoutError:
+            error = "timeout"
+        except (OSError, http.client.HTTPException):
+            error = "connection"
+        seconds = time.perf_counter() - started
+        if error is None and status >= 400:
+            error = f"http_{status // 100}xx"
+        return seconds, status, error
+
+    def run_round(self, pool: ThreadPoolExecutor) -> None:
+        """Probe every endpoint concurrently and record the results."""
+
+        timestamp = time.time()
+        outcomes = list(pool.map(self.probe_once, self.probes))
+        with self._lock:
+            for probe, (seconds, status, error) in zip(self.probes, outcomes):
+                self.stats[probe.name].record(timestamp, seconds, status, error)
+            self.rounds += 1
+
+    def run(self, stop: threading.Event, *, rounds: int | None = None) -> None:
+        """Probe every ``interval`` seconds until ``stop`` is set (or ``rounds`` ran).
+
+        Rounds are scheduled on a fixed grid, so slow probes do not make the
+        schedule drift; a round that overruns skips the missed slots.
+        """
+
+        next_round = time.monotonic()
+        completed = 0
+        with ThreadPoolExecutor(max_workers=len(self.probes) or 1) as pool:
+            while not stop.is_set():
+                self.run_round(pool)
+                completed += 1
+                if rounds is not None and completed >= rounds:
+                    return
+                next_round += self.interval
+                now = time.monotonic()
+                if next_round < now:
+                    next_round += math.ceil((now - next_round) / self.interval) * self.interval
+                stop.wait(next_round - now)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-probe summaries for the JSON status page."""
+
+        with self._lock:
+            return [self.stats[probe.name].snapshot() for probe in self.probes]
+
+    def render_metrics(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+
+        name = METRIC_PREFIX
+        lines = [
+            f"# HELP {name}_duration_seconds Probe request latency.",
+            f"# TYPE {name}_duration_seconds histogram",
+        ]
+        with self._lock:
+            stats = [self.stats[probe.name] for probe in self.probes]
+            for entry in stats:
+                label = f'probe="{_label(entry.probe.name)}"'
+                cumulative = 0
+                for bound, count in zip((*entry.buckets, math.inf), entry.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{name}_duration_seconds_bucket{{{label},le="{_number(bound)}"}} {cumulative}')
+                lines.append(f"{name}_duration_seconds_sum{{{label}}} {entry.total_seconds!r}")
+                lines.append(f"{name}_duration_seconds_count{{{label}}} {entry.total}")
+
+            lines += [f"# HELP {name}_errors_total Failed probes by kind.", f"# TYPE {name}_errors_total counter"]
+            for entry in stats:
+                for kind, count in sorted(entry.errors.items()):
+                    lines.append(f'{name}_errors_total{{probe="{_label(entry.probe.name)}",kind="{kind}"}} {count}')
+
+            lines += [
+                f"# HELP {name}_window_seconds Latency quantiles over the most recent samples.",
+                f"# TYPE {name}_window_seconds gauge",
+            ]
+            for entry in stats:
+                values = sorted(entry.window.samples())
+                if not values:
+                    continue
+                for quantile in WINDOW_QUANTILES:
+                    lines.append(
+                        f'{name}_window_seconds{{probe="{_label(entry.probe.name)}",quantile="{quantile}"}} '
+                        f"{percentile(values, quantile)!r}"
+                    )
+
+            lines += [f"# HELP {name}_up Whether the last probe succeeded.", f"# TYPE {name}_up gauge"]
+            lines += [f'{name}_up{{probe="{_label(entry.probe.name)}"}} {entry.up}' for entry in stats]
+            lines += [
+                f"# HELP {name}_last_success_timestamp_seconds Time of the last successful probe.",
+                f"# TYPE {name}_last_success_timestamp_seconds gauge",
+            ]
+            lines += [
+                f'{name}_last_success_timestamp_seconds{{probe="{_label(entry.probe.name)}"}} {entry.last_success!r}'
+                for entry in stats
+            ]
+            lines += [f"# TYPE {name}_rounds_total counter", f"{name}_rounds_total {self.rounds}"]
+        return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MetricsServer"
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = self.server.monitor.render_metrics().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/":
+            body = json.dumps({"backend": self.server.monitor.base_url, "probes": self.server.monitor.snapshot()})
+            self._send(200, body.encode("utf-8"), "application/json")
+        else:
+            self._send(404, b"Not found\n", "text/plain")
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Serves ``/metrics`` (Prometheus) and ``/`` (JSON summary) for a :class:`Monitor`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], monitor: Monitor) -> None:
+        super().__init__(address, _Handler)
+        self.monitor = monitor
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def parse_probe(spec: str) -> Probe:
+    """Parse ``name=/path``."""
+
+    name, separator, path = spec.partition("=")
+    if not separator or not name.strip() or not path.startswith("/"):
+        raise argparse.ArgumentTypeError(f"Expected NAME=/path, got {spec!r}")
+    return Probe(name.strip(), path.strip())
+
+
+def parse_listen(spec: str) -> Tuple[str, int]:
+    """Parse ``host:port`` (or a bare port)."""
+
+    host, _, port = spec.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Expected HOST:PORT, got {spec!r}") from exc
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument(
+        "--probe",
+        action="append",
+        type=parse_probe,
+        default=None,
+        metavar="NAME=/PATH",
+        help="Endpoint to probe; repeatable (default: health, config and documents).",
+    )
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between probe rounds.")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Recent samples kept per probe.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Read timeout in seconds per probe.")
+    parser.add_argument("--listen", type=parse_listen, default=DEFAULT_LISTEN, help="Address for /metrics.")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run a single probe round, print the metrics and exit without serving.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the monitor command."""
+
+    args = parse_args(argv)
+    if args.interval <= 0 or args.window < 1:
+        raise SystemExit("--interval and --window must be positive.")
+    monitor = Monitor(
+        get_backend_url(args.backend_url),
+        args.probe or DEFAULT_PROBES,
+        interval=args.interval,
+        window=args.window,
+        timeout=args.timeout,
+    )
+    if args.once:
+        monitor.run(threading.Event(), rounds=1)
+        sys.stdout.write(monitor.render_metrics())
+        return 0 if all(entry["up"] for entry in monitor.snapshot()) else 1
+
+    server = MetricsServer(args.listen, monitor)
+    stop = threading.Event()
+    worker = threading.Thread(target=monitor.run, args=(stop,), daemon=True)
+    worker.start()
+    print(f"Probing {monitor.base_url} every {args.interval:g} s; metrics at {server.url}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        worker.join(timeout=args.timeout + 1)
+        monitor.session.close()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "DEFAULT_PROBES",
+    "MetricsServer",
+    "Monitor",
+    "Probe",
+    "ProbeStats",
+    "RingBuffer",
+    "main",
+    "parse_args",
+    "parse_probe",
+]
@@ -0,0 +1,237 @@
+"""Named environment profiles and concurrent fan-out of commands across them.
+
+Profiles live in an INI file (default ``.secrets/profiles.ini``). Each section
+is one environment; its keys are the environment variables the commands
+already read, optionally layered over a dotenv file::
+
+    [DEFAULT]
+    SNOWFLAKE_DATABASE = SNOWFLAKE_EXAMPLE
+    SNOWFLAKE_SCHEMA = REACT_AGENT_STAGE
+
+    [dev]
+    env_file = .env
+    [prod-eu]
+    SNOWFLAKE_ACCOUNT = myorg-prod_eu
+    SNOWFLAKE_PRIVATE_KEY_PATH = .secrets/keys/prod_eu.p8
+
+``master.py --envs dev,prod-eu check`` runs ``check`` once per profile
+in parallel subprocesses and prints one combined report.
+"""
+
+from __future__ import annotations
+
+import configparser
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+from .deploy import _parse_env_file
+from .profiling import span
+from .utils import echo, get_project_root
+
+DEFAULT_PROFILE_TIMEOUT = 300.0
+MAX_CONCURRENT_PROFILES = 16
+ENV_FILE_KEY = "ENV_FILE"
+
+# Commands whose per-profile output is machine-readable with these options.
+STRUCTURED_OPTIONS: Dict[str, str] = {"check": "--json"}
+
+
+class Profile(NamedTuple):
+    """One named environment and the variables it overlays on ``os.environ``."""
+
+    name: str
+    env: Dict[str, str]
+
+
+class ProfileResult(NamedTuple):
+    """A command's outcome in one profile."""
+
+    profile: str
+    returncode: int
+    seconds: float
+    stdout: str
+    stderr: str
+
+
+def default_profiles_path() -> Path:
+    """``SFE_PROFILES_FILE`` or ``.secrets/profiles.ini``."""
+
+    configured = os.environ.get("SFE_PROFILES_FILE")
+    return Path(configured) if configured else get_project_root() / ".secrets" / "profiles.ini"
+
+
+def load_profiles(path: Path) -> Dict[str, Profile]:
+    """Read every profile in ``path``; keys are upper-cased variable names.
+
+    ``env_file`` (relative to the project root) is loaded first so a profile
+    can reuse an existing ``.env`` and override a few values.
+    """
+
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.optionxform = str.upper  # type: ignore[assignment,method-assign]
+    try:
+        with path.open(encoding="utf-8") as stream:
+            parser.read_file(stream)
+    except OSError as exc:
+        raise RuntimeError(f"Could not read profiles file {path}: {exc}") from exc
+    except configparser.Error as exc:
+        raise RuntimeError(f"Invalid profiles file {path}: {exc}") from exc
+
+    profiles: Dict[str, Profile] = {}
+    for name in parser.sections():
+        values = dict(parser[name])
+        env: Dict[str, str] = {}
+        env_file = values.pop(ENV_FILE_KEY, "")
+        if env_file:
+            env_path = Path(env_file)
+            if not env_path.is_absolute():
+                env_path = get_project_root() / env_path
+            if not env_path.exists():
+                raise RuntimeError(f"Profile '{name}' refers to missing env file {env_path}")
+            env.update(_parse_env_file(env_path))
+        env.update(values)
+        profiles[name] = Profile(name, env)
+    return profiles
+
+
+def select_profiles(profiles: Dict[str, Profile], spec: str) -> List[Profile]:
+    """Resolve ``a,b,c`` or ``all`` against the loaded profiles."""
+
+    if spec.strip().lower() == "all":
+        if not profiles:
+            raise SystemExit("No profiles are defined.")
+        return list(profiles.values())
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise SystemExit(f"Unknown profiles: {', '.join(unknown)} (defined: {', '.join(profiles) or 'none'}).")
+    if not names:
+        raise SystemExit("No profiles selected.")
+    return [profiles[name] for name in dict.fromkeys(names)]
+
+
+def run_profile(profile: Profile, argv: Sequence[str], *, timeout: float = DEFAULT_PROFILE_TIMEOUT) -> ProfileResult:
+    """Run ``master.py <argv>`` with ``profile.env`` overlaid on the environment."""
+
+    root = get_project_root()
+    env = {**os.environ, **profile.env, "SFE_PROFILE": profile.name, "PYTHONPATH": str(root)}
+    command = [sys.executable, "-m", "python.cli.master", *argv]
+    started = time.perf_counter()
+    with span(f"profile:{profile.name}", "subprocess"):
+        try:
+            completed = subprocess.run(
+                command, cwd=str(root), env=env, capture_output=True, text=True, timeout=timeout, check=False
+            )
+            returncode, stdout, stderr = completed.returncode, completed.stdout, completed.stderr
+        except subprocess.TimeoutExpired as exc:
+            stdout = exc.stdout.decode("utf-8", "replace") if isinstance(exc.stdout, bytes) else exc.stdout or ""
+            returncode, stderr = 124, f"Timed out after {timeout:.0f} s"
+    return ProfileResult(profile.name, returncode, time.perf_counter() - started, stdout, stderr)
+
+
+def run_profiles(
+    profiles: Sequence[Profile],
+    argv: Sequence[str],
+    *,
+    timeout: float = DEFAULT_PROFILE_TIMEOUT,
+) -> List[ProfileResult]:
+    """Run ``argv`` in every profile concurrently; results keep the profile order."""
+
+    workers = max(1, min(len(profiles), MAX_CONCURRENT_PROFILES))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda profile: run_profile(profile, argv, timeout=timeout), profiles))
+
+
+def _structured(result: ProfileResult) -> Dict[str, Any] | None:
+    lines = result.stdout.strip().splitlines()
+    try:
+        parsed = json.loads(lines[-1]) if lines else None
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def format_report(results: Sequence[ProfileResult]) -> str:
+    """One row per profile; ``check`` results get a column per check."""
+
+    structured = {result.profile: _structured(result) for result in results}
+    names: List[str] = []
+    for parsed in structured.values():
+        for check in (parsed or {}).get("checks", []):
+            if check.get("name") not in names:
+                names.append(check.get("name"))
+
+    width = max([len(result.profile) for result in results] + [7])
+    header = f"{'profile':<{width}} {'status':<7} {'seconds':>8}"
+    lines = [header + "".join(f"  {name:<18}" for name in names)]
+    for result in results:
+        row = f"{result.profile:<{width}} {'ok' if result.returncode == 0 else 'FAILED':<7} {result.seconds:>8.2f}"
+        checks = {check.get("name"): check for check in (structured[result.profile] or {}).get("checks", [])}
+        for name in names:
+            check = checks.get(name)
+            cell = f"{check['status']} {check['ms']:.0f}ms" if check else "-"
+            row += f"  {cell:<18}"
+        lines.append(row)
+    failed = [result for result in results if result.returncode != 0]
+    for result in failed:
+        details = [
+            f"{check['name']}: {check['detail']}"
+            for check in (structured[result.profile] or {}).get("checks", [])
+            if check.get("status") == "failed"
+        ]
+        tail = result.stderr.strip().splitlines()[-1:] if not details else []
+        for detail in details + tail:
+            lines.append(f"  [{result.profile}] {detail}")
+    lines.append(f"{len(results) - len(failed)}/{len(results)} profiles succeeded")
+    return "\n".join(lines)
+
+
+def fan_out(
+    spec: str,
+    argv: Sequence[str],
+    *,
+    path: Path | None = None,
+    timeout: float = DEFAULT_PROFILE_TIMEOUT,
+) -> int:
+    """Run the ``master.py`` command ``argv`` in each selected profile and report."""
+
+    try:
+        selected = select_profiles(load_profiles(path or default_profiles_path()), spec)
+    except RuntimeError as exc:
+        raise SystemExit(str(exc)) from exc
+    argv = list(argv)
+    option = STRUCTURED_OPTIONS.get(argv[0]) if argv else None
+    structured = option is not None
+    if structured and option not in argv:
+        argv.append(option)
+
+    started = time.perf_counter()
+    results = run_profiles(selected, argv, timeout=timeout)
+    if not structured:
+        for result in results:
+            text = (result.stdout + result.stderr).rstrip()
+            if text:
+                echo("\n".join(f"[{result.profile}] {line}" for line in text.splitlines()))
+    print(format_report(results))
+    print(f"Ran {' '.join(argv)} across {len(results)} profiles in {time.perf_counter() - started:.2f} s")
+    return next((result.returncode for result in results if result.returncode != 0), 0)
+
+
+__all__ = [
+    "DEFAULT_PROFILE_TIMEOUT",
+    "Profile",
+    "ProfileResult",
+    "default_profiles_path",
+    "fan_out",
+    "format_report",
+    "load_profiles",
+    "run_profile",
+    "run_profiles",
+    "select_profiles",
+]
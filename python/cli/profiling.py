@@ -0,0 +1,243 @@
+"""Wall-clock spans, peak memory and optional interpreter profiling for CLI runs.
+
+Code marks interesting regions with :func:`span`. Spans are free when no
+profile is active. ``master.py --profile <command>`` activates a
+:class:`Profiler`, then writes a Chrome trace-event file (load it in
+``chrome://tracing`` or https://ui.perfetto.dev) and prints a summary table.
+
+With ``--profile-python`` every thread started after the profile begins gets
+its own ``cProfile`` profiler (Python 3.12+ profiles all threads with one);
+their statistics are merged into the report.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+try:  # ``resource`` is POSIX-only
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+_active: "Profiler | None" = None
+
+
+def peak_rss_bytes(who: str = "self") -> int | None:
+    """Peak resident set size of this process (``"self"``) or its reaped children."""
+
+    if resource is None:
+        return None
+    target = resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN
+    value = resource.getrusage(target).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return value if sys.platform == "darwin" else value * 1024
+
+
+class Profiler:
+    """Collects spans from every thread of one CLI run."""
+
+    def __init__(self, *, python_profile: bool = False, memory_profile: bool = False) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._cprofile = None
+        self._thread_profiles: List[Any] = []
+        self.memory_profile = memory_profile
+        self.memory_top: List[str] = []
+        self.memory_peak: int | None = None
+        if python_profile:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+
+    def now_us(self) -> float:
+        """Microseconds since the profiler started."""
+
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def add(self, name: str, category: str, start_us: float, duration_us: float, args: Dict[str, Any]) -> None:
+        """Record one completed span."""
+
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start_us, 1),
+            "dur": round(duration_us, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def start(self) -> None:
+        """Begin interpreter-level profiling, if requested."""
+
+        if self.memory_profile:
+            import tracemalloc
+
+            tracemalloc.start(10)
+        if self._cprofile is not None:
+            if sys.version_info < (3, 12):
+                threading.setprofile(self._profile_thread)
+            self._cprofile.enable()
+
+    def _profile_thread(self, frame: Any, event: str, arg: Any) -> None:
+        """First profile event of a new thread: hand the thread its own cProfile."""
+
+        import cProfile
+
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def stop(self) -> None:
+        """End interpreter-level profiling."""
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            threading.setprofile(None)  # type: ignore[arg-type]
+        if self.memory_profile:
+            import tracemalloc
+
+            snapshot = tracemalloc.take_snapshot()
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.memory_top = [str(stat) for stat in snapshot.statistics("lineno")[:10]]
+
+    # -- reports ----------------------------------------------------------------------
+
+    def python_stats(self, stream: Any = None) -> Any:
+        """``pstats.Stats`` merged over the calling thread and every profiled thread."""
+
+        import pstats
+
+        with self._lock:
+            profiles = [self._cprofile, *self._thread_profiles]
+        return pstats.Stats(*profiles, stream=stream)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Spans aggregated by category and name, slowest total first."""
+
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for event in self.events:
+            key = (event["cat"], event["name"])
+            row = groups.setdefault(key, {"category": key[0], "name": key[1], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration = event["dur"] / 1000
+            row["count"] += 1
+            row["total_ms"] += duration
+            row["max_ms"] = max(row["max_ms"], duration)
+        rows = sorted(groups.values(), key=lambda row: row["total_ms"], reverse=True)
+        for row in rows:
+            row["total_ms"] = round(row["total_ms"], 2)
+            row["max_ms"] = round(row["max_ms"], 2)
+        return rows
+
+    def trace(self) -> Dict[str, Any]:
+        """Chrome trace-event document."""
+
+        metadata = {
+            "peak_rss_bytes": peak_rss_bytes("self"),
+            "children_peak_rss_bytes": peak_rss_bytes("children"),
+            "python_peak_traced_bytes": self.memory_peak,
+            "argv": sys.argv,
+        }
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms", "otherData": metadata}
+
+    def write(self, path: Path) -> Dict[str, Path]:
+        """Write the trace (and ``.prof`` stats when cProfile ran); returns the paths."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.trace()), encoding="utf-8")
+        written = {"trace": path}
+        if self._cprofile is not None:
+            stats_path = path.with_suffix(".prof")
+            self.python_stats().dump_stats(str(stats_path))
+            written["cprofile"] = stats_path
+        return written
+
+    def format_summary(self, *, limit: int = 25) -> str:
+        """Human-readable span table followed by memory figures."""
+
+        rows = self.summary()[:limit]
+        width = max([len(row["name"]) for row in rows] + [4])
+        lines = [f"{'category':<11} {'name':<{width}} {'count':>6} {'total ms':>10} {'max ms':>10}"]
+        for row in rows:
+            lines.append(
+                f"{row['category']:<11} {row['name']:<{width}} {row['count']:>6} {row['total_ms']:>10.2f} {row['max_ms']:>10.2f}"
+            )
+        rss, children = peak_rss_bytes("self"), peak_rss_bytes("children")
+        if rss is not None:
+            lines.append(f"peak RSS: {rss / 1_048_576:.1f} MiB (children {children / 1_048_576:.1f} MiB)")
+        if self.memory_peak is not None:
+            lines.append(f"peak traced Python memory: {self.memory_peak / 1_048_576:.2f} MiB")
+            lines.extend(f"  {line}" for line in self.memory_top[:5])
+        if self._cprofile is not None:
+            import io
+
+            buffer = io.StringIO()
+            self.python_stats(buffer).sort_stats("cumulative").print_stats(15)
+            lines.append(buffer.getvalue().rstrip())
+        return "\n".join(lines)
+
+
+@contextmanager
+def span(name: str, category: str = "step", **args: Any) -> Iterator[None]:
+    """Time the enclosed block when a profile is active."""
+
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    start = profiler.now_us()
+    try:
+        yield
+    finally:
+        profiler.add(name, category, start, profiler.now_us() - start, args)
+
+
+@contextmanager
+def profile_run(
+    name: str,
+    *,
+    output: Path | None = None,
+    python_profile: bool = False,
+    memory_profile: bool = False,
+) -> Iterator[Profiler]:
+    """Activate a :class:`Profiler` for the block, then write and print its report."""
+
+    global _active
+    profiler = Profiler(python_profile=python_profile, memory_profile=memory_profile)
+    previous, _active = _active, profiler
+    profiler.start()
+    try:
+        with span(name, "command"):
+            yield profiler
+    finally:
+        profiler.stop()
+        _active = previous
+        if output is None:
+            from .utils import get_project_root
+
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            output = get_project_root() / ".cache" / "profile" / f"{name}-{stamp}.trace.json"
+        try:
+            written = profiler.write(output)
+        except OSError as exc:  # never mask the command's own outcome
+            written = {}
+            print(f"Could not write profile to {output}: {exc}", file=sys.stderr)
+        print(profiler.format_summary(), file=sys.stderr)
+        for kind, path in written.items():
+            print(f"{kind} written to {path}", file=sys.stderr)
+
+
+__all__ = ["Profiler", "peak_rss_bytes", "profile_run", "span"]
@@ -0,0 +1,288 @@
+"""Pooled keep-alive HTTP session shared by the Snowflake REST commands."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import urllib.parse
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from .profiling import span
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_POOL_SIZE = 8
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+PoolKey = Tuple[str, str, int]
+Body = bytes | Iterable[bytes] | None
+
+# Errors raised when a pooled connection was closed by the server while idle.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _pool_key(url: str) -> Tuple[PoolKey, str]:
+    """Split a URL into its connection pool key and request target."""
+
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {url}")
+    if not parts.hostname:
+        raise ValueError(f"URL is missing a host: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    return (scheme, parts.hostname, port), target
+
+
+class RestResponse:
+    """A response whose connection returns to the pool once the body is consumed."""
+
+    def __init__(
+        self,
+        session: "RestSession",
+        key: PoolKey,
+        connection: http.client.HTTPConnection,
+        raw: http.client.HTTPResponse,
+    ) -> None:
+        self._session = session
+        self._key = key
+        self._connection: http.client.HTTPConnection | None = connection
+        self._raw = raw
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        encoding = (raw.getheader("Content-Encoding") or "").strip().lower()
+        # wbits=31 selects the gzip container; plain deflate uses the zlib header.
+        if encoding == "gzip":
+            self._decoder: Any = zlib.decompressobj(31)
+        elif encoding == "deflate":
+            self._decoder = zlib.decompressobj()
+        else:
+            self._decoder = None
+
+    def __enter__(self) -> "RestResponse":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def header(self, name: str, default: str | None = None) -> str | None:
+        """Return a response header value."""
+
+        return self.headers.get(name, default)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield decoded body chunks as they arrive from the socket."""
+
+        try:
+            while True:
+                chunk = self._raw.read1(chunk_size) if chunk_size else self._raw.read()
+                if not chunk:
+                    break
+                if self._decoder is not None:
+                    chunk = self._decoder.decompress(chunk)
+                if chunk:
+                    yield chunk
+            if self._decoder is not None:
+                tail = self._decoder.flush()
+                if tail:
+                    yield tail
+        except BaseException:
+            self.close()
+            raise
+        self._release()
+
+    def read(self) -> bytes:
+        """Return the full decoded body."""
+
+        return b"".join(self.iter_chunks())
+
+    def text(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """Return the decoded body as text."""
+
+        return self.read().decode(encoding, errors=errors)
+
+    def json(self) -> Any:
+        """Parse the body as JSON."""
+
+        return json.loads(self.read())
+
+    def _release(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        # read1() never marks a Content-Length body as finished; close it so
+        # http.client lets the connection send its next request.
+        self._raw.close()
+        if self._raw.will_close:
+            connection.close()
+        else:
+            self._session._release(self._key, connection)
+
+    def close(self) -> None:
+        """Discard the connection unless the body was fully consumed."""
+
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._raw.close()
+            connection.close()
+
+
+class RestSession:
+    """Thread-safe HTTP client with per-host keep-alive connection pools.
+
+    Every command that talks to the Snowflake REST API (or the local backend)
+    should share one session so repeated calls reuse the TCP and TLS
+    connection instead of performing a fresh handshake each time.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_size = pool_size
+        self.headers: Dict[str, str] = {"Accept-Encoding": "gzip", **(headers or {})}
+        self.connections_opened: Dict[PoolKey, int] = {}
+        self._idle: Dict[PoolKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RestSession":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def _connect(self, key: PoolKey) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        connection = factory(host, port, timeout=self.connect_timeout)
+        connection.connect()
+        with self._lock:
+            self.connections_opened[key] = self.connections_opened.get(key, 0) + 1
+        return connection
+
+    def _acquire(self, key: PoolKey) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _release(self, key: PoolKey, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        body: Body = None,
+        timeout: float | None = None,
+    ) -> RestResponse:
+        """Send a request and return the response with its headers read.
+
+        Callers must consume the body (``read``/``json``/``iter_chunks``) or
+        close the response; the connection is only pooled once drained.
+        """
+
+        key, target = _pool_key(url)
+        merged = {**self.headers, **(headers or {})}
+        # Only bodies that can be replayed are eligible for a stale-connection
+        # retry; iterables opt in with a truthy ``replayable`` attribute.
+        replayable = body is None or isinstance(body, (bytes, bytearray)) or getattr(body, "replayable", False)
+
+        with span(f"{method} {key[1]}", "http", path=target.split("?", 1)[0]):
+            return self._send(method, key, target, merged, body, timeout, replayable)
+
+    def _send(
+        self,
+        method: str,
+        key: PoolKey,
+        target: str,
+        headers: Mapping[str, str],
+        body: Body,
+        timeout: float | None,
+        replayable: bool,
+    ) -> RestResponse:
+        while True:
+            connection, reused = self._acquire(key)
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout if timeout is not None else self.read_timeout)
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                raw = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused and replayable:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            return RestResponse(self, key, connection, raw)
+
+    def get(self, url: str, **kwargs: Any) -> RestResponse:
+        """Shorthand for ``request("GET", url, ...)``."""
+
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> RestResponse:
+        """Shorthand for ``request("POST", url, ...)``."""
+
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """Close every idle pooled connection."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+_default_session: RestSession | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_session() -> RestSession:
+    """Return the process-wide session shared by all REST commands."""
+
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = RestSession()
+        return _default_session
+
+
+__all__ = [
+    "Body",
+    "DEFAULT_CONNECT_TIMEOUT",
+    "DEFAULT_POOL_SIZE",
+    "DEFAULT_READ_TIMEOUT",
+    "RestResponse",
+    "RestSession",
+    "get_default_session",
+]
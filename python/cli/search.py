@@ -0,0 +1,468 @@
+"""Offline BM25 search over the mirrored document text.
+
+The index lives in ``.cache/search.sqlite`` and is built from the local
+document mirror (``master.py mirror sync``). Posting lists are stored as
+varint-encoded ``(doc id delta, term frequency)`` pairs in append-only
+segments: each ``index`` run writes one new segment for the documents that
+changed, and replaced or deleted documents are tombstoned until the next
+``--optimize`` merge.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from .cache import get_cache_dir
+from .mirror import DocumentMirror, default_mirror_path
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 200
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    version TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS docs_path ON docs (file_path);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    df INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (term, segment)
+) WITHOUT ROWID;
+"""
+
+
+def default_index_path() -> Path:
+    """Location of the shared search index."""
+
+    return get_cache_dir("search.sqlite")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case alphanumeric tokens without stopwords."""
+
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append ``value`` as an unsigned LEB128 varint."""
+
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_postings(data: bytes) -> Iterator[Tuple[int, int]]:
+    """Yield ``(doc_id, tf)`` from a segment's delta-encoded posting list."""
+
+    values: List[int] = []
+    append = values.append
+    value = shift = 0
+    for byte in data:
+        if byte < 0x80:
+            append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    return zip(accumulate(values[0::2]), values[1::2])
+
+
+class _Posting:
+    __slots__ = ("data", "last", "df")
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.last = 0
+        self.df = 0
+
+
+class SearchHit(NamedTuple):
+    """One ranked result."""
+
+    file_path: str
+    score: float
+    doc_id: int
+
+
+class SearchIndex:
+    """Segmented BM25 inverted index stored in SQLite.
+
+    Documents are added with :meth:`add` and become visible to other readers
+    after :meth:`commit`. Document lengths and tombstones are held in memory;
+    posting lists are read per query term.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lengths = array("I")
+        self._paths: List[str] = []
+        self._versions: List[str | None] = []
+        self._deleted: set[int] = set()
+        self._by_path: Dict[str, int] = {}
+        self._total_length = 0
+        self._norms: List[float] | None = None
+        for doc_id, file_path, length, version, deleted in self._db.execute(
+            "SELECT doc_id, file_path, length, version, deleted FROM docs ORDER BY doc_id"
+        ):
+            while len(self._paths) < doc_id:  # ids whose rows optimize() dropped
+                self._paths.append("")
+                self._lengths.append(0)
+                self._versions.append(None)
+            self._append_doc(file_path, length, version, deleted=bool(deleted))
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'segments'").fetchone()
+        self._segments = int(row[0]) if row else 0
+        self._pending: Dict[str, _Posting] = {}
+        self._pending_docs: List[Tuple[int, str, int, str | None]] = []
+        self._pending_deletes: List[int] = []
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection (uncommitted changes are discarded)."""
+
+        self._db.close()
+
+    def _append_doc(self, file_path: str, length: int, version: str | None, *, deleted: bool) -> int:
+        doc_id = len(self._paths)
+        self._norms = None
+        self._paths.append(file_path)
+        self._lengths.append(length)
+        self._versions.append(version)
+        if deleted:
+            self._deleted.add(doc_id)
+        else:
+            self._by_path[file_path] = doc_id
+            self._total_length += length
+        return doc_id
+
+    # -- properties ---------------------------------------------------------------------
+
+    @property
+    def document_count(self) -> int:
+        """Number of live (non-tombstoned) documents."""
+
+        return len(self._by_path)
+
+    @property
+    def segment_count(self) -> int:
+        """Number of committed segments."""
+
+        return self._segments
+
+    def version_of(self, file_path: str) -> str | None:
+        """Version recorded when ``file_path`` was indexed, or ``None``."""
+
+        doc_id = self._by_path.get(file_path)
+        return None if doc_id is None else self._versions[doc_id]
+
+    def paths(self) -> List[str]:
+        """Paths of all live documents."""
+
+        return list(self._by_path)
+
+    # -- writing ----------------------------------------------------------------------
+
+    def remove(self, file_path: str) -> bool:
+        """Tombstone ``file_path``; returns whether it was indexed."""
+
+        doc_id = self._by_path.pop(file_path, None)
+        if doc_id is None:
+            return False
+        self._deleted.add(doc_id)
+        self._total_length -= self._lengths[doc_id]
+        self._norms = None
+        self._pending_deletes.append(doc_id)
+        return True
+
+    def add(self, file_path: str, text: str, *, version: str | None = None) -> int:
+        """Index ``text`` under ``file_path``, replacing any earlier version."""
+
+        self.remove(file_path)
+        tokens = tokenize(text)
+        doc_id = self._append_doc(file_path, len(tokens), version, deleted=False)
+        self._pending_docs.append((doc_id, file_path, len(tokens), version))
+        pending = self._pending
+        for term, tf in Counter(tokens).items():
+            posting = pending.get(term)
+            if posting is None:
+                posting = pending[term] = _Posting()
+            encode_varint(doc_id - posting.last, posting.data)
+            encode_varint(tf, posting.data)
+            posting.last = doc_id
+            posting.df += 1
+        return doc_id
+
+    def commit(self) -> Dict[str, int]:
+        """Write pending documents as one new segment and persist tombstones."""
+
+        added = len(self._pending_docs)
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO docs (doc_id, file_path, length, version, deleted) VALUES (?, ?, ?, ?, 0)",
+                self._pending_docs,
+            )
+            self._db.executemany("UPDATE docs SET deleted = 1 WHERE doc_id = ?", [(doc,) for doc in self._pending_deletes])
+            if self._pending:
+                segment = self._segments + 1
+                self._db.executemany(
+                    "INSERT INTO postings (term, segment, df, data) VALUES (?, ?, ?, ?)",
+                    ((term, segment, posting.df, bytes(posting.data)) for term, posting in self._pending.items()),
+                )
+                self._segments = segment
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('segments', ?)", (str(segment),))
+        result = {"added": added, "deleted": len(self._pending_deletes), "terms": len(self._pending)}
+        self._pending = {}
+        self._pending_docs = []
+        self._pending_deletes = []
+        return result
+
+    def optimize(self) -> None:
+        """Merge all segments into one and drop tombstoned postings."""
+
+        self.commit()
+        merged: Dict[str, _Posting] = {}
+        for term, data in self._db.execute("SELECT term, data FROM postings ORDER BY term, segment"):
+            posting = merged.get(term)
+            for doc_id, tf in decode_postings(data):
+                if doc_id in self._deleted:
+                    continue
+                if posting is None:
+                    posting = merged[term] = _Posting()
+                encode_varint(doc_id - posting.last, posting.data)
+                encode_varint(tf, posting.data)
+                posting.last = doc_id
+                posting.df += 1
+        with self._db:
+            self._db.execute("DELETE FROM docs WHERE deleted = 1")
+            self._db.execute("DELETE FROM postings")
+            self._db.executemany(
+                "INSERT INTO postings (term, segment, df, data) VALUES (?, 1, ?, ?)",
+                ((term, posting.df, bytes(posting.data)) for term, posting in merged.items()),
+            )
+            self._segments = 1 if merged else 0
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('segments', ?)", (str(self._segments),))
+        self._deleted.clear()
+        self._db.execute("VACUUM")
+
+    # -- reading ----------------------------------------------------------------------
+
+    def _length_norms(self) -> List[float]:
+        # BM25's per-document length normalisation only changes when documents
+        # are added or removed, so it is computed once per index generation.
+        if self._norms is None:
+            average = self._total_length / max(1, self.document_count) or 1.0
+            scale = BM25_K1 * BM25_B / average
+            base = BM25_K1 * (1 - BM25_B)
+            self._norms = [base + scale * length for length in self._lengths]
+        return self._norms
+
+    def _postings(self, term: str) -> Tuple[int, List[bytes]]:
+        rows = self._db.execute("SELECT df, data FROM postings WHERE term = ?", (term,)).fetchall()
+        return sum(row[0] for row in rows), [row[1] for row in rows]
+
+    def search(self, query: str, *, limit: int = 10) -> List[SearchHit]:
+        """Rank live documents against ``query`` with BM25."""
+
+        live = self.document_count
+        if not live:
+            return []
+        norms = self._length_norms()
+        deleted = self._deleted
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term in set(tokenize(query)):
+            df, segments = self._postings(term)
+            if not df:
+                continue
+            # The stored df also counts tombstoned postings, so count live matches instead.
+            matches = [
+                (doc_id, tf) for data in segments for doc_id, tf in decode_postings(data) if doc_id not in deleted
+            ]
+            if not matches:
+                continue
+            df = len(matches)
+            weight = math.log(1 + (live - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+            for doc_id, tf in matches:
+                scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [SearchHit(self._paths[doc_id], round(score, 4), doc_id) for doc_id, score in best]
+
+    def stats(self) -> Dict[str, Any]:
+        """Document, term and size counters."""
+
+        terms, postings_bytes = self._db.execute(
+            "SELECT COUNT(DISTINCT term), COALESCE(SUM(LENGTH(data)), 0) FROM postings"
+        ).fetchone()
+        return {
+            "documents": self.document_count,
+            "tombstones": len(self._deleted),
+            "segments": self._segments,
+            "terms": terms,
+            "postings_bytes": postings_bytes,
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+
+def snippet(text: str, query: str, *, width: int = SNIPPET_CHARS) -> str:
+    """Return the ``width``-character window of ``text`` with the most query-term hits."""
+
+    terms = set(tokenize(query))
+    hits = [match for match in _TOKEN.finditer(text.lower()) if match.group() in terms]
+    if not hits:
+        return " ".join(text[:width].split())
+    best_start, best_count, left = hits[0].start(), 0, 0
+    for right, match in enumerate(hits):
+        while match.end() - hits[left].start() > width:
+            left += 1
+        if right - left + 1 > best_count:
+            best_count, best_start = right - left + 1, hits[left].start()
+    start = max(0, best_start - width // 8)
+    end = min(len(text), start + width)
+    window = text[start:end]
+    window = re.sub(
+        r"\b(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")\b",
+        r"[\1]",
+        window,
+        flags=re.IGNORECASE,
+    )
+    return ("..." if start else "") + " ".join(window.split()) + ("..." if end < len(text) else "")
+
+
+def update_from_documents(
+    index: SearchIndex,
+    documents: Iterable[Tuple[str, str | None]],
+    load_text: Any,
+) -> Dict[str, int]:
+    """Bring ``index`` in line with ``(file_path, version)`` pairs.
+
+    ``load_text(file_path)`` is only called for new or changed documents.
+    Documents missing from ``documents`` are tombstoned.
+    """
+
+    seen = set()
+    for file_path, version in documents:
+        seen.add(file_path)
+        if index.version_of(file_path) == version and version is not None:
+            continue
+        index.add(file_path, load_text(file_path) or "", version=version)
+    for file_path in index.paths():
+        if file_path not in seen:
+            index.remove(file_path)
+    return index.commit()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", type=Path, default=None, help="Index database (default: .cache/search.sqlite).")
+    parser.add_argument("--mirror", type=Path, default=None, help="Mirror database (default: .cache/documents.sqlite).")
+    parser.add_argument("--update", action="store_true", help="Index new and changed mirrored documents first.")
+    parser.add_argument("--optimize", action="store_true", help="Merge segments and drop tombstones after updating.")
+    parser.add_argument("-k", "--limit", type=int, default=10, help="Number of results.")
+    parser.add_argument("--no-snippets", action="store_true", help="Do not read document text for snippets.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics.")
+    parser.add_argument("query", nargs="*", help="Search terms.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the search command."""
+
+    args = parse_args(argv)
+    if not (args.query or args.update or args.optimize or args.stats):
+        raise SystemExit("Give a query, or --update/--optimize/--stats.")
+
+    mirror_path = args.mirror or default_mirror_path()
+    with SearchIndex(args.index or default_index_path()) as index, DocumentMirror(mirror_path) as mirror:
+        if args.update:
+            started = time.perf_counter()
+            documents = [(row["file_path"], row["extraction_timestamp"]) for row in mirror.list()]
+
+            def load(path: str) -> str:
+                return (mirror.get(path) or {}).get("text", "")
+
+            result = update_from_documents(index, documents, load)
+            result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            print(json.dumps(result), file=sys.stderr)
+        if args.optimize:
+            index.optimize()
+        if args.stats:
+            print(json.dumps(index.stats(), indent=2))
+        if not args.query:
+            return 0
+
+        query = " ".join(args.query)
+        started = time.perf_counter()
+        hits = index.search(query, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        results = []
+        for hit in hits:
+            record: Dict[str, Any] = {"path": hit.file_path, "score": hit.score}
+            if not args.no_snippets:
+                document = mirror.get(hit.file_path)
+                record["snippet"] = snippet(document["text"], query) if document else ""
+            results.append(record)
+
+    if args.json:
+        print(json.dumps({"query": query, "elapsed_ms": round(elapsed_ms, 3), "results": results}, indent=2))
+        return 0
+    for rank, record in enumerate(results, start=1):
+        print(f"{rank:>2}. {record['score']:>8.3f}  {record['path']}")
+        if record.get("snippet"):
+            print(f"      {record['snippet']}")
+    print(f"{len(results)} results in {elapsed_ms:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "SearchHit",
+    "SearchIndex",
+    "decode_postings",
+    "default_index_path",
+    "encode_varint",
+    "main",
+    "parse_args",
+    "snippet",
+    "tokenize",
+    "update_from_documents",
+]
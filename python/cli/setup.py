@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Sequence
 
-from .utils import get_project_root, run_command
+from .profiling import span
+from .utils import echo, get_project_root, output_prefix, run_command
+
+Step = Callable[..., int]
 
 
 def get_venv_python(venv_dir: Path) -> Path:
@@ -23,12 +36,12 @@ def ensure_virtualenv(project_root: Path, *, verbose: bool, dry_run: bool) -> in
     venv_dir = project_root / "venv"
     if venv_dir.exists():
         if verbose:
-            print(f"Virtual environment already present at {venv_dir}")
+            echo(f"Virtual environment already present at {venv_dir}")
         return 0
 
     command = [sys.executable, "-m", "venv", str(venv_dir)]
     if dry_run:
-        print("Dry run:", " ".join(command))
+        echo("Dry run: " + " ".join(command))
         return 0
 
     return run_command(command, cwd=project_root, verbose=verbose)
@@ -40,7 +53,7 @@ def install_python_dependencies(project_root: Path, *, verbose: bool, dry_run: b
     requirements = project_root / "python" / "requirements.txt"
     if not requirements.exists():
         if verbose:
-            print(f"No Python requirements found at {requirements}; skipping installation")
+            echo(f"No Python requirements found at {requirements}; skipping installation")
         return 0
 
     venv_dir = project_root / "venv"
@@ -48,11 +61,11 @@ def install_python_dependencies(project_root: Path, *, verbose: bool, dry_run: b
     command = [str(python_exe), "-m", "pip", "install", "-r", str(requirements)]
 
     if dry_run:
-        print("Dry run:", " ".join(command))
+        echo("Dry run: " + " ".join(command))
         return 0
 
     if verbose and not python_exe.exists():
-        print(f"Warning: expected interpreter not found at {python_exe}; attempting installation anyway")
+        echo(f"Warning: expected interpreter not found at {python_exe}; attempting installation anyway")
 
     return run_command(command, cwd=project_root, verbose=verbose)
 
@@ -62,7 +75,7 @@ def install_node_dependencies(project_root: Path, *, verbose: bool, dry_run: boo
 
     command = ["npm", "install"]
     if dry_run:
-        print("Dry run:", " ".join(command))
+        echo("Dry run: " + " ".join(command))
         return 0
 
     return run_command(command, cwd=project_root, verbose=verbose)
@@ -74,17 +87,155 @@ def install_backend_dependencies(project_root: Path, *, verbose: bool, dry_run:
     server_dir = project_root / "server"
     if not server_dir.exists():
         if verbose:
-            print(f"Skipping backend install; directory not found: {server_dir}")
+            echo(f"Skipping backend install; directory not found: {server_dir}")
         return 0
 
     command = ["npm", "install"]
     if dry_run:
-        print("Dry run:", " ".join(command), f"(cwd={server_dir})")
+        echo("Dry run: " + " ".join(command) + f" (cwd={server_dir})")
         return 0
 
     return run_command(command, cwd=server_dir, verbose=verbose)
 
 
+class StepGroup(NamedTuple):
+    """Steps that must run in order; separate groups run concurrently."""
+
+    name: str
+    steps: Sequence[Step]
+    inputs: Sequence[Path]
+    outputs: Sequence[Path]
+    tools: Sequence[str]
+
+
+def build_groups(project_root: Path) -> List[StepGroup]:
+    """The independent installation groups and the files that decide if they are stale."""
+
+    def lock_or_manifest(directory: Path) -> Path:
+        lockfile = directory / "package-lock.json"
+        return lockfile if lockfile.exists() else directory / "package.json"
+
+    return [
+        StepGroup(
+            "python",
+            (ensure_virtualenv, install_python_dependencies),
+            (project_root / "python" / "requirements.txt",),
+            (get_venv_python(project_root / "venv"),),
+            ("python",),
+        ),
+        StepGroup(
+            "npm",
+            (install_node_dependencies,),
+            (lock_or_manifest(project_root),),
+            (project_root / "node_modules",),
+            ("node",),
+        ),
+        StepGroup(
+            "server",
+            (install_backend_dependencies,),
+            (lock_or_manifest(project_root / "server"),),
+            (project_root / "server" / "node_modules",),
+            ("node",),
+        ),
+    ]
+
+
+class Fingerprints:
+    """Hashes of each group's inputs recorded after a successful install."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._tool_versions: Dict[str, str] = {}
+        try:
+            self._stored: Dict[str, str] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._stored = {}
+
+    def tool_version(self, tool: str) -> str:
+        """Version string of ``python`` (this interpreter) or ``node``; looked up once."""
+
+        with self._lock:
+            if tool not in self._tool_versions:
+                if tool == "python":
+                    version = sys.version
+                else:
+                    try:
+                        with span(f"{tool} --version", "subprocess"):
+                            version = subprocess.run(
+                                [tool, "--version"], capture_output=True, text=True, check=False
+                            ).stdout.strip()
+                    except OSError:
+                        version = "missing"
+                self._tool_versions[tool] = version
+            return self._tool_versions[tool]
+
+    def compute(self, group: StepGroup) -> str:
+        """Fingerprint of ``group``'s input files and tool versions."""
+
+        digest = hashlib.sha256(group.name.encode("utf-8"))
+        for path in group.inputs:
+            digest.update(str(path.name).encode("utf-8"))
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                digest.update(b"<missing>")
+        for tool in group.tools:
+            digest.update(self.tool_version(tool).encode("utf-8"))
+        return digest.hexdigest()
+
+    def is_current(self, group: StepGroup, fingerprint: str) -> bool:
+        """True when ``fingerprint`` matches the last install and its outputs still exist."""
+
+        with self._lock:
+            stored = self._stored.get(group.name)
+        return stored == fingerprint and all(path.exists() for path in group.outputs)
+
+    def record(self, group: StepGroup, fingerprint: str) -> None:
+        """Store ``fingerprint`` for ``group`` atomically."""
+
+        with self._lock:
+            self._stored[group.name] = fingerprint
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle, temp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(self._stored, stream, indent=2)
+            os.replace(temp_name, self.path)
+
+
+def run_group(
+    group: StepGroup,
+    project_root: Path,
+    fingerprints: Fingerprints | None,
+    *,
+    verbose: bool,
+    dry_run: bool,
+    prefix: bool,
+) -> tuple[int, str, float]:
+    """Run one group's steps unless its fingerprint is unchanged.
+
+    Returns ``(exit code, outcome, seconds)``, where outcome is ``"ok"``,
+    ``"skipped"`` or ``"failed"``.
+    """
+
+    started = time.perf_counter()
+    with span(f"setup:{group.name}"), output_prefix(f"[{group.name}] ") if prefix else nullcontext():
+        fingerprint = fingerprints.compute(group) if fingerprints is not None else ""
+        if fingerprints is not None and fingerprints.is_current(group, fingerprint):
+            if verbose:
+                echo("Up to date; skipping")
+            return 0, "skipped", time.perf_counter() - started
+        for step in group.steps:
+            with span(step.__name__):
+                result = step(project_root, verbose=verbose, dry_run=dry_run)
+            if result != 0:
+                echo(f"{step.__name__} failed with exit code {result}")
+                return result, "failed", time.perf_counter() - started
+        if fingerprints is not None and not dry_run:
+            fingerprints.record(group, fingerprint)
+    return 0, "ok", time.perf_counter() - started
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command line arguments."""
 
@@ -99,6 +250,16 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Show commands without executing them.",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reinstall even when lockfiles and tool versions are unchanged.",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run the Python, root npm and server npm installs one after another.",
+    )
     return parser.parse_args(argv)
 
 
@@ -109,19 +270,26 @@ def main(argv: list[str] | None = None) -> int:
     project_root = get_project_root()
     print(f"Project root: {project_root}")
 
-    steps = [
-        ensure_virtualenv,
-        install_python_dependencies,
-        install_node_dependencies,
-        install_backend_dependencies,
-    ]
+    started = time.perf_counter()
+    groups = build_groups(project_root)
+    fingerprints = None if args.force else Fingerprints(project_root / ".cache" / "setup" / "fingerprints.json")
+    options = dict(verbose=args.verbose, dry_run=args.dry_run)
 
-    for step in steps:
-        result = step(project_root, verbose=args.verbose, dry_run=args.dry_run)
-        if result != 0:
-            return result
+    if args.sequential:
+        results = []
+        for group in groups:
+            results.append(run_group(group, project_root, fingerprints, prefix=False, **options))
+            if results[-1][0] != 0:
+                break
+    else:
+        with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            futures = [pool.submit(run_group, group, project_root, fingerprints, prefix=True, **options) for group in groups]
+            results = [future.result() for future in futures]
 
-    return 0
+    for group, (_, outcome, seconds) in zip(groups, results):
+        print(f"  {group.name:<8} {outcome:<8} {seconds:6.2f} s")
+    print(f"Setup finished in {time.perf_counter() - started:.2f} s")
+    return next((code for code, _, _ in results if code != 0), 0)
 
 
 if __name__ == "__main__":  # pragma: no cover - module entry point
@@ -129,6 +297,9 @@ if __name__ == "__main__":  # pragma: no cover - module entry point
 
 
 __all__ = [
+    "Fingerprints",
+    "StepGroup",
+    "build_groups",
     "ensure_virtualenv",
     "get_venv_python",
     "install_backend_dependencies",
@@ -136,5 +307,5 @@ __all__ = [
     "install_python_dependencies",
     "main",
     "parse_args",
+    "run_group",
 ]
-
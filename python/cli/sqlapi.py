@@ -0,0 +1,155 @@
+"""Minimal client for the Snowflake SQL API (``/api/v2/statements``)."""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import time
+import urllib.parse
+from typing import Any, Dict, List, Sequence
+
+from .auth import PAT_TOKEN_TYPE, Credential, add_auth_arguments, auth_headers, credential_from_args
+from .describe_agent import normalise_account
+from .rest import RestSession, get_default_session
+
+DEFAULT_STATEMENT_TIMEOUT = 120
+POLL_INTERVAL = 0.5
+
+
+class SqlApiClient:
+    """Run statements through the SQL API over a pooled :class:`RestSession`.
+
+    ``token`` is a programmatic access token (sent with ``token_type``) or a
+    :class:`~python.cli.auth.KeyPairAuth`, whose JWT is shared across threads.
+
+    Rows are returned as dictionaries keyed by upper-case column name, so
+    callers read ``row["EXTRACTED_TEXT"]`` the same way the Node backend does.
+    """
+
+    def __init__(
+        self,
+        account: str,
+        token: Credential,
+        *,
+        warehouse: str | None = None,
+        database: str | None = None,
+        schema: str | None = None,
+        role: str | None = None,
+        base_url: str | None = None,
+        session: RestSession | None = None,
+        timeout: float | None = None,
+        token_type: str | None = PAT_TOKEN_TYPE,
+    ) -> None:
+        base = base_url.rstrip("/") if base_url else f"https://{normalise_account(account)}"
+        self.url = f"{base}/api/v2/statements"
+        self.credential = token
+        self.token_type = token_type
+        self.context = {"warehouse": warehouse, "database": database, "schema": schema, "role": role}
+        self.session = session or get_default_session()
+        self.timeout = timeout
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            **auth_headers(self.credential, token_type=self.token_type),
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "User-Agent": "snowflake-cortex-agent-cli",
+        }
+
+    def _call(self, method: str, url: str, payload: Any = None) -> tuple[int, Dict[str, Any]]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        try:
+            with self.session.request(method, url, headers=self._headers(), body=body, timeout=self.timeout) as response:
+                data = response.read()
+                status = response.status
+        except (OSError, http.client.HTTPException) as exc:
+            raise RuntimeError(f"Failed to reach Snowflake endpoint: {exc}") from exc
+        try:
+            parsed = json.loads(data) if data else {}
+        except ValueError:
+            parsed = {"message": data.decode("utf-8", errors="ignore")}
+        if status >= 400:
+            raise RuntimeError(f"Snowflake API error {status}: {parsed.get('message') or parsed}")
+        return status, parsed
+
+    def execute(self, statement: str, bindings: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Execute ``statement`` with positional ``?`` bindings and return all rows."""
+
+        payload: Dict[str, Any] = {
+            "statement": statement,
+            "timeout": DEFAULT_STATEMENT_TIMEOUT,
+            **{key: value for key, value in self.context.items() if value},
+        }
+        if bindings:
+            payload["bindings"] = {
+                str(index): {"type": "TEXT", "value": None if value is None else str(value)}
+                for index, value in enumerate(bindings, start=1)
+            }
+
+        status, result = self._call("POST", self.url, payload)
+        handle = result.get("statementHandle")
+        while status == 202 and handle:
+            time.sleep(POLL_INTERVAL)
+            status, result = self._call("GET", f"{self.url}/{urllib.parse.quote(handle)}")
+
+        meta = result.get("resultSetMetaData") or {}
+        columns = [str(column.get("name", "")).upper() for column in meta.get("rowType", [])]
+        rows: List[List[Any]] = list(result.get("data") or [])
+        for partition in range(1, len(meta.get("partitionInfo") or [])):
+            _, extra = self._call("GET", f"{self.url}/{urllib.parse.quote(handle)}?partition={partition}")
+            rows.extend(extra.get("data") or [])
+        return [dict(zip(columns, row)) for row in rows]
+
+
+def add_connection_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the account, credential and context options shared by SQL commands."""
+
+    parser.add_argument("--account", default=os.environ.get("SNOWFLAKE_ACCOUNT", ""))
+    parser.add_argument("--warehouse", default=os.environ.get("SNOWFLAKE_WAREHOUSE", ""))
+    parser.add_argument("--database", default=os.environ.get("SNOWFLAKE_DATABASE", ""))
+    parser.add_argument("--schema", default=os.environ.get("SNOWFLAKE_SCHEMA", ""))
+    parser.add_argument("--role", default=os.environ.get("SNOWFLAKE_ROLE", ""))
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("SNOWFLAKE_API_URL") or None,
+        help="Override https://<account>.snowflakecomputing.com (e.g. the local stand-in).",
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("SNOWFLAKE_PAT", os.environ.get("SNOWFLAKE_TOKEN", "")),
+        help="Programmatic access token for the SQL API.",
+    )
+    add_auth_arguments(parser)
+
+
+def client_from_args(args: argparse.Namespace, *, session: RestSession | None = None) -> SqlApiClient:
+    """Build a :class:`SqlApiClient` from :func:`add_connection_arguments` options."""
+
+    if not args.account and not args.base_url:
+        raise SystemExit("Snowflake account is required (use --account or SNOWFLAKE_ACCOUNT).")
+    credential = credential_from_args(args)
+    if credential is None:
+        raise SystemExit(
+            "A programmatic access token (--token or SNOWFLAKE_PAT) or key-pair credentials "
+            "(--user and .secrets/keys/rsa_key.p8) are required."
+        )
+    return SqlApiClient(
+        args.account,
+        credential,
+        warehouse=args.warehouse or None,
+        database=args.database or None,
+        schema=args.schema or None,
+        role=args.role or None,
+        base_url=args.base_url,
+        session=session,
+    )
+
+
+__all__ = [
+    "DEFAULT_STATEMENT_TIMEOUT",
+    "SqlApiClient",
+    "add_connection_arguments",
+    "client_from_args",
+]
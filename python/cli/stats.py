@@ -0,0 +1,23 @@
+"""Percentile helpers shared by the CLI reports and the benchmarks."""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+# Histogram bucket upper bounds in seconds (roughly 1-2-5 steps).
+DEFAULT_BUCKETS: Sequence[float] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0,
+)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+__all__ = ["DEFAULT_BUCKETS", "percentile"]
@@ -0,0 +1,279 @@
+"""Summarize documents of any length with a map-reduce pass over ``/api/summarize``.
+
+The backend truncates ``content`` to 30,000 characters before calling
+``AI_COMPLETE``. This command splits the extracted text into overlapping,
+paragraph-aligned chunks, summarizes them concurrently, then summarizes the
+partial summaries (recursively, if they are still too long).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .backend import get_backend_url, request_json
+from .cache import DiskCache
+from .rest import RestSession, get_default_session
+from .sqlapi import add_connection_arguments, client_from_args
+from .summarycache import DEFAULT_MODEL, DEFAULT_PROMPT, SummaryCache, default_summary_cache, summary_key
+
+SERVER_CONTENT_LIMIT = 30000
+DEFAULT_CHUNK_CHARS = 24000
+DEFAULT_OVERLAP = 1000
+DEFAULT_CONCURRENCY = 4
+MAX_REDUCE_LEVELS = 5
+
+MAP_PROMPT = (
+    "Summarize the following section of a longer document. Keep key findings, figures, "
+    "obligations, dates and recommended actions; do not add an introduction."
+)
+REDUCE_PROMPT = (
+    "The following are summaries of consecutive sections of one document. Combine them into "
+    "a concise executive summary focusing on key findings, main points, and any recommended actions."
+)
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def split_text(text: str, *, chunk_chars: int = DEFAULT_CHUNK_CHARS, overlap: int = DEFAULT_OVERLAP) -> List[str]:
+    """Split ``text`` into chunks of at most ``chunk_chars`` on paragraph boundaries.
+
+    Each chunk after the first repeats up to ``overlap`` characters of trailing
+    paragraphs from the previous chunk. Paragraphs longer than a chunk are cut
+    into fixed-size windows.
+    """
+
+    if chunk_chars <= 0:
+        raise ValueError("chunk_chars must be positive.")
+    overlap = max(0, min(overlap, chunk_chars // 2))
+    paragraphs: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= chunk_chars:
+            paragraphs.append(paragraph)
+            continue
+        step = chunk_chars - overlap
+        for start in range(0, len(paragraph), step):
+            paragraphs.append(paragraph[start : start + chunk_chars])
+            if start + chunk_chars >= len(paragraph):
+                break
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in paragraphs:
+        added = len(paragraph) + (2 if current else 0)
+        if current and size + added > chunk_chars:
+            chunks.append("\n\n".join(current))
+            carried: List[str] = []
+            carried_size = 0
+            for previous in reversed(current):
+                if carried_size + len(previous) > overlap:
+                    break
+                carried.insert(0, previous)
+                carried_size += len(previous) + 2
+            if carried_size + len(paragraph) > chunk_chars:
+                carried, carried_size = [], 0
+            current, size = carried, max(0, carried_size - 2)
+            added = len(paragraph) + (2 if current else 0)
+        current.append(paragraph)
+        size += added
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class Summarizer:
+    """Map-reduce summarization with bounded concurrency and a per-chunk cache.
+
+    ``cache`` is a :class:`~python.cli.summarycache.SummaryCache` (a bare
+    :class:`DiskCache` is wrapped in one), so identical chunks requested
+    concurrently are only sent to the backend once.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+        overlap: int = DEFAULT_OVERLAP,
+        cache: SummaryCache | DiskCache | None = None,
+        session: RestSession | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        if chunk_chars > SERVER_CONTENT_LIMIT:
+            raise ValueError(f"chunk_chars cannot exceed the backend limit of {SERVER_CONTENT_LIMIT}.")
+        self.base_url = base_url
+        self.concurrency = max(1, concurrency)
+        self.chunk_chars = chunk_chars
+        self.overlap = overlap
+        self.cache = SummaryCache(cache) if isinstance(cache, DiskCache) else cache
+        self.session = session or get_default_session()
+        self.timeout = timeout
+        self.calls = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def cache_key(prompt: str, text: str) -> str:
+        """Cache key for one ``(prompt, text)`` request to the backend's model."""
+
+        return summary_key(DEFAULT_MODEL, prompt, text)
+
+    def _request(self, text: str, prompt: str) -> str:
+        self._count("calls")
+        result = request_json(
+            "POST",
+            f"{self.base_url}/api/summarize",
+            payload={"content": text, "prompt": prompt},
+            session=self.session,
+            timeout=self.timeout,
+        )
+        return str((result or {}).get("summary") or "")
+
+    def summarize_chunk(self, text: str, prompt: str) -> str:
+        """Summarize one chunk, consulting the cache first."""
+
+        if self.cache is None:
+            return self._request(text, prompt)
+        summary, source = self.cache.get_or_compute(self.cache_key(prompt, text), lambda: self._request(text, prompt))
+        if source != "computed":
+            self._count("cache_hits")
+        return summary
+
+    async def _map(self, chunks: List[str], prompt: str) -> List[str]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(chunk: str) -> str:
+            async with semaphore:
+                return await asyncio.to_thread(self.summarize_chunk, chunk, prompt)
+
+        return list(await asyncio.gather(*(one(chunk) for chunk in chunks)))
+
+    async def summarize(self, text: str, *, prompt: str | None = None) -> Dict[str, Any]:
+        """Summarize ``text`` and report the chunking and timing."""
+
+        started = time.perf_counter()
+        chunks = split_text(text, chunk_chars=self.chunk_chars, overlap=self.overlap)
+        if not chunks:
+            raise ValueError("Nothing to summarize: the document text is empty.")
+        if len(chunks) == 1:
+            summary = await asyncio.to_thread(self.summarize_chunk, chunks[0], prompt or DEFAULT_PROMPT)
+            levels = 0
+        else:
+            partials = await self._map(chunks, MAP_PROMPT)
+            levels = 1
+            combined = "\n\n".join(partials)
+            while len(combined) > self.chunk_chars:
+                if levels >= MAX_REDUCE_LEVELS:
+                    raise RuntimeError("Partial summaries did not shrink; giving up after several reduce levels.")
+                partials = await self._map(split_text(combined, chunk_chars=self.chunk_chars, overlap=0), MAP_PROMPT)
+                combined = "\n\n".join(partials)
+                levels += 1
+            summary = await asyncio.to_thread(self.summarize_chunk, combined, prompt or REDUCE_PROMPT)
+        return {
+            "summary": summary,
+            "characters": len(text),
+            "chunks": len(chunks),
+            "reduce_levels": levels,
+            "requests": self.calls,
+            "cache_hits": self.cache_hits,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def fetch_extracted_text(args: argparse.Namespace) -> str:
+    """Read ``EXTRACTED_TEXT`` for ``--stage-path`` through the SQL API."""
+
+    client = client_from_args(args)
+    rows = client.execute(
+        "SELECT EXTRACTED_TEXT FROM SFE_DOCUMENT_METADATA WHERE FILE_PATH = ?",
+        [args.stage_path],
+    )
+    text = rows[0].get("EXTRACTED_TEXT") if rows else None
+    if not text:
+        raise SystemExit(f"Document {args.stage_path!r} not found or not yet processed.")
+    return text
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--stage-path", help="FILE_PATH of an uploaded document in SFE_DOCUMENT_METADATA.")
+    source.add_argument("--file", type=Path, help="Summarize a local text file instead ('-' for stdin).")
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument("--prompt", default=None, help="Instruction for the final summary.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Parallel /api/summarize calls.")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS, help="Maximum characters per chunk.")
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help="Characters repeated between chunks.")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write cached chunk summaries.")
+    parser.add_argument("--json", action="store_true", help="Print the result and statistics as JSON.")
+    add_connection_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the summarize command."""
+
+    args = parse_args(argv)
+    if args.file is not None:
+        text = sys.stdin.read() if str(args.file) == "-" else args.file.read_text(encoding="utf-8")
+    else:
+        text = fetch_extracted_text(args)
+
+    summarizer = Summarizer(
+        get_backend_url(args.backend_url),
+        concurrency=args.concurrency,
+        chunk_chars=args.chunk_chars,
+        overlap=args.overlap,
+        cache=None if args.no_cache else default_summary_cache(),
+        timeout=args.timeout,
+    )
+    try:
+        result = asyncio.run(summarizer.summarize(text, prompt=args.prompt))
+    except (RuntimeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(result["summary"])
+        print(
+            f"\n[{result['characters']} chars, {result['chunks']} chunks, {result['reduce_levels']} reduce levels, "
+            f"{result['requests']} requests, {result['cache_hits']} cached, {result['elapsed_ms']} ms]",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "DEFAULT_CHUNK_CHARS",
+    "DEFAULT_OVERLAP",
+    "SERVER_CONTENT_LIMIT",
+    "Summarizer",
+    "main",
+    "parse_args",
+    "split_text",
+]
@@ -0,0 +1,335 @@
+"""Content-addressed cache for ``AI_COMPLETE`` summaries, plus a local sidecar.
+
+Entries are keyed on ``sha256(model, prompt, text)``. Lookups go through a
+bounded in-memory LRU, then a size-capped :class:`~python.cli.cache.DiskCache`.
+Concurrent requests for the same key are coalesced, so only one caller runs
+the completion and the rest wait for its result.
+
+The sidecar serves the backend's ``POST /api/summarize`` contract from the
+cache and proxies everything else to the backend. To use it, point the
+frontend (``REACT_APP_BACKEND_URL``) at it::
+
+    python python/cli/master.py summary-cache --upstream http://localhost:4000 --port 4010
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from .cache import DiskCache, get_cache_dir
+from .httpproxy import ProxyRequest, ProxyServer, ResponseWriter, forward, relay
+from .rest import RestSession
+
+DEFAULT_MODEL = "mistral-large2"
+DEFAULT_PROMPT = (
+    "Provide a concise executive summary of the following document focusing on key findings, "
+    "main points, and any recommended actions."
+)
+DEFAULT_MEMORY_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SERVER_CONTENT_LIMIT = 30000  # server/src/index.js truncates content before AI_COMPLETE
+
+SOURCES = ("memory", "disk", "shared", "computed")
+
+
+def summary_key(model: str, prompt: str, text: str) -> str:
+    """Cache key for one completion request."""
+
+    digest = hashlib.sha256()
+    for part in (model, prompt, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"summary/{digest.hexdigest()}"
+
+
+class _Flight:
+    """A computation other callers can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: str | None = None
+        self.error: BaseException | None = None
+
+
+class SummaryCache:
+    """Memory LRU over an optional disk store, with single-flight computation."""
+
+    def __init__(self, store: DiskCache | None = None, *, memory_entries: int = DEFAULT_MEMORY_ENTRIES) -> None:
+        self.store = store
+        self.memory_entries = max(0, memory_entries)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {source: 0 for source in (*SOURCES, "errors")}
+        self.compute_seconds = 0.0
+
+    def _remember(self, key: str, summary: str) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = summary
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, key: str) -> Tuple[str | None, str | None]:
+        """Return ``(summary, "memory" | "disk")`` or ``(None, None)``; counts nothing."""
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key], "memory"
+        entry = self.store.get(key) if self.store is not None else None
+        if entry is None or "summary" not in entry:
+            return None, None
+        with self._lock:
+            self._remember(key, entry["summary"])
+        return entry["summary"], "disk"
+
+    def put(self, key: str, summary: str, **metadata: Any) -> None:
+        """Store ``summary`` in memory and on disk."""
+
+        with self._lock:
+            self._remember(key, summary)
+        if self.store is not None:
+            self.store.put(key, {"summary": summary, "created": time.time(), **metadata})
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> Tuple[str, str]:
+        """Return ``(summary, source)``, running ``compute`` at most once per key at a time.
+
+        ``source`` is ``memory``, ``disk``, ``shared`` (waited for a
+        concurrent caller) or ``computed``. Empty results are not cached.
+        """
+
+        summary, source = self.lookup(key)
+        if summary is not None and source is not None:
+            self._count(source)
+            return summary, source
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        assert flight is not None
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                self._count("errors")
+                raise flight.error
+            self._count("shared")
+            return flight.result or "", "shared"
+
+        started = time.perf_counter()
+        try:
+            # Another leader may have finished between our lookup and registering.
+            summary, source = self.lookup(key)
+            if summary is None:
+                summary, source = compute(), "computed"
+                if summary:
+                    self.put(key, summary)
+            flight.result = summary
+            self._count(source or "computed")
+            return summary, source or "computed"
+        except BaseException as exc:
+            flight.error = exc
+            self._count("errors")
+            raise
+        finally:
+            with self._lock:
+                self.compute_seconds += time.perf_counter() - started
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit ratio and cache sizes."""
+
+        with self._lock:
+            counts = dict(self.counts)
+            memory = len(self._memory)
+            compute_seconds = self.compute_seconds
+        hits = counts["memory"] + counts["disk"] + counts["shared"]
+        lookups = hits + counts["computed"]
+        return {
+            **counts,
+            "hits": hits,
+            "misses": counts["computed"],
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": memory,
+            "compute_seconds": round(compute_seconds, 3),
+        }
+
+    def render_metrics(self) -> str:
+        """Counters in the Prometheus text format."""
+
+        metrics = self.metrics()
+        lines = [
+            "# HELP sfe_summary_cache_requests_total Summary lookups by how they were answered.",
+            "# TYPE sfe_summary_cache_requests_total counter",
+        ]
+        lines += [f'sfe_summary_cache_requests_total{{source="{source}"}} {metrics[source]}' for source in SOURCES]
+        lines += [
+            "# TYPE sfe_summary_cache_errors_total counter",
+            f"sfe_summary_cache_errors_total {metrics['errors']}",
+            "# TYPE sfe_summary_cache_memory_entries gauge",
+            f"sfe_summary_cache_memory_entries {metrics['memory_entries']}",
+            "# TYPE sfe_summary_cache_compute_seconds_total counter",
+            f"sfe_summary_cache_compute_seconds_total {metrics['compute_seconds']!r}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def default_summary_cache(*, max_bytes: int = DEFAULT_MAX_BYTES) -> SummaryCache:
+    """The shared cache under ``.cache/summaries``."""
+
+    return SummaryCache(DiskCache(get_cache_dir("summaries"), max_bytes=max_bytes))
+
+
+class SummarySidecar:
+    """Proxy app answering ``POST /api/summarize`` from a :class:`SummaryCache`.
+
+    Requests that name a ``stagePath`` are resolved to text through the
+    local document mirror when it has the document. The backend is then
+    sent that text, so the cache key always matches what was summarized.
+    Paths the mirror does not know are forwarded uncached.
+    """
+
+    def __init__(
+        self,
+        cache: SummaryCache,
+        upstream: str,
+        *,
+        model: str = DEFAULT_MODEL,
+        mirror_path: Path | None = None,
+        session: RestSession | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.cache = cache
+        self.upstream = upstream.rstrip("/")
+        self.model = model
+        self.mirror_path = mirror_path
+        self.session = session or RestSession()
+        self.timeout = timeout
+
+    def _mirror_text(self, stage_path: str) -> str | None:
+        if self.mirror_path is None or not self.mirror_path.exists():
+            return None
+        from .mirror import DocumentMirror
+
+        with DocumentMirror(self.mirror_path) as mirror:
+            document = mirror.get(stage_path)
+        return (document or {}).get("text") or None
+
+    def _complete(self, content: str, prompt: str) -> str:
+        payload = json.dumps({"content": content, "prompt": prompt}).encode("utf-8")
+        request = ProxyRequest("POST", "/api/summarize", {"Content-Type": "application/json"}, payload)
+        with forward(self.session, self.upstream, request, timeout=self.timeout) as response:
+            body = response.read()
+            if response.status >= 400:
+                raise RuntimeError(f"Backend error {response.status}: {body.decode('utf-8', 'ignore')}")
+        return str((json.loads(body) or {}).get("summary") or "")
+
+    def __call__(self, request: ProxyRequest, writer: ResponseWriter) -> None:
+        if request.method == "GET" and request.path == "/__cache/metrics":
+            body = self.cache.render_metrics().encode("utf-8")
+            writer.send(200, [("Content-Type", "text/plain; version=0.0.4; charset=utf-8")], body)
+            return
+        if request.method == "GET" and request.path == "/__cache/stats":
+            writer.send_json(200, self.cache.metrics())
+            return
+        payload = request.json() if request.method == "POST" and request.path == "/api/summarize" else None
+        if not isinstance(payload, dict):
+            relay(forward(self.session, self.upstream, request, timeout=self.timeout), writer)
+            return
+
+        content = payload.get("content") or (self._mirror_text(payload["stagePath"]) if payload.get("stagePath") else None)
+        if not content:
+            relay(forward(self.session, self.upstream, request, timeout=self.timeout), writer)
+            return
+        text = str(content)[:SERVER_CONTENT_LIMIT]
+        prompt = payload.get("prompt") or DEFAULT_PROMPT
+        started = time.perf_counter()
+        try:
+            summary, source = self.cache.get_or_compute(
+                summary_key(self.model, prompt, text), lambda: self._complete(text, prompt)
+            )
+        except (OSError, RuntimeError, ValueError) as exc:
+            writer.send_json(502, {"error": str(exc)}, [("X-Summary-Cache", "error")])
+            return
+        headers = [
+            ("X-Summary-Cache", source),
+            ("Server-Timing", f"cache;desc={source};dur={(time.perf_counter() - started) * 1000:.1f}"),
+        ]
+        writer.send_json(200, {"summary": summary}, headers)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--upstream", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4010)
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model the backend uses; part of the cache key.")
+    parser.add_argument("--memory-entries", type=int, default=DEFAULT_MEMORY_ENTRIES, help="In-memory LRU size.")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024, help="On-disk cache cap.")
+    parser.add_argument("--mirror", type=Path, default=None, help="Mirror database (default: .cache/documents.sqlite).")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Backend read timeout in seconds.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the summary cache sidecar."""
+
+    from .backend import get_backend_url
+    from .mirror import default_mirror_path
+
+    args = parse_args(argv)
+    cache = SummaryCache(
+        DiskCache(get_cache_dir("summaries"), max_bytes=int(args.max_mb * 1024 * 1024)),
+        memory_entries=args.memory_entries,
+    )
+    sidecar = SummarySidecar(
+        cache,
+        get_backend_url(args.upstream),
+        model=args.model,
+        mirror_path=args.mirror or default_mirror_path(),
+        timeout=args.timeout,
+    )
+    server = ProxyServer((args.host, args.port), sidecar)
+    print(f"Summary cache for {sidecar.upstream} on {server.url} (metrics at {server.url}/__cache/metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(json.dumps(cache.metrics()))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "DEFAULT_MODEL",
+    "DEFAULT_PROMPT",
+    "SummaryCache",
+    "SummarySidecar",
+    "default_summary_cache",
+    "main",
+    "parse_args",
+    "summary_key",
+]
@@ -0,0 +1,474 @@
+"""Start the backend and frontend together and keep them running.
+
+Both services are launched at once. Each counts as up when its readiness URL
+answers (the backend's ``/health``, the frontend's dev server root), which
+is polled from a few milliseconds after launch instead of once a second.
+Children that exit are restarted with jittered exponential backoff; a
+service that keeps failing stops the whole run. Output from every child is
+printed with a ``[name]`` prefix and also written to ``.pids/<name>.log``
+next to the PID files used by ``tools/*/03_status`` and ``04_stop``. The
+stop scripts signal ``.pids/supervisor.pid`` first; a child stopped on its
+own with SIGTERM or SIGINT is treated as stopped on purpose, not restarted.
+
+``--exit-when-ready`` prints the cold-start report and stops again, which
+makes time-to-ready easy to measure::
+
+    python python/cli/master.py run --exit-when-ready --json
+
+``master.py run --script`` runs ``tools/<mac|win>/02_start`` instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence
+
+from .deploy import _parse_env_file
+from .rest import RestSession
+from .utils import Backoff, echo, get_project_root, output_prefix
+
+SERVICES = ("backend", "frontend")
+DEFAULT_BACKEND_PORT = 4000
+DEFAULT_FRONTEND_PORT = 3002
+DEFAULT_READY_TIMEOUT = 120.0
+DEFAULT_MAX_RESTARTS = 5
+STABLE_SECONDS = 30.0  # a child that stayed up this long starts a fresh backoff
+STOP_GRACE_SECONDS = 5.0
+PROBE_INTERVAL = 0.05
+PROBE_MAX_INTERVAL = 0.5
+SUPERVISOR_PID_FILE = "supervisor.pid"
+# Return codes of children stopped on purpose (e.g. by tools/mac/04_stop.sh).
+STOP_RETURNCODES = frozenset({-signal.SIGTERM, -signal.SIGINT}) if sys.platform != "win32" else frozenset()
+
+
+class ServiceSpec(NamedTuple):
+    """How to launch one service and tell when it is ready."""
+
+    name: str
+    command: List[str]
+    cwd: Path
+    env: Dict[str, str]
+    ready_url: str | None = None
+
+
+def default_services(
+    project_root: Path,
+    *,
+    backend_port: int = DEFAULT_BACKEND_PORT,
+    frontend_port: int = DEFAULT_FRONTEND_PORT,
+    env: Dict[str, str] | None = None,
+) -> List[ServiceSpec]:
+    """The same two services ``tools/mac/02_start.sh`` starts."""
+
+    npm = "npm.cmd" if sys.platform == "win32" else "npm"
+    shared = dict(env or {})
+    backend_url = f"http://localhost:{backend_port}"
+    return [
+        ServiceSpec(
+            "backend",
+            ["node", "src/index.js"],
+            project_root / "server",
+            {**shared, "PORT": str(backend_port)},
+            f"{backend_url}/health",
+        ),
+        ServiceSpec(
+            "frontend",
+            [npm, "start"],
+            project_root,
+            {**shared, "PORT": str(frontend_port), "REACT_APP_BACKEND_URL": backend_url, "BROWSER": "none"},
+            f"http://localhost:{frontend_port}/",
+        ),
+    ]
+
+
+def port_in_use(port: int, host: str = "127.0.0.1") -> bool:
+    """True when something already accepts connections on ``port``."""
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.5)
+        return sock.connect_ex((host, port)) == 0
+
+
+class ServiceState:
+    """Runtime state of one supervised service."""
+
+    def __init__(self, spec: ServiceSpec) -> None:
+        self.spec = spec
+        self.process: subprocess.Popen[bytes] | None = None
+        self.status = "pending"
+        self.launches = 0
+        self.restarts = 0
+        self.cold_start: float | None = None  # supervisor start to first readiness
+        self.launch_to_ready: float | None = None  # latest launch to readiness
+        self.last_exit: int | None = None
+        self.ready = threading.Event()
+
+    def summary(self) -> Dict[str, Any]:
+        """One row of the cold-start report."""
+
+        def ms(seconds: float | None) -> float | None:
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        return {
+            "service": self.spec.name,
+            "status": self.status,
+            "pid": self.process.pid if self.process is not None else None,
+            "cold_start_ms": ms(self.cold_start),
+            "launch_to_ready_ms": ms(self.launch_to_ready),
+            "restarts": self.restarts,
+            "last_exit": self.last_exit,
+        }
+
+
+class Supervisor:
+    """Launches services concurrently, probes readiness and restarts crashes."""
+
+    def __init__(
+        self,
+        specs: Sequence[ServiceSpec],
+        *,
+        ready_timeout: float = DEFAULT_READY_TIMEOUT,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        stable_seconds: float = STABLE_SECONDS,
+        backoff: Callable[[], Backoff] = lambda: Backoff(1.0, 30.0),
+        pid_dir: Path | None = None,
+        session: RestSession | None = None,
+    ) -> None:
+        self.services = [ServiceState(spec) for spec in specs]
+        self.ready_timeout = ready_timeout
+        self.max_restarts = max_restarts
+        self.stable_seconds = stable_seconds
+        self.backoff = backoff
+        self.pid_dir = pid_dir
+        self.session = session or RestSession()
+        self.failed = False
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._started = 0.0
+
+    def start(self) -> "Supervisor":
+        """Launch every service on its own thread; returns ``self``."""
+
+        self._started = time.monotonic()
+        if self.pid_dir is not None:
+            self.pid_dir.mkdir(parents=True, exist_ok=True)
+            (self.pid_dir / SUPERVISOR_PID_FILE).write_text(f"{os.getpid()}\n", encoding="utf-8")
+        for service in self.services:
+            thread = threading.Thread(target=self._supervise, args=(service,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until every service is ready, one has failed, or ``timeout`` passes."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for service in self.services:
+            while not service.ready.wait(0.1):
+                if self._stop.is_set() or (deadline is not None and time.monotonic() >= deadline):
+                    return False
+        return True
+
+    def run(self) -> int:
+        """Wait until :meth:`request_stop` or a service gives up; returns an exit code."""
+
+        while not self._stop.wait(0.5):
+            pass
+        self.stop()
+        return 1 if self.failed else 0
+
+    def request_stop(self) -> None:
+        """Ask :meth:`run` to return (safe to call from a signal handler)."""
+
+        self._stop.set()
+
+    def stop(self) -> None:
+        """Terminate every child and wait for the supervising threads."""
+
+        self._stop.set()
+        for service in self.services:
+            _terminate(service.process)
+        for thread in self._threads:
+            thread.join(STOP_GRACE_SECONDS * 2)
+        if self.pid_dir is not None:
+            for service in self.services:
+                (self.pid_dir / f"{service.spec.name}.pid").unlink(missing_ok=True)
+            (self.pid_dir / SUPERVISOR_PID_FILE).unlink(missing_ok=True)
+
+    def report(self) -> Dict[str, Any]:
+        """Per-service cold-start timings and the time until all were ready."""
+
+        rows = [service.summary() for service in self.services]
+        starts = [row["cold_start_ms"] for row in rows]
+        return {"services": rows, "all_ready_ms": None if None in starts else max(starts, default=0.0)}
+
+    def _probe(self, url: str) -> bool:
+        try:
+            with self.session.get(url, timeout=2.0) as response:
+                response.read()
+                return response.status < 400
+        except (OSError, http.client.HTTPException):
+            return False
+
+    def _launch(self, service: ServiceState) -> subprocess.Popen[bytes]:
+        spec = service.spec
+        options: Dict[str, Any] = {}
+        if sys.platform == "win32":
+            options["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore[attr-defined]
+        else:
+            options["start_new_session"] = True  # so npm's children are stopped with it
+        process = subprocess.Popen(
+            spec.command,
+            cwd=str(spec.cwd),
+            env={**os.environ, **spec.env},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **options,
+        )
+        service.process = process
+        service.launches += 1
+        if self.pid_dir is not None:
+            (self.pid_dir / f"{spec.name}.pid").write_text(f"{process.pid}\n", encoding="utf-8")
+        log = (self.pid_dir / f"{spec.name}.log") if self.pid_dir is not None else None
+        threading.Thread(target=self._pump, args=(spec.name, process, log), daemon=True).start()
+        return process
+
+    @staticmethod
+    def _pump(name: str, process: subprocess.Popen[bytes], log: Path | None) -> None:
+        assert process.stdout is not None
+        sink = log.open("ab") if log is not None else None
+        try:
+            with output_prefix(f"[{name}] "):
+                for raw in process.stdout:
+                    if sink is not None:
+                        sink.write(raw)
+                        sink.flush()
+                    echo(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+        finally:
+            if sink is not None:
+                sink.close()
+
+    def _wait_until_ready(self, service: ServiceState, process: subprocess.Popen[bytes], launched: float) -> None:
+        url = service.spec.ready_url
+        interval = PROBE_INTERVAL
+        while process.poll() is None and not self._stop.is_set():
+            if url is None or self._probe(url):
+                now = time.monotonic()
+                service.launch_to_ready = now - launched
+                if service.cold_start is None:
+                    service.cold_start = now - self._started
+                service.status = "ready"
+                service.ready.set()
+                echo(f"ready in {service.launch_to_ready:.2f}s" + (f" ({url})" if url else ""))
+                return
+            if time.monotonic() - launched > self.ready_timeout:
+                echo(f"not ready after {self.ready_timeout:.0f}s; still waiting for it to exit or recover")
+                return
+            self._stop.wait(interval)
+            interval = min(interval * 2, PROBE_MAX_INTERVAL)
+
+    def _supervise(self, service: ServiceState) -> None:
+        backoff = self.backoff()
+        failures = 0
+        with output_prefix(f"[{service.spec.name}] "):
+            while not self._stop.is_set():
+                service.status = "starting"
+                launched = time.monotonic()
+                try:
+                    process = self._launch(service)
+                except OSError as exc:
+                    echo(f"failed to start {' '.join(service.spec.command)}: {exc}")
+                    self._give_up(service)
+                    return
+                if self._stop.is_set():  # stop() ran while we were launching
+                    _terminate(process)
+                self._wait_until_ready(service, process, launched)
+                service.last_exit = process.wait()
+                if self._stop.is_set():
+                    service.status = "stopped"
+                    return
+                if service.last_exit in STOP_RETURNCODES:
+                    echo("stopped by signal; not restarting")
+                    self._stopped(service)
+                    return
+                service.status = "exited"
+                service.ready.clear()
+                if time.monotonic() - launched >= self.stable_seconds:
+                    failures = 0
+                    backoff.reset()
+                failures += 1
+                if failures > self.max_restarts:
+                    echo(f"exited with {service.last_exit}; giving up after {self.max_restarts} restart(s)")
+                    self._give_up(service)
+                    return
+                delay = backoff.next()
+                echo(f"exited with {service.last_exit}; restarting in {delay:.1f}s")
+                service.restarts += 1
+                self._stop.wait(delay)
+
+    def _stopped(self, service: ServiceState) -> None:
+        service.status = "stopped"
+        service.ready.clear()
+        if all(other.status in ("stopped", "failed") for other in self.services):
+            self._stop.set()
+
+    def _give_up(self, service: ServiceState) -> None:
+        service.status = "failed"
+        with self._lock:
+            self.failed = True
+        self._stop.set()
+
+
+def _terminate(process: subprocess.Popen[bytes] | None) -> None:
+    """Stop a child and its process group, escalating to a kill after a grace period."""
+
+    if process is None or process.poll() is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            process.terminate()
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+        process.wait(STOP_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        if sys.platform == "win32":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """The cold-start report as a table."""
+
+    def cell(value: Any) -> str:
+        return "-" if value is None else str(value)
+
+    lines = [f"{'service':<10} {'status':<9} {'pid':>7} {'cold start ms':>14} {'restarts':>9}"]
+    for row in report["services"]:
+        lines.append(
+            f"{row['service']:<10} {row['status']:<9} {cell(row['pid']):>7} "
+            f"{cell(row['cold_start_ms']):>14} {row['restarts']:>9}"
+        )
+    lines.append(f"all services ready in {cell(report['all_ready_ms'])} ms")
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--services",
+        default=",".join(SERVICES),
+        help=f"Comma separated services to start (default: {','.join(SERVICES)}).",
+    )
+    parser.add_argument("--backend-port", type=int, default=DEFAULT_BACKEND_PORT)
+    parser.add_argument("--frontend-port", type=int, default=DEFAULT_FRONTEND_PORT)
+    parser.add_argument("--env-file", type=Path, default=None, help="Environment file (default: .secrets/.env).")
+    parser.add_argument(
+        "--ready-timeout",
+        type=float,
+        default=DEFAULT_READY_TIMEOUT,
+        help="Seconds to wait for each service's readiness URL.",
+    )
+    parser.add_argument(
+        "--max-restarts",
+        type=int,
+        default=DEFAULT_MAX_RESTARTS,
+        help="Consecutive restarts of a crashing service before the run stops.",
+    )
+    parser.add_argument("--exit-when-ready", action="store_true", help="Stop again once every service is ready.")
+    parser.add_argument("--json", action="store_true", help="Print the cold-start report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the run command."""
+
+    args = parse_args(argv)
+    names = [name.strip() for name in args.services.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(SERVICES))
+    if unknown:
+        raise SystemExit(f"Unknown services: {', '.join(unknown)} (choose from {', '.join(SERVICES)}).")
+
+    project_root = get_project_root()
+    env_file = args.env_file or project_root / ".secrets" / ".env"
+    if not env_file.exists():
+        raise SystemExit(
+            f"Environment file not found at '{env_file}'. Run tools/mac/01_setup_keypair_auth.sh "
+            "(or tools\\win\\01_setup_keypair_auth.bat) first."
+        )
+    specs = [
+        spec
+        for spec in default_services(
+            project_root,
+            backend_port=args.backend_port,
+            frontend_port=args.frontend_port,
+            env=_parse_env_file(env_file),
+        )
+        if spec.name in names
+    ]
+    ports = {"backend": args.backend_port, "frontend": args.frontend_port}
+    busy = [f"{name} port {ports[name]}" for name in names if port_in_use(ports[name])]
+    if busy:
+        raise SystemExit(f"Already in use: {', '.join(busy)}. Stop the running services first (tools/*/04_stop).")
+
+    supervisor = Supervisor(
+        specs,
+        ready_timeout=args.ready_timeout,
+        max_restarts=args.max_restarts,
+        pid_dir=project_root / ".pids",
+    )
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda *_: supervisor.request_stop())
+    supervisor.start()
+    ready = supervisor.wait_ready(args.ready_timeout)
+
+    def print_report() -> None:
+        report = supervisor.report()
+        echo(json.dumps(report) if args.json else format_report(report))
+
+    print_report()
+    if args.exit_when_ready:
+        supervisor.stop()
+        return 0 if ready else 1
+    try:
+        code = supervisor.run()
+    except KeyboardInterrupt:
+        supervisor.stop()
+        code = 0
+    if code:
+        print_report()
+    return code
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "SERVICES",
+    "ServiceSpec",
+    "ServiceState",
+    "Supervisor",
+    "default_services",
+    "format_report",
+    "main",
+    "parse_args",
+    "port_in_use",
+]
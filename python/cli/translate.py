@@ -0,0 +1,275 @@
+"""Translate many documents into many languages with ``TRANSLATE_DOCUMENT``.
+
+Every (document, language) pair becomes one ``CALL TRANSLATE_DOCUMENT``
+through the SQL API, with at most ``--concurrency`` calls in flight.
+Results are cached by the SHA-256 of the document's extracted text and the
+target language, and only when that hash is unchanged after the call.
+Re-running a batch after new uploads only translates documents whose text
+changed, and renamed copies of a document are free.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Iterator, List, NamedTuple, Sequence
+
+from .cache import DiskCache, get_cache_dir
+from .profiling import span
+from .sqlapi import SqlApiClient, add_connection_arguments, client_from_args
+
+DEFAULT_CONCURRENCY = 4
+DOCUMENTS_STATEMENT = (
+    "SELECT FILE_PATH, SHA2(EXTRACTED_TEXT) AS TEXT_SHA256 FROM SFE_DOCUMENT_METADATA ORDER BY FILE_PATH"
+)
+TEXT_HASH_STATEMENT = "SELECT SHA2(EXTRACTED_TEXT) AS TEXT_SHA256 FROM SFE_DOCUMENT_METADATA WHERE FILE_PATH = ?"
+TRANSLATE_STATEMENT = "CALL TRANSLATE_DOCUMENT(?, ?)"
+
+_LANGUAGE = re.compile(r"^[A-Za-z]{2,3}(?:[-_][A-Za-z]{2,4})?$")
+
+
+class TranslationJob(NamedTuple):
+    """One document and target language."""
+
+    file_path: str
+    language: str
+    text_sha256: str
+
+
+class TranslationResult(NamedTuple):
+    """A finished job; ``error`` is set instead of ``text`` on failure."""
+
+    job: TranslationJob
+    text: str
+    cached: bool
+    seconds: float
+    error: str | None = None
+
+
+def parse_languages(value: str) -> List[str]:
+    """Split ``fr,de,es`` into validated, de-duplicated language codes."""
+
+    languages = [item.strip().lower() for item in value.split(",") if item.strip()]
+    invalid = [item for item in languages if not _LANGUAGE.match(item)]
+    if invalid or not languages:
+        raise argparse.ArgumentTypeError(f"Expected language codes such as 'fr,de', got {value!r}")
+    return list(dict.fromkeys(languages))
+
+
+def plan_jobs(
+    client: SqlApiClient,
+    languages: Sequence[str],
+    *,
+    paths: Sequence[str] = (),
+) -> tuple[List[TranslationJob], List[str]]:
+    """Jobs for every extracted document (or just ``paths``) in each language.
+
+    Only the text hash is read from Snowflake. Returns the jobs and the
+    requested paths that have no extracted text yet.
+    """
+
+    hashes = {
+        row["FILE_PATH"]: row["TEXT_SHA256"]
+        for row in client.execute(DOCUMENTS_STATEMENT)
+        if row.get("TEXT_SHA256")
+    }
+    selected = list(dict.fromkeys(paths)) if paths else sorted(hashes)
+    missing = [path for path in selected if path not in hashes]
+    jobs = [
+        TranslationJob(path, language, hashes[path])
+        for path in selected
+        if path in hashes
+        for language in languages
+    ]
+    return jobs, missing
+
+
+class Translator:
+    """Runs translation jobs with bounded parallelism and a content-addressed cache."""
+
+    def __init__(
+        self,
+        client: SqlApiClient,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache: DiskCache | None = None,
+    ) -> None:
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.calls = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def cache_key(text_sha256: str, language: str) -> str:
+        """Cache key for one ``(text hash, language)`` pair."""
+
+        return f"translation/{text_sha256}/{language.lower()}"
+
+    def translate(self, job: TranslationJob) -> TranslationResult:
+        """Translate one document, consulting the cache first."""
+
+        started = time.perf_counter()
+        key = self.cache_key(job.text_sha256, job.language)
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._count("cache_hits")
+                return TranslationResult(job, entry["text"], True, time.perf_counter() - started)
+        self._count("calls")
+        try:
+            with span(f"translate:{job.language}", "sql", path=job.file_path):
+                rows = self.client.execute(TRANSLATE_STATEMENT, [job.file_path, job.language])
+        except Exception as exc:  # noqa: BLE001 - one failed job must not abort the batch
+            return TranslationResult(job, "", False, time.perf_counter() - started, str(exc) or type(exc).__name__)
+        text = str(next(iter(rows[0].values()), "") or "") if rows else ""
+        error = _procedure_error(text)
+        if error is None and self.cache is not None and self._text_unchanged(job):
+            self.cache.put(key, {"text": text, "file_path": job.file_path, "language": job.language})
+        return TranslationResult(job, "" if error else text, False, time.perf_counter() - started, error)
+
+    def _text_unchanged(self, job: TranslationJob) -> bool:
+        """Whether the document still has the text hash the job was planned with.
+
+        The procedure reads the text at call time, so a translation is only
+        cached under the planned hash if nothing re-extracted the document.
+        """
+
+        try:
+            rows = self.client.execute(TEXT_HASH_STATEMENT, [job.file_path])
+        except Exception:  # noqa: BLE001 - an unverifiable result is simply not cached
+            return False
+        return bool(rows) and rows[0].get("TEXT_SHA256") == job.text_sha256
+
+    def run(self, jobs: Sequence[TranslationJob]) -> Iterator[TranslationResult]:
+        """Yield results as jobs finish; cache hits are answered without a worker."""
+
+        pending: List[TranslationJob] = []
+        for job in jobs:
+            entry = self.cache.get(self.cache_key(job.text_sha256, job.language)) if self.cache is not None else None
+            if entry is not None:
+                self._count("cache_hits")
+                yield TranslationResult(job, entry["text"], True, 0.0)
+            else:
+                pending.append(job)
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending))) as pool:
+            futures = [pool.submit(self.translate, job) for job in pending]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def _procedure_error(text: str) -> str | None:
+    """The procedure reports missing documents as a JSON ``{"error": ...}`` string."""
+
+    if not text.lstrip().startswith("{"):
+        return None
+    try:
+        payload: Any = json.loads(text)
+    except ValueError:
+        return None
+    return str(payload["error"]) if isinstance(payload, dict) and "error" in payload else None
+
+
+def output_path(directory: Path, job: TranslationJob) -> Path:
+    """``<directory>/<stage path>.<language>.txt``."""
+
+    return directory / f"{job.file_path}.{job.language}.txt"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", help="Stage paths to translate (default: every extracted document).")
+    parser.add_argument(
+        "--languages",
+        "-l",
+        type=parse_languages,
+        required=True,
+        help="Comma separated target language codes, e.g. 'fr,de,ja'.",
+    )
+    add_connection_arguments(parser)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of TRANSLATE_DOCUMENT calls in flight.",
+    )
+    parser.add_argument("--output-dir", type=Path, default=None, help="Write each translation to a text file here.")
+    parser.add_argument("--no-cache", action="store_true", help="Translate again even when a cached result exists.")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per result.")
+    parser.add_argument("--dry-run", action="store_true", help="List the jobs and whether each is cached.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the translate command."""
+
+    args = parse_args(argv)
+    client = client_from_args(args)
+    jobs, missing = plan_jobs(client, args.languages, paths=args.paths)
+    for path in missing:
+        print(f"SKIP {path}: not found or not yet processed", file=sys.stderr)
+
+    cache = None if args.no_cache else DiskCache(get_cache_dir("translations"))
+    translator = Translator(client, concurrency=args.concurrency, cache=cache)
+    if args.dry_run:
+        for job in jobs:
+            cached = cache is not None and cache.get(translator.cache_key(job.text_sha256, job.language)) is not None
+            print(f"{'cached' if cached else 'pending':<8} {job.language:<6} {job.file_path}")
+        return 0
+
+    started = time.perf_counter()
+    failures = 0
+    for result in translator.run(jobs):
+        job = result.job
+        if result.error is not None:
+            failures += 1
+        elif args.output_dir is not None:
+            target = output_path(args.output_dir, job)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(result.text, encoding="utf-8")
+        if args.json:
+            record = {**job._asdict(), "cached": result.cached, "seconds": round(result.seconds, 3), "error": result.error}
+            print(json.dumps({**record, "text": result.text}))
+        elif result.error is not None:
+            print(f"FAIL   {job.language:<6} {job.file_path}: {result.error}", file=sys.stderr)
+        else:
+            label = "CACHED" if result.cached else "OK"
+            print(f"{label:<6} {job.language:<6} {job.file_path}  {len(result.text)} chars  {result.seconds:.2f}s")
+
+    print(
+        f"\n{len(jobs)} translation(s) in {time.perf_counter() - started:.1f}s: {translator.calls} called, "
+        f"{translator.cache_hits} cached, {failures} failed, {len(missing)} document(s) skipped.",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "TranslationJob",
+    "TranslationResult",
+    "Translator",
+    "main",
+    "output_path",
+    "parse_args",
+    "parse_languages",
+    "plan_jobs",
+]
@@ -0,0 +1,451 @@
+"""Bulk upload documents to the backend's ``/api/upload`` endpoint."""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import mimetypes
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from .backend import get_backend_url, request_json
+from .cache import get_cache_dir
+from .dedup import DedupIndex, default_index_path
+from .rest import RestSession, get_default_session
+from .stats import percentile
+from .utils import Backoff
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_WORKERS = 4
+DEFAULT_POLL_INITIAL = 2.0
+DEFAULT_POLL_MAX = 30.0
+DEFAULT_WAIT_TIMEOUT = 900.0
+
+FileKey = Tuple[str, int, int]
+
+
+class MultipartFile:
+    """A ``multipart/form-data`` body that streams one file from disk.
+
+    The length is computed up front so the request is sent with a
+    ``Content-Length`` header, and the file is read in fixed-size chunks, so
+    memory use does not depend on the file size. Iterating again re-opens the
+    file, which makes the body safe to replay on a stale pooled connection.
+    The SHA-256 of the file is computed on the way out and exposed as
+    ``digest`` once the body has been sent.
+    """
+
+    replayable = True
+
+    def __init__(self, path: Path, *, field: str = "document", chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.boundary = f"----react-agent-{uuid.uuid4().hex}"
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        filename = path.name.replace('"', "%22")
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self.size = path.stat().st_size
+        self.digest: str | None = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Request headers describing this body."""
+
+        return {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(len(self._head) + self.size + len(self._tail)),
+        }
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        digest = hashlib.sha256()
+        with self.path.open("rb") as handle:
+            while True:
+                chunk = handle.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                yield chunk
+        self.digest = digest.hexdigest()
+        yield self._tail
+
+
+class UploadManifest:
+    """Append-only JSON lines record of completed uploads.
+
+    A file counts as done when its path, size and modification time match a
+    recorded entry, so an interrupted run resumes where it stopped and edited
+    files are uploaded again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._done: Dict[FileKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a torn final line from an interrupted run
+                self._done[(record["path"], record["size"], record["mtime_ns"])] = record
+
+    @staticmethod
+    def file_key(path: Path) -> FileKey:
+        """Identity of a file version on disk."""
+
+        stat = path.stat()
+        return str(path.resolve()), stat.st_size, stat.st_mtime_ns
+
+    def is_done(self, path: Path) -> bool:
+        """Whether this exact file version was already uploaded."""
+
+        return self.file_key(path) in self._done
+
+    def record(self, path: Path, result: Dict[str, Any]) -> None:
+        """Persist a completed upload."""
+
+        resolved, size, mtime_ns = self.file_key(path)
+        entry = {"path": resolved, "size": size, "mtime_ns": mtime_ns, **result}
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, sort_keys=True) + "\n")
+            self._done[(resolved, size, mtime_ns)] = entry
+
+
+def collect_files(target: str) -> List[Path]:
+    """Expand a directory (recursively, skipping hidden entries) or a glob pattern."""
+
+    root = Path(target)
+    if root.is_dir():
+        files = [
+            path
+            for path in root.rglob("*")
+            if path.is_file() and not any(part.startswith(".") for part in path.relative_to(root).parts)
+        ]
+    else:
+        files = [Path(match) for match in glob.glob(target, recursive=True) if Path(match).is_file()]
+    return sorted(files)
+
+
+def default_manifest_path(target: str) -> Path:
+    """Manifest location for a given upload target."""
+
+    digest = hashlib.sha256(str(Path(target).resolve()).encode("utf-8")).hexdigest()[:16]
+    return get_cache_dir("uploads") / f"{digest}.jsonl"
+
+
+def upload_file(
+    path: Path,
+    url: str,
+    *,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+) -> Dict[str, Any]:
+    """Stream one file to ``/api/upload`` and return the result with timings."""
+
+    body = MultipartFile(path)
+    started = time.perf_counter()
+    response = request_json("POST", url, body=body, headers=body.headers, session=session, timeout=timeout)
+    elapsed = time.perf_counter() - started
+    if not isinstance(response, dict):
+        raise ValueError(f"Unexpected upload response for {path.name}: {response!r:.200}")
+    return {
+        "stagePath": response.get("stagePath", path.name),
+        "sha256": body.digest,
+        "bytes": body.size,
+        "seconds": round(elapsed, 3),
+        "mb_per_s": round(body.size / (1024 * 1024) / elapsed, 3) if elapsed else None,
+    }
+
+
+def extraction_snapshot(
+    url: str,
+    *,
+    session: RestSession | None = None,
+    timeout: float | None = None,
+) -> Dict[str, Any]:
+    """Map each listed document's stage path to its ``extractedAt`` value."""
+
+    rows = request_json("GET", url, session=session, timeout=timeout) or []
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f"Unexpected document listing from {url}: {rows!r:.200}")
+    return {row.get("path"): row.get("extractedAt") for row in rows}
+
+
+def wait_for_extraction(
+    uploaded: Dict[str, float],
+    documents_url: str,
+    *,
+    baseline: Dict[str, Any],
+    session: RestSession | None = None,
+    timeout: float | None = None,
+    wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    backoff: Backoff | None = None,
+    on_ready: Callable[[str, float], None] | None = None,
+) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """Poll ``/api/documents`` until every uploaded file has been extracted.
+
+    ``uploaded`` maps stage paths to the ``time.monotonic()`` at which their
+    upload finished. One listing per poll serves every file still in flight. A
+    file is ready once its ``extractedAt`` is set and differs from
+    ``baseline`` (the listing taken before uploading), so re-uploads wait
+    for the new extraction. Returns per-file latencies in seconds and poll
+    statistics, including the paths still pending at ``wait_timeout``.
+    """
+
+    backoff = backoff or Backoff(DEFAULT_POLL_INITIAL, DEFAULT_POLL_MAX)
+    pending = dict(uploaded)
+    latencies: Dict[str, float] = {}
+    polls = errors = 0
+    last_error = ""
+    deadline = time.monotonic() + wait_timeout
+    while pending:
+        polls += 1
+        try:
+            snapshot = extraction_snapshot(documents_url, session=session, timeout=timeout)
+        except (OSError, RuntimeError, ValueError) as exc:
+            errors += 1
+            last_error = str(exc)
+            snapshot = {}
+        observed = time.monotonic()
+        ready = [path for path in pending if snapshot.get(path) and snapshot.get(path) != baseline.get(path)]
+        for path in ready:
+            latencies[path] = observed - pending.pop(path)
+            if on_ready is not None:
+                on_ready(path, latencies[path])
+        if ready:
+            backoff.reset()
+        if not pending or observed >= deadline:
+            break
+        time.sleep(min(backoff.next(), max(0.0, deadline - observed)))
+    return latencies, {"polls": polls, "errors": errors, "last_error": last_error, "pending": sorted(pending)}
+
+
+def format_latency_report(latencies: Dict[str, float]) -> str:
+    """Upload-to-searchable latency distribution across a batch."""
+
+    values = sorted(latencies.values())
+    if not values:
+        return "No documents became searchable."
+    figures = "  ".join(
+        f"{label} {percentile(values, fraction):.1f}s"
+        for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p95", 0.95), ("p99", 0.99))
+    )
+    return (
+        f"Upload-to-searchable latency over {len(values)} file(s): "
+        f"min {values[0]:.1f}s  {figures}  max {values[-1]:.1f}s  mean {sum(values) / len(values):.1f}s"
+    )
+
+
+def _format_size(size: float) -> str:
+    if size < 1024:
+        return f"{int(size)} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024:
+            break
+    return f"{size:.1f} {unit}"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("target", help="Directory (searched recursively) or glob pattern of files to upload.")
+    parser.add_argument("--backend-url", default=None, help="Backend base URL (default: REACT_APP_BACKEND_URL).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of concurrent uploads.",
+    )
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-file read timeout in seconds.")
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Resume manifest path (default: .cache/uploads/<target hash>.jsonl).",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the existing manifest and upload every file again.",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Content index database (default: .cache/uploads/index.sqlite).",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Upload even when the content index shows an identical file was already uploaded.",
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="After uploading, poll /api/documents until every file is extracted and report the latency.",
+    )
+    parser.add_argument(
+        "--wait-timeout",
+        type=float,
+        default=DEFAULT_WAIT_TIMEOUT,
+        help="Seconds to wait for extraction with --wait.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INITIAL,
+        help="Initial delay between polls with --wait; doubles up to --poll-max.",
+    )
+    parser.add_argument("--poll-max", type=float, default=DEFAULT_POLL_MAX, help="Longest delay between polls.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the files that would be uploaded.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the bulk upload command."""
+
+    args = parse_args(argv)
+    files = collect_files(args.target)
+    if not files:
+        print(f"No files matched {args.target}")
+        return 1
+
+    manifest_path = args.manifest or default_manifest_path(args.target)
+    if args.restart and manifest_path.exists():
+        manifest_path.unlink()
+    manifest = UploadManifest(manifest_path)
+    pending = [path for path in files if not manifest.is_done(path)]
+    skipped = len(files) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} file(s) already recorded in {manifest_path}")
+
+    url = f"{get_backend_url(args.backend_url)}/api/upload"
+    documents_url = f"{get_backend_url(args.backend_url)}/api/documents"
+    if args.dry_run:
+        for path in pending:
+            print("Dry run: would upload", path)
+        return 0
+
+    session = get_default_session()
+    baseline: Dict[str, Any] = {}
+    uploaded_at: Dict[str, float] = {}
+    if args.wait:
+        try:
+            baseline = extraction_snapshot(documents_url, session=session, timeout=args.timeout)
+        except (OSError, RuntimeError, ValueError) as exc:
+            print(f"Cannot list documents before uploading: {exc}", file=sys.stderr)
+            return 1
+    index = None if args.no_dedup else DedupIndex(args.index or default_index_path())
+
+    def process(path: Path) -> Dict[str, Any] | None:
+        """Upload one file unless the index shows identical content is staged."""
+
+        if index is not None:
+            unchanged, _ = index.is_unchanged(path, path.name)
+            if unchanged:
+                return None
+        result = upload_file(path, url, session=session, timeout=args.timeout)
+        uploaded_at[result["stagePath"]] = time.monotonic()
+        if index is not None:
+            index.record(path, path.name, result["sha256"])
+        return result
+
+    failures = 0
+    unchanged = 0
+    total_bytes = 0
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {pool.submit(process, path): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                except (OSError, RuntimeError, ValueError, KeyError, sqlite3.Error) as exc:
+                    failures += 1
+                    print(f"FAIL {path}: {exc}", file=sys.stderr)
+                    continue
+                if result is None:
+                    unchanged += 1
+                    manifest.record(path, {"stagePath": path.name, "unchanged": True})
+                    print(f"SAME {path}  (identical content already uploaded)")
+                    continue
+                manifest.record(path, result)
+                total_bytes += result["bytes"]
+                print(
+                    f"OK   {path}  {_format_size(result['bytes'])}  {result['seconds']:.2f}s  "
+                    f"{result['mb_per_s'] or 0:.2f} MB/s"
+                )
+    finally:
+        if index is not None:
+            index.close()
+
+    elapsed = time.perf_counter() - started
+    uploaded = len(pending) - failures - unchanged
+    rate = total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0
+    print(
+        f"\nUploaded {uploaded} file(s), {_format_size(total_bytes)} in {elapsed:.1f}s "
+        f"({rate:.2f} MB/s aggregate); {unchanged} unchanged, {failures} failed, {skipped} skipped."
+    )
+    if not args.wait or not uploaded_at:
+        return 1 if failures else 0
+
+    print(f"Waiting for extraction of {len(uploaded_at)} file(s)...")
+    latencies, polling = wait_for_extraction(
+        uploaded_at,
+        documents_url,
+        baseline=baseline,
+        session=session,
+        timeout=args.timeout,
+        wait_timeout=args.wait_timeout,
+        backoff=Backoff(args.poll_interval, args.poll_max),
+        on_ready=lambda path, seconds: print(f"READY {path}  {seconds:.1f}s"),
+    )
+    print(format_latency_report(latencies))
+    print(
+        f"{polling['polls']} poll(s) of /api/documents, {polling['errors']} failed"
+        + (f" (last error: {polling['last_error']})" if polling["errors"] else "")
+    )
+    for path in polling["pending"]:
+        print(f"PENDING {path}  (not extracted after {args.wait_timeout:.0f}s)", file=sys.stderr)
+    return 1 if failures or polling["pending"] else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "MultipartFile",
+    "UploadManifest",
+    "collect_files",
+    "default_manifest_path",
+    "extraction_snapshot",
+    "format_latency_report",
+    "main",
+    "parse_args",
+    "upload_file",
+    "wait_for_extraction",
+]
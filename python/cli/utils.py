@@ -3,9 +3,18 @@
 from __future__ import annotations
 
 import os
+import random
 import subprocess
+import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Mapping, MutableMapping, Sequence
+from typing import Iterator, Mapping, MutableMapping, Sequence
+
+from .profiling import span
+
+_local = threading.local()
+_print_lock = threading.Lock()
 
 
 def get_project_root() -> Path:
@@ -14,6 +23,32 @@ def get_project_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+@contextmanager
+def output_prefix(prefix: str) -> Iterator[None]:
+    """Prefix every line printed by :func:`run_command` in this thread.
+
+    Used when several commands run concurrently so their interleaved output
+    stays attributable.
+    """
+
+    previous = getattr(_local, "prefix", None)
+    _local.prefix = prefix
+    try:
+        yield
+    finally:
+        _local.prefix = previous
+
+
+def echo(message: str) -> None:
+    """Print ``message`` with the current thread's output prefix, if any."""
+
+    prefix = getattr(_local, "prefix", None) or ""
+    with _print_lock:
+        for line in message.splitlines() or [""]:
+            print(f"{prefix}{line}")
+        sys.stdout.flush()
+
+
 def run_command(
     command: Sequence[str],
     *,
@@ -23,6 +58,9 @@ def run_command(
 ) -> int:
     """Execute a subprocess command.
 
+    Inside :func:`output_prefix` the command's stdout and stderr are captured
+    and re-printed line by line with the prefix.
+
     Parameters
     ----------
     command:
@@ -41,20 +79,67 @@ def run_command(
     """
 
     if verbose:
-        print("Running:", " ".join(command))
+        echo("Running: " + " ".join(command))
 
     process_env: MutableMapping[str, str] = dict(os.environ)
     if env:
         process_env.update(env)
 
-    completed = subprocess.run(
+    label = " ".join([Path(command[0]).name, *command[1:3]]) if command else ""
+    with span(label, "subprocess", cwd=str(cwd) if cwd is not None else None):
+        return _run(command, cwd, process_env)
+
+
+def _run(command: Sequence[str], cwd: Path | None, process_env: Mapping[str, str]) -> int:
+    if getattr(_local, "prefix", None) is None:
+        completed = subprocess.run(
+            list(command),
+            cwd=str(cwd) if cwd is not None else None,
+            env=process_env,
+            check=False,
+        )
+        return completed.returncode
+
+    process = subprocess.Popen(
         list(command),
         cwd=str(cwd) if cwd is not None else None,
         env=process_env,
-        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
     )
-    return completed.returncode
+    assert process.stdout is not None
+    for raw in process.stdout:
+        echo(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+    return process.wait()
+
+
+class Backoff:
+    """Exponential delays with "equal jitter": half fixed, half random.
+
+    The jitter keeps concurrent waiters from polling in lockstep; ``reset``
+    drops back to the initial delay after progress is observed.
+    """
+
+    def __init__(self, initial: float, maximum: float, *, factor: float = 2.0, rng: random.Random | None = None) -> None:
+        self.initial = initial
+        self.maximum = max(initial, maximum)
+        self.factor = factor
+        self.rng = rng or random.Random()
+        self._current = initial
+
+    def next(self) -> float:
+        """The delay before the next attempt."""
+
+        delay = self._current
+        self._current = min(self.maximum, self._current * self.factor)
+        return delay / 2 + self.rng.uniform(0, delay / 2)
+
+    def reset(self) -> None:
+        """Start again from the initial delay."""
+
+        self._current = self.initial
 
 
-__all__ = ["get_project_root", "run_command"]
+__all__ = ["Backoff", "echo", "get_project_root", "output_prefix", "run_command"]
 
@@ -0,0 +1,28 @@
+"""Shared fixtures for the CLI and benchmark tests."""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from python.bench.standin import StandInServer, StandInState, make_documents, start_server
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "standin(documents=3, words=30, **state): options for the stand-in server fixture"
+    )
+
+
+@pytest.fixture()
+def standin(request: pytest.FixtureRequest) -> Iterator[StandInServer]:
+    """A stand-in Snowflake server; configure it with ``@pytest.mark.standin(...)``."""
+
+    marker = request.node.get_closest_marker("standin")
+    options = dict(marker.kwargs) if marker else {}
+    documents = make_documents(options.pop("documents", 3), words=options.pop("words", 30))
+    server = start_server(StandInState(documents=documents, **options))
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,70 @@
+"""Tests for retrieval-scoped question answering."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from python.cli import ask
+from python.cli.mirror import DocumentMirror
+from python.cli.search import SearchIndex
+
+
+CONTRACT = (
+    "This agreement starts on 1 March. The supplier delivers monthly reports. "
+    "Either party may terminate with ninety days written notice. "
+    "Payment is due within thirty days of the invoice date. "
+) * 6
+
+
+def test_passages_keep_offsets_and_rank_relevant_text() -> None:
+    """Offsets index the original text and the matching passage ranks first."""
+
+    passages = ask.split_passages("c.pdf", CONTRACT, size=200, overlap=40)
+    assert len(passages) > 3
+    assert all(CONTRACT[p.start : p.end] == p.text and len(p.text) <= 200 for p in passages)
+
+    ranked = ask.rank_passages(passages, "How much notice is needed to terminate?")
+    assert "terminate with ninety days" in ranked[0][1].text
+
+    chosen = ask.pack_passages(ranked, top_k=3, token_budget=100)
+    assert 1 <= len(chosen) <= 3
+    assert sum(len(p.text) for p in chosen) <= 100 * ask.CHARS_PER_TOKEN
+
+
+def test_dry_run_prints_labelled_context(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Without a search index every mirrored document is a candidate."""
+
+    mirror_path = tmp_path / "docs.sqlite"
+    with DocumentMirror(mirror_path) as mirror:
+        mirror.upsert(
+            [
+                {"FILE_PATH": "contract.pdf", "EXTRACTION_TIMESTAMP": "1", "EXTRACTED_TEXT": CONTRACT},
+                {"FILE_PATH": "menu.pdf", "EXTRACTION_TIMESTAMP": "2", "EXTRACTED_TEXT": "Soup and bread. " * 40},
+            ]
+        )
+
+    code = ask.main(
+        ["when", "is", "payment", "due", "--mirror", str(mirror_path), "--index", str(tmp_path / "none"), "--dry-run"]
+    )
+    output = capsys.readouterr().out
+    assert code == 0
+    assert output.startswith("[1] contract.pdf @")
+    assert "menu.pdf" not in output
+
+
+def test_index_without_hits_falls_back_to_the_mirror(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """A stale index that matches nothing does not hide a populated mirror."""
+
+    mirror_path = tmp_path / "docs.sqlite"
+    with DocumentMirror(mirror_path) as mirror:
+        mirror.upsert([{"FILE_PATH": "contract.pdf", "EXTRACTION_TIMESTAMP": "1", "EXTRACTED_TEXT": CONTRACT}])
+    index_path = tmp_path / "index.sqlite"
+    with SearchIndex(index_path) as index:
+        index.add("menu.pdf", "Soup and bread. " * 40)
+        index.commit()
+
+    code = ask.main(["when", "is", "payment", "due", "--mirror", str(mirror_path), "--index", str(index_path), "--dry-run"])
+    assert code == 0
+    assert capsys.readouterr().out.startswith("[1] contract.pdf @")
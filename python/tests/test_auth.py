@@ -0,0 +1,108 @@
+"""Tests for key-pair JWT authentication."""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from python.cli import auth
+from python.cli.cache import DiskCache
+
+
+def _write_key(path: Path) -> None:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+    )
+
+
+@pytest.fixture()
+def key_path(tmp_path: Path) -> Path:
+    path = tmp_path / "rsa_key.p8"
+    _write_key(path)
+    return path
+
+
+def _decode(segment: str) -> dict:
+    return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+
+def test_jwt_claims_and_signature(key_path: Path) -> None:
+    """The token names ACCOUNT.USER with the key fingerprint and verifies with the public key."""
+
+    credential = auth.KeyPairAuth("xy12345.us-east-1.snowflakecomputing.com", "svc_user", key_path)
+    header, claims, signature = credential.token().split(".")
+    key, fingerprint = auth.load_private_key(key_path)
+
+    assert _decode(header) == {"alg": "RS256", "typ": "JWT"}
+    payload = _decode(claims)
+    assert payload["sub"] == "XY12345.SVC_USER"
+    assert payload["iss"] == f"XY12345.SVC_USER.{fingerprint}"
+    assert payload["exp"] - payload["iat"] == auth.DEFAULT_TOKEN_LIFETIME
+    key.public_key().verify(
+        base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4)),
+        f"{header}.{claims}".encode("ascii"),
+        padding.PKCS1v15(),
+        hashes.SHA256(),
+    )
+    assert credential.headers()["X-Snowflake-Authorization-Token-Type"] == "KEYPAIR_JWT"
+
+
+def test_token_is_signed_once_and_shared(key_path: Path, tmp_path: Path) -> None:
+    """Concurrent callers share one signature; a new process reuses the disk cache."""
+
+    cache = DiskCache(tmp_path / "auth")
+    credential = auth.KeyPairAuth("acct", "user", key_path, cache=cache)
+    tokens: list[str] = []
+    threads = [threading.Thread(target=lambda: tokens.append(credential.token())) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(tokens)) == 1 and credential.signed == 1
+
+    restarted = auth.KeyPairAuth("acct", "user", key_path, cache=cache)
+    assert restarted.token() == tokens[0] and restarted.signed == 0
+
+    expiring = auth.KeyPairAuth("acct", "user", key_path, cache=cache, refresh_margin=auth.DEFAULT_TOKEN_LIFETIME + 1)
+    expiring.token()
+    assert expiring.signed == 1
+
+
+def test_key_rotated_in_place_is_not_served_a_stale_token(key_path: Path, tmp_path: Path) -> None:
+    """Replacing the key file invalidates the memory and disk token caches."""
+
+    cache = DiskCache(tmp_path / "auth")
+    credential = auth.KeyPairAuth("acct", "user", key_path, cache=cache)
+    old = credential.token()
+
+    _write_key(key_path)
+    stat = key_path.stat()
+    os.utime(key_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    fingerprint = auth.load_private_key(key_path)[1]
+
+    rotated = credential.token()
+    assert rotated != old and _decode(rotated.split(".")[1])["iss"].endswith(fingerprint)
+    restarted = auth.KeyPairAuth("acct", "user", key_path, cache=cache)
+    assert restarted.token() == rotated and restarted.signed == 0
+
+
+def test_auth_headers_for_tokens() -> None:
+    """Plain tokens keep working, with an optional token type."""
+
+    assert auth.auth_headers(" pat ") == {"Authorization": "Bearer pat"}
+    assert auth.auth_headers("pat", token_type=auth.PAT_TOKEN_TYPE)["X-Snowflake-Authorization-Token-Type"] == (
+        "PROGRAMMATIC_ACCESS_TOKEN"
+    )
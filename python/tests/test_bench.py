@@ -0,0 +1,110 @@
+"""Tests for the backend load generator."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from python.bench.runner import parse_mix, run_closed_loop, run_open_loop
+from python.bench.stats import LatencyRecorder, percentile
+from python.bench.workloads import WorkloadContext, chat_stream
+from python.cli.rest import RestSession
+
+
+class _BackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        status, payload = (200, []) if self.path == "/api/documents" else (503, {"status": "unhealthy"})
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'data: {"type":"thinking"}\n\ndata: {"type":"error","content":"agent timed out"}\n\n'
+        split = body.index(b'"error"') + 3  # the error marker straddles two writes
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for part in (body[:split], body[split:]):
+            self.wfile.write(part)
+            self.wfile.flush()
+            time.sleep(0.05)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def backend_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BackendHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_percentiles_and_histogram() -> None:
+    """Nearest-rank percentiles and cumulative buckets."""
+
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 0.5) == 0.05
+    assert percentile(values, 0.99) == 0.099
+
+    recorder = LatencyRecorder(buckets=(0.01, 0.05))
+    for value in values:
+        recorder.record(value, ok=value < 0.1)
+    summary = recorder.summary(elapsed=2.0)
+    assert summary["requests"] == 100 and summary["errors"] == 1
+    assert summary["throughput_rps"] == 50.0
+    assert [bucket["count"] for bucket in summary["histogram"]] == [10, 50, 100]
+
+
+def test_closed_and_open_loop_runs(backend_url: str) -> None:
+    """Both arrival models issue the requested mix and count errors."""
+
+    with RestSession() as session:
+        ctx = WorkloadContext(base_url=backend_url, session=session, timeout=5)
+        mix = parse_mix("documents=3,health=1")
+
+        closed = run_closed_loop(ctx, mix, concurrency=4, duration=None, requests=40, seed=1)
+        assert closed["total"]["requests"] == 40
+        assert closed["workloads"]["health"]["errors"] == closed["workloads"]["health"]["requests"]
+        assert closed["workloads"]["documents"]["errors"] == 0
+
+        opened = run_open_loop(ctx, mix, rate=200, concurrency=4, duration=None, requests=20, seed=1)
+        assert opened["total"]["requests"] == 20
+
+    with pytest.raises(ValueError):
+        parse_mix("nope")
+
+
+def test_unexpected_workload_errors_are_counted(backend_url: str, tmp_path: Path) -> None:
+    """Failures other than HTTP errors (here a missing upload file) are recorded, not lost."""
+
+    with RestSession() as session:
+        ctx = WorkloadContext(base_url=backend_url, session=session, timeout=5, upload_file=tmp_path / "missing.pdf")
+        mix = parse_mix("upload=1")
+        closed = run_closed_loop(ctx, mix, concurrency=2, duration=None, requests=6, seed=1)
+        opened = run_open_loop(ctx, mix, rate=200, concurrency=2, duration=None, requests=6, seed=1)
+    for report in (closed, opened):
+        assert report["total"]["requests"] == 6 and report["total"]["errors"] == 6
+
+
+def test_stream_error_split_across_chunks_is_an_error(backend_url: str) -> None:
+    """An error event is detected after SSE parsing, not by scanning raw chunks."""
+
+    with RestSession() as session:
+        with pytest.raises(RuntimeError, match="error event"):
+            chat_stream(WorkloadContext(base_url=backend_url, session=session, timeout=5))
@@ -0,0 +1,117 @@
+"""Tests for the on-disk agent metadata cache."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from python.cli import describe_agent
+from python.cli.cache import DiskCache, MetadataCache
+from python.cli.describe_agent import build_agent_url, fetch_agent_metadata
+from python.cli.rest import RestSession
+
+_ETAG = '"v1"'
+
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self.server.statuses.append(  # type: ignore[attr-defined]
+            304 if self.headers.get("If-None-Match") == _ETAG else 200
+        )
+        if self.headers.get("If-None-Match") == _ETAG:
+            self.send_response(304)
+            self.send_header("ETag", _ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"name": "DoctorChris"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", _ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def server() -> Iterator[ThreadingHTTPServer]:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    httpd.statuses = []  # type: ignore[attr-defined]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_metadata_cache_serves_fresh_and_revalidates_stale(
+    server: ThreadingHTTPServer, tmp_path: Path
+) -> None:
+    """Fresh entries skip the network; stale ones cost a 304 round trip."""
+
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v2/databases/DB/schemas/S/agents/A"
+    statuses: List[int] = server.statuses  # type: ignore[attr-defined]
+    cache = MetadataCache(DiskCache(tmp_path), ttl=60)
+
+    with RestSession() as session:
+        for _ in range(3):
+            assert fetch_agent_metadata(url, "t", verbose=False, session=session, cache=cache) == {
+                "name": "DoctorChris"
+            }
+        assert statuses == [200]
+
+        cache.ttl = 0
+        assert fetch_agent_metadata(url, "t", verbose=False, session=session, cache=cache) == {
+            "name": "DoctorChris"
+        }
+        assert statuses == [200, 304]
+
+
+def test_fresh_hit_builds_no_credentials(
+    server: ThreadingHTTPServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A fresh cache hit resolves no token, so key-pair auth signs no JWT."""
+
+    signed: List[object] = []
+    monkeypatch.setattr(describe_agent, "auth_headers", lambda token: signed.append(token) or {"Authorization": "x"})
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v2/databases/DB/schemas/S/agents/A"
+    cache = MetadataCache(DiskCache(tmp_path), ttl=60)
+    with RestSession() as session:
+        for _ in range(3):
+            fetch_agent_metadata(url, "t", verbose=False, session=session, cache=cache)
+    assert signed == ["t"]
+
+
+def test_metadata_cache_key_includes_the_endpoint() -> None:
+    """The same agent behind a stand-in and the real account gets separate entries."""
+
+    real = build_agent_url("acct", "DB", "S", "A")
+    standin = build_agent_url("acct", "DB", "S", "A", base_url="http://127.0.0.1:8765")
+    assert MetadataCache.key(real) != MetadataCache.key(standin)
+    assert MetadataCache.key(real) == MetadataCache.key(build_agent_url("acct", "DB", "S", "A"))
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Writing past the size cap removes the oldest entries first."""
+
+    store = DiskCache(tmp_path, max_bytes=10_000)
+    for index in range(3):
+        store.put(f"k{index}", {"body": "x" * 3000})
+        path = store._path(f"k{index}")
+        os.utime(path, (index, index))
+
+    assert store.get("k0") is not None  # touching k0 makes k1 the oldest
+    store.put("k3", {"body": "x" * 3000})
+
+    assert store.get("k1") is None
+    assert all(store.get(key) is not None for key in ("k0", "k2", "k3"))
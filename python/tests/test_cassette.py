@@ -0,0 +1,134 @@
+"""Tests for the record/replay cassette proxy."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from python.bench.cassette import Cassette, Player, Recorder, request_key
+from python.bench.standin import StandInServer
+from python.bench.workloads import WORKLOADS, WorkloadContext
+from python.cli.describe_agent import build_agent_url, fetch_agent_metadata
+from python.cli.httpproxy import ProxyRequest, ProxyServer, ResponseWriter
+from python.cli.rest import RestSession
+from python.cli.upload import MultipartFile
+
+pytestmark = pytest.mark.standin(latency_ms={"describe_agent": 80})
+
+
+def _slow_stream(request: ProxyRequest, writer: ResponseWriter) -> None:
+    writer.start(200, [("Content-Type", "text/event-stream")])
+    for index in range(3):
+        time.sleep(0.05)
+        writer.write(f"data: {json.dumps({'type': 'response', 'index': index})}\n\n".encode("utf-8"))
+    writer.finish()
+
+
+def test_request_key_ignores_json_key_order() -> None:
+    assert request_key("post", "/api/chat", b'{"a": 1, "b": 2}') == request_key("POST", "/api/chat", b'{"b":2,"a":1}')
+    assert request_key("POST", "/api/chat", b'{"a": 1}') != request_key("POST", "/api/chat", b'{"a": 2}')
+
+
+def test_uploads_replay_despite_random_multipart_boundaries(tmp_path: Path) -> None:
+    """Each MultipartFile picks a new boundary; recorded uploads still match on replay."""
+
+    def backend(request: ProxyRequest, writer: ResponseWriter) -> None:
+        writer.send_json(200, {"stagePath": "report.pdf", "bytes": len(request.body)})
+
+    document = tmp_path / "report.pdf"
+    document.write_bytes(b"%PDF-1.4 sample")
+    upstream = ProxyServer(("127.0.0.1", 0), backend).start()
+    with Cassette(tmp_path / "upload.db") as cassette:
+        recorder = ProxyServer(("127.0.0.1", 0), Recorder(cassette, upstream.url)).start()
+        try:
+            with RestSession() as session:
+                ctx = WorkloadContext(base_url=recorder.url, session=session, upload_file=document)
+                WORKLOADS["upload"](ctx)
+        finally:
+            recorder.stop()
+            upstream.stop()
+
+        player = Player(cassette, latency="zero")
+        proxy = ProxyServer(("127.0.0.1", 0), player).start()
+        try:
+            with RestSession() as session:
+                ctx = WorkloadContext(base_url=proxy.url, session=session, upload_file=document)
+                for _ in range(2):
+                    WORKLOADS["upload"](ctx)
+        finally:
+            proxy.stop()
+    assert (player.hits, player.misses) == (2, 0)
+
+    other = tmp_path / "other.pdf"
+    other.write_bytes(b"%PDF-1.4 different")
+    first, second = MultipartFile(document), MultipartFile(other)
+    assert request_key("POST", "/api/upload", b"".join(first), first.headers["Content-Type"]) != request_key(
+        "POST", "/api/upload", b"".join(second), second.headers["Content-Type"]
+    )
+
+
+def test_record_then_replay_rest_calls(standin: StandInServer, tmp_path: Path) -> None:
+    """describe_agent traffic replays identically, with and without the recorded latency."""
+
+    path = tmp_path / "rest.db"
+    with Cassette(path) as cassette:
+        proxy = ProxyServer(("127.0.0.1", 0), Recorder(cassette, standin.url)).start()
+        try:
+            url = build_agent_url("acct", "DB", "S", "DoctorChris", base_url=proxy.url)
+            with RestSession() as session:
+                recorded = fetch_agent_metadata(url, "secret", verbose=False, session=session)
+        finally:
+            proxy.stop()
+        assert cassette.summary()[0]["count"] == 1
+        assert "secret" not in path.read_bytes().decode("latin-1")
+
+    standin.shutdown()
+    with Cassette(path) as cassette:
+        for latency, bound in (("zero", lambda ms: ms < 60), ("original", lambda ms: ms >= 75)):
+            player = Player(cassette, latency=latency)
+            proxy = ProxyServer(("127.0.0.1", 0), player).start()
+            try:
+                url = build_agent_url("acct", "DB", "S", "DoctorChris", base_url=proxy.url)
+                with RestSession() as session:
+                    started = time.perf_counter()
+                    replayed = fetch_agent_metadata(url, "other", verbose=False, session=session)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    with session.get(build_agent_url("acct", "DB", "S", "Nobody", base_url=proxy.url)) as missing:
+                        assert missing.status == 404 and missing.header("X-Cassette") == "miss"
+                        missing.read()
+            finally:
+                proxy.stop()
+            assert replayed == recorded
+            assert bound(elapsed_ms), (latency, elapsed_ms)
+            assert (player.hits, player.misses) == (1, 1)
+
+
+def test_streamed_chunks_keep_their_timing(tmp_path: Path) -> None:
+    """SSE chunks are stored separately and replayed at their recorded offsets."""
+
+    upstream = ProxyServer(("127.0.0.1", 0), _slow_stream).start()
+    with Cassette(tmp_path / "sse.db") as cassette:
+        recorder = ProxyServer(("127.0.0.1", 0), Recorder(cassette, upstream.url)).start()
+        with RestSession() as session, session.post(f"{recorder.url}/api/chat/stream", body=b"{}") as response:
+            recorded = response.read()
+        recorder.stop()
+        upstream.stop()
+
+        key = request_key("POST", "/api/chat/stream", b"{}")
+        interaction = cassette.get(key, 0)
+        assert len(interaction.chunks) == 3 and interaction.offsets_ms[-1] >= 140
+
+        player = ProxyServer(("127.0.0.1", 0), Player(cassette)).start()
+        try:
+            with RestSession() as session, session.post(f"{player.url}/api/chat/stream", body=b"{}") as response:
+                arrivals = []
+                started = time.perf_counter()
+                for chunk in response.iter_chunks():
+                    arrivals.append((time.perf_counter() - started) * 1000)
+                    assert chunk in recorded
+        finally:
+            player.stop()
+    assert len(arrivals) == 3 and arrivals[-1] - arrivals[0] >= 80
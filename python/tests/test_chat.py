@@ -0,0 +1,79 @@
+"""Tests for the streaming chat client."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from python.cli.chat import SSEParser, run_turn
+from python.cli.rest import RestSession
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        events = [
+            {"type": "thinking", "content": "Processing your request..."},
+            {"type": "response", "content": f"echo: {payload['message']}"},
+            {"type": "done", "thread_id": "t-1", "message_id": payload["parent_message_id"] + 1},
+        ]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for event in events:
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(0.02)
+        self.close_connection = True
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def backend_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sse_parser_handles_split_chunks() -> None:
+    """Events survive arbitrary chunk boundaries, CRLF, comments and multi-line data."""
+
+    stream = b": keep-alive\r\nevent: update\r\nid: 7\r\ndata: one\r\ndata: two\r\n\r\ndata:{\"a\":1}\n\n"
+    parser = SSEParser()
+    events = []
+    for index in range(len(stream)):
+        events.extend(parser.feed(stream[index : index + 1]))
+
+    assert [(event.event, event.data, event.id) for event in events] == [
+        ("update", "one\ntwo", "7"),
+        ("message", '{"a":1}', "7"),
+    ]
+
+
+def test_run_turn_records_latency(backend_url: str) -> None:
+    """A turn collects the response and orders its timing milestones."""
+
+    session = RestSession()
+    try:
+        result = run_turn(backend_url, "hello", parent_message_id=2, session=session, echo=False)
+    finally:
+        session.close()
+
+    assert result.error is None
+    assert result.response == "echo: hello"
+    assert (result.thread_id, result.message_id) == ("t-1", 3)
+    assert result.first_event_ms is not None and result.first_response_ms is not None
+    assert result.first_event_ms <= result.first_response_ms <= result.total_ms
@@ -0,0 +1,122 @@
+"""Tests for the version-invalidated chat cache proxy."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from python.cli.cache import DiskCache
+from python.cli.chat import run_turn
+from python.cli.chatcache import ChatCache, DocumentSetVersion, backend_version, chat_key, normalize_message
+from python.cli.httpproxy import ProxyRequest, ProxyServer, ResponseWriter
+from python.cli.rest import RestSession
+
+
+class FakeBackend:
+    """The chat and documents endpoints of server/src/index.js."""
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.documents: List[Dict[str, Any]] = [{"path": "a.pdf", "extractedAt": "2026-01-01 00:00:00"}]
+        self.fail = False
+
+    def __call__(self, request: ProxyRequest, writer: ResponseWriter) -> None:
+        if request.path == "/api/documents":
+            writer.send_json(200, self.documents)
+            return
+        payload = request.json()
+        self.calls.append(request.path)
+        turn = {
+            "thread_id": payload.get("thread_id") or "upstream-thread",
+            "message_id": (payload.get("parent_message_id") or 0) + 1,
+        }
+        answer = json.dumps({"content": f"answer {len(self.calls)}"})
+        if request.path == "/api/chat":
+            writer.send_json(200, {"response": answer, **turn})
+            return
+        writer.start(200, [("Content-Type", "text/event-stream")])
+        writer.write(b'data: {"type":"thinking","content":"Processing your request..."}\n\n')
+        if self.fail:
+            writer.write(b'data: {"type":"error","content":"agent timed out"}\n\n')
+        else:
+            for event in ({"type": "response", "content": f"answer {len(self.calls)}"}, {"type": "done", **turn}):
+                writer.write(b"data: " + json.dumps(event).encode() + b"\n\n")
+        writer.finish()
+
+
+def _servers(tmp_path: Path) -> tuple[FakeBackend, ProxyServer, ProxyServer, ChatCache]:
+    backend = FakeBackend()
+    upstream = ProxyServer(("127.0.0.1", 0), backend).start()
+    session = RestSession()
+    proxy = ChatCache(
+        DiskCache(tmp_path),
+        upstream.url,
+        DocumentSetVersion(backend_version(upstream.url, session), ttl=0),
+        session=session,
+    )
+    return backend, upstream, ProxyServer(("127.0.0.1", 0), proxy).start(), proxy
+
+
+def test_normalised_key_includes_the_document_version() -> None:
+    assert normalize_message("  What are the MAIN findings?? ") == "what are the main findings"
+    version = ("2026-01-01", 3)
+    assert chat_key("What are the main findings?", version) == chat_key("what are  the main findings", version)
+    question = "What are the main findings?"
+    assert chat_key(question, version) != chat_key(question, ("2026-01-01", 4))
+
+
+def test_stream_replays_event_shapes_until_documents_change(tmp_path: Path) -> None:
+    backend, upstream, server, proxy = _servers(tmp_path)
+    try:
+        first = run_turn(server.url, "What are the main findings?", echo=False)
+        body = json.dumps({"message": "what are the main findings", "thread_id": "t1", "parent_message_id": 4})
+        with RestSession() as session, session.post(
+            f"{server.url}/api/chat/stream", headers={"Content-Type": "application/json"}, body=body.encode()
+        ) as response:
+            assert response.header("X-Chat-Cache") == "hit"
+            assert response.header("Content-Type") == "text/event-stream"
+            events = [json.loads(line[6:]) for line in response.text().splitlines() if line.startswith("data: ")]
+        assert events == [
+            {"type": "thinking", "content": "Processing your request..."},
+            {"type": "response", "content": first.response},
+            {"type": "done", "thread_id": "t1", "message_id": 5},
+        ]
+        assert backend.calls == ["/api/chat/stream"]
+
+        backend.documents.append({"path": "b.pdf", "extractedAt": "2026-02-01 00:00:00"})
+        again = run_turn(server.url, "What are the main findings?", echo=False)
+        assert again.response == "answer 2" and again.message_id == 1
+        assert proxy.stats()["hit"] == 1 and proxy.stats()["miss"] == 2
+    finally:
+        server.stop()
+        upstream.stop()
+
+
+def test_plain_chat_cache_and_errors_are_not_stored(tmp_path: Path) -> None:
+    backend, upstream, server, proxy = _servers(tmp_path)
+    try:
+        backend.fail = True
+        assert run_turn(server.url, "Summarise the report", echo=False).error == "agent timed out"
+        backend.fail = False
+        assert run_turn(server.url, "Summarise the report", echo=False).response == "answer 2"
+
+        with RestSession() as session:
+            def ask(parent: int) -> tuple[Dict[str, Any], str | None]:
+                body = json.dumps({"message": "Summarise the report.", "parent_message_id": parent}).encode()
+                headers = {"Content-Type": "application/json"}
+                with session.post(f"{server.url}/api/chat", headers=headers, body=body) as response:
+                    return response.json(), response.header("X-Chat-Cache")
+
+            first, source = ask(0)
+            assert source == "miss"  # the streamed entry has no raw response yet
+            second, source = ask(2)
+            assert source == "hit"
+            assert second["response"] == first["response"] and second["message_id"] == 3
+            assert second["thread_id"] != first["thread_id"]
+        assert backend.calls == ["/api/chat/stream", "/api/chat/stream", "/api/chat"]
+        assert run_turn(server.url, "summarise the report", echo=False).response == "answer 3"
+        assert proxy.stats()["hit"] == 2
+    finally:
+        server.stop()
+        upstream.stop()
@@ -0,0 +1,77 @@
+"""Tests for concurrent multi-agent describe."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from python.cli import describe_agent
+from python.cli.describe_agent import AgentRef, describe_agents, load_agent_refs
+
+
+def test_load_agent_refs_skips_comments(tmp_path: Path) -> None:
+    """Agent files hold one fully qualified name per line."""
+
+    listing = tmp_path / "agents.txt"
+    listing.write_text("# fleet\nDB.S1.A\n\nDB.S2.B\n", encoding="utf-8")
+    assert load_agent_refs(listing) == [AgentRef("DB", "S1", "A"), AgentRef("DB", "S2", "B")]
+
+    listing.write_text("DB.A\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_agent_refs(listing)
+
+
+def test_describe_agents_is_bounded_and_concurrent(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fan-out should overlap calls up to the semaphore limit and stream NDJSON."""
+
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def fake_fetch(url: str, token: str, **_: Any) -> Any:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.1)
+        with lock:
+            state["active"] -= 1
+        if url.endswith("/BAD/agents"):
+            return [{"title": "no name"}]
+        if url.endswith("/agents"):
+            return [{"name": "Listed"}]
+        if url.endswith("Broken"):
+            raise RuntimeError("Snowflake API error 404: missing")
+        return {"url": url}
+
+    monkeypatch.setattr(describe_agent, "fetch_agent_metadata", fake_fetch)
+
+    refs = [AgentRef("DB", "S", f"A{index}") for index in range(7)] + [AgentRef("DB", "S", "Broken")]
+    out = io.StringIO()
+    started = time.perf_counter()
+    failures = asyncio.run(
+        describe_agents(
+            "acct",
+            "token",
+            refs=refs,
+            schemas=[("DB", "OTHER"), ("DB", "BAD")],
+            concurrency=4,
+            timeout=5,
+            verbose=False,
+            out=out,
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert failures == 2
+    assert {record["agent"] for record in records} == {ref.name for ref in refs} | {"Listed", None}
+    assert [record["schema"] for record in records if record["agent"] is None] == ["BAD"]
+    assert state["peak"] == 4
+    # 11 calls of 0.1s at concurrency 4 need three waves, far below the serial 1.1s.
+    assert elapsed < 0.8
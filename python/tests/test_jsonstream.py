@@ -0,0 +1,58 @@
+"""Tests for the incremental JSON re-formatter."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List
+
+import pytest
+
+from python.cli.jsonstream import JsonStreamer, parse_selector
+
+_SPEC: dict[str, Any] = {
+    "name": "DoctorChris",
+    "instructions": {"response": 'Quote "sources"\nalways. ' * 50},
+    "tools": [
+        {"tool_spec": {"type": "generic", "name": "TRANSLATE_DOCUMENT", "input_schema": {}}},
+        {"tool_spec": {"type": "cortex_search", "name": "search"}, "limits": [1, -2.5e3, True, None]},
+    ],
+    "models": [],
+}
+
+
+def _stream(text: str, chunk: int, **kwargs: Any) -> tuple[str, bool]:
+    out: List[str] = []
+    streamer = JsonStreamer(out.append, **kwargs)
+    for start in range(0, len(text), chunk):
+        streamer.feed(text[start : start + chunk])
+    matched = streamer.close()
+    return "".join(out), matched
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 4096])
+def test_streamer_matches_json_dumps(chunk: int) -> None:
+    """Pretty and compact output should equal json.dumps regardless of chunking."""
+
+    text = json.dumps(_SPEC)
+    assert _stream(text, chunk)[0] == json.dumps(_SPEC, indent=2) + "\n"
+    assert _stream(text, chunk, indent=None)[0] == json.dumps(_SPEC, separators=(",", ":")) + "\n"
+
+
+def test_streamer_selects_subtree() -> None:
+    """Selectors address object keys and array indices."""
+
+    text = json.dumps(_SPEC)
+    output, matched = _stream(text, 5, select=parse_selector("tools.1.tool_spec"))
+    assert matched
+    assert json.loads(output) == _SPEC["tools"][1]["tool_spec"]
+
+    output, matched = _stream(text, 5, select=parse_selector("missing"))
+    assert not matched and output == ""
+
+
+@pytest.mark.parametrize("bad", ['{"a":1,}', "[1 2]", '{"a" 1}', '{"a":tru}', "[1]]", "{"])
+def test_streamer_rejects_malformed_input(bad: str) -> None:
+    """Malformed documents raise ValueError."""
+
+    with pytest.raises(ValueError):
+        _stream(bad, 3)
@@ -0,0 +1,70 @@
+"""Start-up cost checks for the master CLI."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from python.cli.utils import get_project_root
+
+# Cumulative -X importtime budget in microseconds for ``import python.cli.master``.
+# The default is generous (several times the cost measured after the switch to
+# lazily imported subcommands) so loaded CI runners pass; SFE_IMPORT_BUDGET_US
+# tightens or loosens it.
+IMPORT_BUDGET_US = int(os.environ.get("SFE_IMPORT_BUDGET_US") or 150_000)
+HEAVY_MODULES = ("json", "urllib.parse", "http.client", "getpass", "sqlite3", "asyncio", "subprocess")
+
+
+def _run(code: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=get_project_root(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_master_import_loads_no_subcommand() -> None:
+    """Importing the CLI and parsing a command does not load any subcommand."""
+
+    code = (
+        "import sys, python.cli.master as m; m.parse_args(['describe-agent', '--help']);"
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules));"
+        "print(','.join(sorted(name for name in sys.modules if name.startswith('python.'))))"
+    )
+    completed = _run(code)
+    heavy, loaded = completed.stdout.splitlines()
+    assert heavy == ""
+    assert loaded == "python.cli,python.cli.master"
+
+
+def test_master_import_stays_within_budget() -> None:
+    """``import python.cli.master`` stays within the -X importtime budget."""
+
+    completed = _run("import python.cli.master")
+    cumulative = [
+        int(line.split("|")[1])
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and line.rstrip().endswith("| python.cli.master")
+    ]
+    assert cumulative and cumulative[0] < IMPORT_BUDGET_US, completed.stderr[-2000:]
+
+
+def test_master_forwards_to_lazily_imported_module(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The dispatch table imports the module at call time and forwards argv."""
+
+    from python.cli import master
+
+    seen: dict[str, list[str]] = {}
+
+    def fake_main(argv: list[str]) -> int:
+        seen["argv"] = argv
+        return 0
+
+    monkeypatch.setattr("python.cli.search.main", fake_main)
+    assert master.main(["search", "--stats"]) == 0
+    assert seen["argv"] == ["--stats"]
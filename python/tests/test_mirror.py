@@ -0,0 +1,43 @@
+"""Tests for the local document metadata mirror."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from python.bench.standin import StandInState, make_documents, start_server
+from python.cli.mirror import DocumentMirror, sync
+from python.cli.rest import RestSession
+from python.cli.sqlapi import SqlApiClient
+
+
+def test_incremental_sync_and_tied_timestamps(tmp_path: Path) -> None:
+    """Only rows at or past the watermark are pulled, and tied timestamps are not skipped."""
+
+    documents = make_documents(12, words=50)
+    for row in documents[4:10]:
+        row["EXTRACTION_TIMESTAMP"] = documents[4]["EXTRACTION_TIMESTAMP"]
+    state = StandInState(documents=documents[:10])
+    server = start_server(state)
+    try:
+        with RestSession() as session, DocumentMirror(tmp_path / "docs.sqlite") as mirror:
+            client = SqlApiClient("acct", "token", base_url=server.url, session=session)
+            first = sync(mirror, client, batch_size=3)
+            assert first["documents_updated"] == 10
+            assert mirror.version() == (documents[4]["EXTRACTION_TIMESTAMP"], 10)
+
+            state.documents.extend(documents[10:])
+            second = sync(mirror, client, batch_size=3)
+            assert second["documents_updated"] == 8  # the tied group plus two new rows
+            assert mirror.version()[1] == 12
+
+            record = mirror.get("doc_00011.pdf")
+            assert record is not None and record["text"] == documents[11]["EXTRACTED_TEXT"]
+            assert record["text_length"] == len(documents[11]["EXTRACTED_TEXT"])
+            assert [row["file_path"] for row in mirror.list(limit=2)] == ["doc_00011.pdf", "doc_00010.pdf"]
+
+            del state.documents[0]
+            full = sync(mirror, client, full=True)
+            assert full["documents_pruned"] == 1 and mirror.get("doc_00000.pdf") is None
+    finally:
+        server.shutdown()
+        server.server_close()
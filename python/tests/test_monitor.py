@@ -0,0 +1,72 @@
+"""Tests for the latency monitor."""
+
+from __future__ import annotations
+
+import socket
+import threading
+
+import pytest
+
+from python.bench.standin import StandInServer
+from python.cli.monitor import MetricsServer, Monitor, Probe, RingBuffer
+from python.cli.rest import RestSession
+
+pytestmark = pytest.mark.standin(documents=2, words=20)
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_ring_buffer_keeps_the_latest_samples() -> None:
+    """Old samples are overwritten in place once the buffer is full."""
+
+    ring = RingBuffer(3)
+    for second in range(5):
+        ring.append(float(second), second * 10.0)
+
+    assert len(ring) == 3 and len(ring.values) == 3
+    assert ring.samples() == [20.0, 30.0, 40.0]
+    assert ring.samples(since=4.0) == [40.0]
+
+
+def test_monitor_records_latency_and_errors(standin: StandInServer) -> None:
+    """Successful, HTTP-error and unreachable probes all land in the metrics."""
+
+    probes = [Probe("agents", "/api/v2/databases/DB/schemas/S/agents"), Probe("health", "/health")]
+    monitor = Monitor(standin.url, probes, interval=0.01, window=4)
+    monitor.run(threading.Event(), rounds=6)
+    text = monitor.render_metrics()
+
+    assert 'sfe_probe_duration_seconds_count{probe="agents"} 6' in text
+    assert 'sfe_probe_duration_seconds_bucket{probe="agents",le="+Inf"} 6' in text
+    assert 'sfe_probe_errors_total{probe="health",kind="http_4xx"} 6' in text
+    assert 'sfe_probe_up{probe="agents"} 1' in text and 'sfe_probe_up{probe="health"} 0' in text
+    assert 'sfe_probe_window_seconds{probe="agents",quantile="0.99"}' in text
+    assert [entry["window"] for entry in monitor.snapshot()] == [4, 4]
+
+    offline = Monitor(f"http://127.0.0.1:{_closed_port()}", [Probe("health", "/health")], timeout=1)
+    offline.run(threading.Event(), rounds=1)
+    assert offline.snapshot()[0]["errors"] == {"connection": 1}
+
+
+def test_metrics_endpoint(standin: StandInServer) -> None:
+    """/metrics serves the Prometheus text format."""
+
+    monitor = Monitor(standin.url, [Probe("agents", "/api/v2/databases/DB/schemas/S/agents")])
+    monitor.run(threading.Event(), rounds=1)
+    server = MetricsServer(("127.0.0.1", 0), monitor)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with RestSession() as session, session.get(f"{server.url}/metrics") as response:
+            body = response.text()
+            content_type = response.header("Content-Type")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE sfe_probe_duration_seconds histogram" in body
+    assert "sfe_probe_rounds_total 1" in body
@@ -0,0 +1,90 @@
+"""Tests for environment profiles, the check command and profile fan-out."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from python.bench.standin import StandInServer
+from python.cli import check, master, profiles
+
+pytestmark = pytest.mark.standin(documents=4, words=40, agents_per_schema=2)
+
+
+def test_load_and_select_profiles(tmp_path: Path) -> None:
+    """Sections inherit DEFAULT, keys are upper-cased and env_file is layered underneath."""
+
+    (tmp_path / "dev.env").write_text("SNOWFLAKE_ACCOUNT=dev_acct\nSNOWFLAKE_ROLE=DEV\n", encoding="utf-8")
+    path = tmp_path / "profiles.ini"
+    path.write_text(
+        "[DEFAULT]\nsnowflake_database = DB\n"
+        f"[dev]\nenv_file = {tmp_path / 'dev.env'}\nSNOWFLAKE_ROLE = OVERRIDE\n"
+        "[prod]\nSNOWFLAKE_ACCOUNT = prod_acct\n",
+        encoding="utf-8",
+    )
+    loaded = profiles.load_profiles(path)
+
+    assert loaded["dev"].env == {"SNOWFLAKE_ACCOUNT": "dev_acct", "SNOWFLAKE_ROLE": "OVERRIDE", "SNOWFLAKE_DATABASE": "DB"}
+    assert [profile.name for profile in profiles.select_profiles(loaded, "all")] == ["dev", "prod"]
+    assert [profile.name for profile in profiles.select_profiles(loaded, "prod, dev,prod")] == ["prod", "dev"]
+    with pytest.raises(SystemExit, match="Unknown profiles: qa"):
+        profiles.select_profiles(loaded, "dev,qa")
+
+
+def test_check_command_against_standin(standin: StandInServer, capsys: pytest.CaptureFixture[str]) -> None:
+    """describe and documents pass; health fails because the stand-in has no backend."""
+
+    code = check.main(
+        ["--base-url", standin.url, "--token", "t", "--database", "DB", "--schema", "S", "--agent", "DoctorChris",
+         "--backend-url", standin.url, "--timeout", "5"]
+    )
+    lines = capsys.readouterr().out.splitlines()
+
+    assert code == 1
+    assert lines[0].startswith("health") and "failed" in lines[0]
+    assert "DoctorChris (3 tools)" in lines[1]
+    assert "4 documents" in lines[2]
+
+
+def test_fan_out_aggregates_profiles(standin: StandInServer, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Each profile runs in its own subprocess and lands in one report."""
+
+    path = tmp_path / "profiles.ini"
+    path.write_text(
+        f"[DEFAULT]\nSNOWFLAKE_PAT = t\nSNOWFLAKE_DATABASE = DB\nSNOWFLAKE_SCHEMA = S\nSNOWFLAKE_AGENT = DoctorChris\n"
+        f"[staging]\nSNOWFLAKE_API_URL = {standin.url}\n"
+        f"[prod]\nSNOWFLAKE_API_URL = {standin.url}\nSNOWFLAKE_AGENT = MISSING\n",
+        encoding="utf-8",
+    )
+
+    code = profiles.fan_out("all", ["check", "--checks", "describe,documents"], path=path)
+    out = capsys.readouterr().out
+
+    assert code == 1
+    rows = {line.split()[0]: line for line in out.splitlines() if line.startswith(("staging", "prod"))}
+    assert "ok" in rows["staging"].split()[1] and rows["prod"].split()[1] == "FAILED"
+    assert "[prod] describe: Snowflake API error 404" in out
+    assert "1/2 profiles succeeded" in out
+    assert standin.state.counts["describe_agent"] == 2
+
+
+def test_unexpected_check_error_is_a_failed_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A KeyError from one check is reported instead of aborting the others."""
+
+    def broken(args: object, session: object) -> str:
+        raise KeyError("agent_spec")
+
+    monkeypatch.setitem(check._CHECKS, "describe", broken)
+    results = check.run_checks(check.parse_args([]), ["describe"])
+    assert [(result.name, result.status, result.detail) for result in results] == [
+        ("describe", "failed", "'agent_spec'")
+    ]
+
+
+def test_master_fans_out_with_envs_not_profile(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    monkeypatch.setattr(profiles, "fan_out", lambda spec, argv, path=None: calls.append((spec, argv, path)) or 0)
+    assert master.main(["--envs", "dev,prod", "--envs-file", "p.ini", "check", "--checks", "health"]) == 0
+    assert calls == [("dev,prod", ["check", "--checks", "health"], Path("p.ini"))]
+    assert master.parse_args(["--profile", "check"]).envs is None
@@ -0,0 +1,75 @@
+"""Tests for the --profile instrumentation."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from python.cli import master, profiling
+from python.cli.utils import run_command
+
+
+def test_spans_are_noops_without_a_profile() -> None:
+    """Instrumented code runs normally when nothing is being profiled."""
+
+    with profiling.span("idle"):
+        value = 1
+    assert value == 1 and profiling._active is None
+
+
+def test_profile_run_writes_chrome_trace(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Steps and subprocesses become complete ("X") trace events plus a summary."""
+
+    trace_path = tmp_path / "run.trace.json"
+    with profiling.profile_run("demo", output=trace_path, memory_profile=True):
+        with profiling.span("outer"):
+            assert run_command([sys.executable, "-c", "pass"]) == 0
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    names = {(event["cat"], event["name"]) for event in trace["traceEvents"]}
+    assert {("command", "demo"), ("step", "outer")} <= names
+    assert any(cat == "subprocess" for cat, _ in names)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+    err = capsys.readouterr().err
+    assert "outer" in err and "peak traced Python memory" in err
+
+
+def test_master_profile_option(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """--profile before the subcommand wraps its execution."""
+
+    monkeypatch.setattr("python.cli.setup.main", lambda argv: 0)
+    trace_path = tmp_path / "setup.trace.json"
+    assert master.main(["--profile", "--profile-out", str(trace_path), "setup"]) == 0
+    assert json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"][0]["name"] == "setup"
+
+
+def _busy_worker() -> int:
+    return sum(range(1000))
+
+
+def test_python_profile_covers_worker_threads(tmp_path: Path) -> None:
+    """Functions run only in pool threads still show up in the merged cProfile stats."""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with profiling.profile_run("pool", output=tmp_path / "pool.trace.json", python_profile=True) as profiler:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(lambda _: _busy_worker(), range(4))) == [499500] * 4
+
+    functions = {name for _, _, name in profiler.python_stats().stats}
+    assert "_busy_worker" in functions
+    assert (tmp_path / "pool.trace.prof").exists()
+
+
+def test_unwritable_trace_does_not_mask_the_error(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """A trace that cannot be written is reported; the command's own exception still propagates."""
+
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory", encoding="utf-8")
+    with pytest.raises(KeyError, match="real failure"):
+        with profiling.profile_run("broken", output=blocker / "out.trace.json"):
+            raise KeyError("real failure")
+    assert "Could not write profile" in capsys.readouterr().err
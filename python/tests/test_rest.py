@@ -0,0 +1,76 @@
+"""Tests for the pooled REST session against a local stand-in server."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from python.cli.describe_agent import fetch_agent_metadata
+from python.cli.rest import RestSession
+
+
+class _AgentHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:  # type: ignore[attr-defined]
+            self.server.handshakes += 1  # type: ignore[attr-defined]
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        body = json.dumps({"name": "DoctorChris", "path": self.path}).encode("utf-8")
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def stand_in() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AgentHandler)
+    server.handshakes = 0  # type: ignore[attr-defined]
+    server.lock = threading.Lock()  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeated_fetches_share_one_connection_per_host(stand_in: ThreadingHTTPServer) -> None:
+    """Many describe calls through one session should cost one handshake per host."""
+
+    port = stand_in.server_address[1]
+    with RestSession() as session:
+        for host in ("127.0.0.1", "localhost"):
+            for index in range(5):
+                url = f"http://{host}:{port}/api/v2/databases/DB/schemas/S/agents/A{index}"
+                result = fetch_agent_metadata(url, "token", verbose=False, session=session)
+                assert result["name"] == "DoctorChris"
+
+        assert sorted(session.connections_opened.values()) == [1, 1]
+    assert stand_in.handshakes == 2  # type: ignore[attr-defined]
+
+
+def test_gzip_responses_are_decoded(stand_in: ThreadingHTTPServer) -> None:
+    """Compressed bodies should be transparently inflated."""
+
+    port = stand_in.server_address[1]
+    with RestSession() as session:
+        with session.get(f"http://127.0.0.1:{port}/agents") as response:
+            assert response.header("Content-Encoding") == "gzip"
+            assert response.json() == {"name": "DoctorChris", "path": "/agents"}
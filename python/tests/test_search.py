@@ -0,0 +1,112 @@
+"""Tests for the offline BM25 search index."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from python.bench.indexing import run
+from python.cli.mirror import DocumentMirror
+from python.cli.search import SearchIndex, decode_postings, encode_varint, snippet, update_from_documents
+
+
+def test_varint_postings_round_trip() -> None:
+    """Delta-encoded postings decode back to absolute ids and frequencies."""
+
+    data = bytearray()
+    previous = 0
+    pairs = [(3, 1), (130, 2), (20000, 300), (20001, 1)]
+    for doc_id, tf in pairs:
+        encode_varint(doc_id - previous, data)
+        encode_varint(tf, data)
+        previous = doc_id
+    assert list(decode_postings(bytes(data))) == pairs
+
+
+def test_ranking_updates_and_optimize(tmp_path: Path) -> None:
+    """Replacements tombstone old postings; results survive reopening and merging."""
+
+    path = tmp_path / "search.sqlite"
+    with SearchIndex(path) as index:
+        index.add("a.pdf", "The termination clause allows renewal.", version="1")
+        index.add("b.pdf", "Quarterly revenue growth and revenue forecast.", version="1")
+        index.commit()
+        index.add("c.pdf", "Vendor invoice schedule with termination fees and termination notice.", version="1")
+        index.commit()
+        assert [hit.file_path for hit in index.search("termination")] == ["c.pdf", "a.pdf"]
+
+        index.add("a.pdf", "Warranty terms only.", version="2")
+        index.commit()
+        assert [hit.file_path for hit in index.search("termination")] == ["c.pdf"]
+        assert index.segment_count == 3
+
+    with SearchIndex(path) as index:
+        assert index.version_of("a.pdf") == "2" and index.document_count == 3
+        index.optimize()
+        assert index.segment_count == 1 and index.stats()["tombstones"] == 0
+        assert [hit.file_path for hit in index.search("revenue warranty")] == ["b.pdf", "a.pdf"]
+
+    with SearchIndex(path) as index:
+        assert index.stats()["tombstones"] == 0 and index.document_count == 3
+
+
+def test_reindexing_keeps_scores_positive(tmp_path: Path) -> None:
+    """Tombstoned postings do not count towards a term's document frequency."""
+
+    with SearchIndex(tmp_path / "search.sqlite") as index:
+        index.add("a.pdf", "alpha alpha beta")
+        index.add("b.pdf", "alpha gamma delta epsilon")
+        index.add("c.pdf", "unrelated words")
+        index.commit()
+        before = index.search("alpha")
+        for _ in range(3):
+            index.add("a.pdf", "alpha alpha beta")
+            index.add("b.pdf", "alpha gamma delta epsilon")
+            index.commit()
+        after = index.search("alpha")
+    assert [hit.file_path for hit in after] == [hit.file_path for hit in before] == ["a.pdf", "b.pdf"]
+    assert [hit.score for hit in after] == [hit.score for hit in before]
+    assert all(hit.score > 0 for hit in after)
+
+
+def test_update_from_mirror_and_snippets(tmp_path: Path) -> None:
+    """Only changed mirror rows are re-read; vanished ones are removed."""
+
+    rows = [
+        {"FILE_PATH": f"doc{i}.pdf", "EXTRACTION_TIMESTAMP": "2025-11-01 00:00:0%d" % i, "EXTRACTED_TEXT": text}
+        for i, text in enumerate(["alpha beta", "gamma delta", "beta gamma epsilon"])
+    ]
+    with DocumentMirror(tmp_path / "docs.sqlite") as mirror, SearchIndex(tmp_path / "search.sqlite") as index:
+        mirror.upsert(rows)
+        loaded = []
+
+        def load(path: str) -> str:
+            loaded.append(path)
+            return mirror.get(path)["text"]
+
+        documents = [(row["file_path"], row["extraction_timestamp"]) for row in mirror.list()]
+        assert update_from_documents(index, documents, load)["added"] == 3
+        loaded.clear()
+        result = update_from_documents(index, documents[:2], load)
+        assert loaded == [] and result["deleted"] == 1
+        assert len(index.paths()) == 2
+
+    text = "Intro. " + "filler " * 60 + "The renewal clause and the renewal fee. " + "filler " * 60
+    assert "[renewal] clause and the [renewal] [fee]" in snippet(text, "renewal fee", width=80)
+
+
+def test_index_benchmark_smoke(tmp_path: Path) -> None:
+    """The synthetic-corpus benchmark builds, queries and updates an index."""
+
+    report = run(
+        tmp_path / "bench.sqlite",
+        documents=200,
+        words=40,
+        vocabulary_size=2000,
+        batch=50,
+        queries=20,
+        update_fraction=0.1,
+        seed=3,
+    )
+    assert report["index"]["documents"] == 200 and report["index"]["segments"] == 1
+    assert report["query_ms"]["selective"]["count"] == 20
+    assert report["update"]["documents"] == 20
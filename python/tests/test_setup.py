@@ -0,0 +1,48 @@
+"""Tests for concurrent, fingerprint-cached setup."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from python.cli import setup
+from python.cli.utils import output_prefix, run_command
+
+
+def test_run_command_prefixes_captured_output(capsys: pytest.CaptureFixture[str]) -> None:
+    """Inside output_prefix every line of the child's output is tagged."""
+
+    with output_prefix("[job] "):
+        code = run_command([sys.executable, "-c", "print('one'); import sys; print('two', file=sys.stderr)"])
+    lines = capsys.readouterr().out.splitlines()
+    assert code == 0
+    assert sorted(lines) == ["[job] one", "[job] two"]
+
+
+def test_group_skipped_until_inputs_change(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """A recorded fingerprint skips the group; editing the lockfile reruns it."""
+
+    calls: list[str] = []
+
+    def fake_run(command: list[str], cwd: Path | None, verbose: bool) -> int:
+        calls.append(str(cwd))
+        (tmp_path / "node_modules").mkdir(exist_ok=True)
+        return 0
+
+    monkeypatch.setattr(setup, "run_command", fake_run)
+    (tmp_path / "package-lock.json").write_text('{"v": 1}', encoding="utf-8")
+    group = next(group for group in setup.build_groups(tmp_path) if group.name == "npm")
+    fingerprints = setup.Fingerprints(tmp_path / ".cache" / "fingerprints.json")
+    monkeypatch.setattr(fingerprints, "tool_version", lambda tool: "v20.0.0")
+    options = dict(verbose=False, dry_run=False, prefix=True)
+
+    assert setup.run_group(group, tmp_path, fingerprints, **options)[:2] == (0, "ok")
+    reloaded = setup.Fingerprints(fingerprints.path)
+    monkeypatch.setattr(reloaded, "tool_version", lambda tool: "v20.0.0")
+    assert setup.run_group(group, tmp_path, reloaded, **options)[:2] == (0, "skipped")
+
+    (tmp_path / "package-lock.json").write_text('{"v": 2}', encoding="utf-8")
+    assert setup.run_group(group, tmp_path, reloaded, **options)[:2] == (0, "ok")
+    assert calls == [str(tmp_path), str(tmp_path)]
@@ -0,0 +1,75 @@
+"""Tests for the offline Snowflake stand-in server."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from python.bench.standin import StandInServer, StandInState, make_documents
+from python.cli.cache import DiskCache, MetadataCache
+from python.cli.describe_agent import build_agent_url, fetch_agent_metadata, list_agents
+from python.cli.rest import RestSession
+
+pytestmark = pytest.mark.standin(documents=5, words=60, agents_per_schema=3)
+
+
+def _statement(session: RestSession, server: StandInServer, sql: str, **extra: Any) -> Any:
+    body = json.dumps({"statement": sql, **extra}).encode("utf-8")
+    with session.post(f"{server.url}/api/v2/statements", body=body) as response:
+        return response.status, response.json()
+
+
+def test_agents_rest_endpoints_and_revalidation(standin: StandInServer, tmp_path: Any) -> None:
+    """describe_agent can list, describe and revalidate against the stand-in."""
+
+    with RestSession() as session:
+        refs = list_agents("acct", "DB", "S", "t", verbose=False, session=session, base_url=standin.url)
+        assert [ref.name for ref in refs] == ["DoctorChris", "AGENT_001", "AGENT_002"]
+
+        url = build_agent_url("acct", "DB", "S", "DoctorChris", base_url=standin.url)
+        cache = MetadataCache(DiskCache(tmp_path), ttl=0)
+        first = fetch_agent_metadata(url, "t", verbose=False, session=session, cache=cache)
+        second = fetch_agent_metadata(url, "t", verbose=False, session=session, cache=cache)
+        assert first == second and first["name"] == "DoctorChris"
+        assert standin.state.counts["describe_agent"] == 2
+
+
+def test_sql_api_answers_backend_statements(standin: StandInServer) -> None:
+    """The statements issued by server/src/index.js return plausible rows."""
+
+    with RestSession() as session:
+        status, result = _statement(
+            session,
+            standin,
+            "SELECT FILE_PATH, LENGTH(EXTRACTED_TEXT) AS TEXT_LENGTH FROM SFE_DOCUMENT_METADATA "
+            "WHERE EXTRACTION_TIMESTAMP > '2025-11-01 00:02:00' ORDER BY LAST_MODIFIED DESC",
+        )
+        assert status == 200
+        assert [column["name"] for column in result["resultSetMetaData"]["rowType"]] == ["FILE_PATH", "TEXT_LENGTH"]
+        assert [row[0] for row in result["data"]] == ["doc_00004.pdf", "doc_00003.pdf", "doc_00002.pdf"]
+
+        status, result = _statement(
+            session,
+            standin,
+            "SELECT AI_COMPLETE('mistral-large2', CONCAT(?, ?)) AS summary",
+            bindings={"1": {"type": "TEXT", "value": "Summarise"}, "2": {"type": "TEXT", "value": "long text"}},
+        )
+        assert result["resultSetMetaData"]["rowType"][0]["name"] == "SUMMARY"
+
+        status, result = _statement(session, standin, "SELECT COUNT(*) AS N, MAX(EXTRACTION_TIMESTAMP) AS V FROM SFE_DOCUMENT_METADATA")
+        assert result["data"] == [["5", "2025-11-01 00:04:45"]]
+
+        status, result = _statement(session, standin, "DROP TABLE SFE_DOCUMENT_METADATA")
+        assert status == 422
+
+
+def test_bindings_are_substituted_once_outside_literals() -> None:
+    """A ``?`` inside a bound value or a quoted literal is not a placeholder."""
+
+    state = StandInState(documents=make_documents(2, words=10))
+    kind, _, rows = state.execute("CALL ANSWER_DOCUMENT_QUESTION(?, ?)", ["Why? Who's 'it'?", "doc_00001.pdf"])
+    assert (kind, rows) == ("answer", [["Stand-in answer to: Why? Who's 'it'?"]])
+    _, _, rows = state.execute("CALL TRANSLATE_DOCUMENT(?, 'fr?')", ["doc_00001.pdf"])
+    assert rows[0][0].startswith("[fr?] ")
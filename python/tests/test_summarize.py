@@ -0,0 +1,114 @@
+"""Tests for map-reduce summarization and the SQL API client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from python.bench.standin import StandInState, make_documents, start_server
+from python.cli.cache import DiskCache
+from python.cli.rest import RestSession
+from python.cli.sqlapi import SqlApiClient
+from python.cli.summarize import MAP_PROMPT, REDUCE_PROMPT, Summarizer, split_text
+from python.cli.summarycache import DEFAULT_PROMPT
+
+
+class _SummarizeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list = []
+    prompts: list = []
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append(len(payload["content"]))
+        type(self).prompts.append(payload.get("prompt"))
+        body = json.dumps({"summary": f"S{len(payload['content'])}"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def backend_url() -> Iterator[str]:
+    _SummarizeHandler.requests = []
+    _SummarizeHandler.prompts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SummarizeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_split_text_respects_paragraphs_and_overlap() -> None:
+    """Chunks stay under the limit, break between paragraphs and repeat the tail."""
+
+    paragraphs = [f"para{index} " + "x" * 90 for index in range(30)]
+    chunks = split_text("\n\n".join(paragraphs), chunk_chars=500, overlap=120)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    assert chunks[0].startswith("para0 ") and chunks[-1].endswith(paragraphs[-1])
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous.split("\n\n")[-1] == current.split("\n\n")[0]
+
+    long_paragraph = "y" * 1200
+    assert [len(chunk) for chunk in split_text(long_paragraph, chunk_chars=500, overlap=100)] == [500, 500, 400]
+
+
+def test_summarizer_maps_reduces_and_caches(backend_url: str, tmp_path: Path) -> None:
+    """Every chunk is summarized once, reduced once, and served from cache on a rerun."""
+
+    text = "\n\n".join(f"Section {index}. " + "word " * 200 for index in range(12))
+    with RestSession() as session:
+        summarizer = Summarizer(
+            backend_url, chunk_chars=3000, overlap=0, concurrency=3, cache=DiskCache(tmp_path), session=session
+        )
+        result = asyncio.run(summarizer.summarize(text))
+        assert result["chunks"] == len(split_text(text, chunk_chars=3000, overlap=0))
+        assert result["requests"] == result["chunks"] + 1 and result["reduce_levels"] == 1
+        assert max(_SummarizeHandler.requests) <= 3000
+        assert _SummarizeHandler.prompts.count(MAP_PROMPT) == result["chunks"]
+        assert _SummarizeHandler.prompts[-1] == REDUCE_PROMPT
+
+        rerun = Summarizer(backend_url, chunk_chars=3000, overlap=0, cache=DiskCache(tmp_path), session=session)
+        again = asyncio.run(rerun.summarize(text))
+    assert again["summary"] == result["summary"]
+    assert again["requests"] == 0 and again["cache_hits"] == result["requests"]
+
+
+def test_single_chunk_uses_the_direct_summary_prompt(backend_url: str) -> None:
+    """Text that fits one request is summarized as a document, not as section summaries."""
+
+    with RestSession() as session:
+        result = asyncio.run(Summarizer(backend_url, session=session).summarize("A short report. " * 20))
+    assert result["chunks"] == 1 and _SummarizeHandler.prompts == [DEFAULT_PROMPT]
+
+
+def test_sql_api_client_binds_parameters() -> None:
+    """SqlApiClient returns rows keyed by column name from the stand-in."""
+
+    server = start_server(StandInState(documents=make_documents(3, words=40)))
+    try:
+        with RestSession() as session:
+            client = SqlApiClient("acct", "token", base_url=server.url, session=session)
+            rows = client.execute(
+                "SELECT FILE_NAME, EXTRACTED_TEXT FROM SFE_DOCUMENT_METADATA WHERE FILE_PATH = ?",
+                ["doc_00001.pdf"],
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(rows) == 1 and rows[0]["FILE_NAME"] == "doc_00001.pdf"
+    assert rows[0]["EXTRACTED_TEXT"]
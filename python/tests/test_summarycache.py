@@ -0,0 +1,102 @@
+"""Tests for the shared summary cache and its sidecar."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from python.cli.cache import DiskCache
+from python.cli.httpproxy import ProxyRequest, ProxyServer, ResponseWriter
+from python.cli.mirror import DocumentMirror
+from python.cli.rest import RestSession
+from python.cli.summarycache import SummaryCache, SummarySidecar, summary_key
+
+
+def test_single_flight_and_tiers(tmp_path: Path) -> None:
+    """Concurrent identical requests compute once; a new process reads the disk tier."""
+
+    calls: List[str] = []
+
+    def compute() -> str:
+        calls.append("x")
+        time.sleep(0.05)
+        return "summary"
+
+    cache = SummaryCache(DiskCache(tmp_path), memory_entries=1)
+    key = summary_key("m", "p", "text")
+    results: List[tuple[str, str]] = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(source for _, source in results) == ["computed"] + ["shared"] * 7
+    assert cache.get_or_compute(key, compute) == ("summary", "memory")
+
+    cache.get_or_compute(summary_key("m", "p", "other"), lambda: "second")
+    assert cache.get_or_compute(key, compute) == ("summary", "disk")  # evicted from the 1-entry LRU
+    assert SummaryCache(DiskCache(tmp_path)).get_or_compute(key, compute) == ("summary", "disk")
+    metrics = cache.metrics()
+    assert (metrics["misses"], metrics["shared"], metrics["memory"], metrics["disk"]) == (2, 7, 1, 1)
+    assert summary_key("m2", "p", "text") != key
+
+
+def test_errors_reach_waiters_and_are_not_cached() -> None:
+    cache = SummaryCache()
+
+    def fail() -> str:
+        raise RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError, match="backend down"):
+        cache.get_or_compute("k", fail)
+    assert cache.get_or_compute("k", lambda: "ok") == ("ok", "computed")
+    assert cache.metrics()["errors"] == 1
+
+
+def test_sidecar_serves_repeats_from_cache(tmp_path: Path) -> None:
+    """Content and mirrored stagePath requests are cached; other paths pass through."""
+
+    seen: List[dict] = []
+
+    def backend(request: ProxyRequest, writer: ResponseWriter) -> None:
+        if request.path == "/api/summarize":
+            payload = request.json()
+            seen.append(payload)
+            writer.send_json(200, {"summary": f"summary of {len(payload['content'])} chars"})
+        else:
+            writer.send_json(200, {"path": request.path})
+
+    with DocumentMirror(tmp_path / "mirror.sqlite") as mirror:
+        mirror.upsert([{"FILE_PATH": "report.pdf", "EXTRACTED_TEXT": "mirrored text"}])
+
+    upstream = ProxyServer(("127.0.0.1", 0), backend).start()
+    sidecar = SummarySidecar(SummaryCache(), upstream.url, mirror_path=tmp_path / "mirror.sqlite")
+    server = ProxyServer(("127.0.0.1", 0), sidecar).start()
+    try:
+        with RestSession() as session:
+
+            def post(payload: dict) -> tuple[str | None, dict]:
+                body = json.dumps(payload).encode("utf-8")
+                with session.post(f"{server.url}/api/summarize", body=body) as response:
+                    return response.header("X-Summary-Cache"), response.json()
+
+            assert post({"content": "abc", "prompt": "p"}) == ("computed", {"summary": "summary of 3 chars"})
+            assert post({"prompt": "p", "content": "abc"})[0] == "memory"
+            assert post({"stagePath": "report.pdf"})[1] == {"summary": "summary of 13 chars"}
+            assert post({"content": "mirrored text"})[0] == "memory"  # same text and default prompt
+            assert post({"stagePath": "unknown.pdf", "content": ""})[0] is None
+            with session.get(f"{server.url}/api/documents") as response:
+                assert response.json() == {"path": "/api/documents"}
+            with session.get(f"{server.url}/__cache/metrics") as response:
+                assert 'sfe_summary_cache_requests_total{source="memory"} 2' in response.text()
+    finally:
+        server.stop()
+        upstream.stop()
+    assert [payload.get("content") for payload in seen] == ["abc", "mirrored text", ""]
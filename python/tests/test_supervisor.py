@@ -0,0 +1,108 @@
+"""Tests for the backend/frontend process supervisor."""
+
+from __future__ import annotations
+
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from python.cli import master
+from python.cli.supervisor import ServiceSpec, Supervisor, format_report, port_in_use
+from python.cli.utils import Backoff
+
+SERVE_AFTER = """
+import http.server, sys, time
+time.sleep(float(sys.argv[2]))
+print("listening on", sys.argv[1], flush=True)
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    def log_message(self, *args):
+        pass
+http.server.HTTPServer(("127.0.0.1", int(sys.argv[1])), Handler).serve_forever()
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server(name: str, delay: float, tmp_path: Path) -> ServiceSpec:
+    port = _free_port()
+    command = [sys.executable, "-c", SERVE_AFTER, str(port), str(delay)]
+    return ServiceSpec(name, command, tmp_path, {}, f"http://127.0.0.1:{port}/health")
+
+
+def test_services_start_concurrently_and_report_cold_start(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    specs = [_server("backend", 0.4, tmp_path), _server("frontend", 0.4, tmp_path)]
+    supervisor = Supervisor(specs, ready_timeout=10, pid_dir=tmp_path / "pids")
+    started = time.monotonic()
+    try:
+        assert supervisor.start().wait_ready(10)
+        elapsed = time.monotonic() - started
+        assert (tmp_path / "pids" / "backend.pid").read_text().strip() == str(supervisor.services[0].process.pid)
+        report = supervisor.report()
+    finally:
+        supervisor.stop()
+
+    assert elapsed < 0.8 + 0.5  # launched side by side, not one after the other
+    assert [row["status"] for row in report["services"]] == ["ready", "ready"]
+    assert all(row["cold_start_ms"] >= 400 for row in report["services"])
+    assert report["all_ready_ms"] == max(row["cold_start_ms"] for row in report["services"])
+    assert "all services ready in" in format_report(report)
+    assert not (tmp_path / "pids" / "backend.pid").exists()
+    assert b"listening on" in (tmp_path / "pids" / "frontend.log").read_bytes()
+    assert "[backend] listening on" in capsys.readouterr().out
+    assert not any(port_in_use(urlsplit(spec.ready_url or "").port or 0) for spec in specs)
+
+
+def test_crashing_service_restarts_with_backoff_then_gives_up(tmp_path: Path) -> None:
+    crash = ServiceSpec("backend", [sys.executable, "-c", "print('boom'); raise SystemExit(3)"], tmp_path, {}, None)
+    supervisor = Supervisor(
+        [crash],
+        max_restarts=2,
+        backoff=lambda: Backoff(0.01, 0.05, rng=random.Random(0)),
+    )
+    supervisor.start()
+    assert supervisor.run() == 1
+    service = supervisor.services[0]
+    assert (service.status, service.restarts, service.launches, service.last_exit) == ("failed", 2, 3, 3)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX signals")
+def test_child_stopped_by_sigterm_is_not_restarted(tmp_path: Path) -> None:
+    """What tools/mac/04_stop.sh does to a child PID file ends the run instead of a restart."""
+
+    spec = _server("backend", 0.0, tmp_path)
+    supervisor = Supervisor([spec], pid_dir=tmp_path / "pids", backoff=lambda: Backoff(0.01, 0.05))
+    assert supervisor.start().wait_ready(10)
+    assert (tmp_path / "pids" / "supervisor.pid").read_text().strip() == str(os.getpid())
+    os.kill(int((tmp_path / "pids" / "backend.pid").read_text()), signal.SIGTERM)
+
+    assert supervisor.run() == 0
+    service = supervisor.services[0]
+    assert (service.status, service.launches, service.restarts) == ("stopped", 1, 0)
+    assert not (tmp_path / "pids" / "supervisor.pid").exists()
+
+
+def test_master_run_uses_supervisor_unless_script_requested(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    monkeypatch.setattr(master, "_run_script", lambda path, *args: calls.append((path, args)) or 0)
+    assert master.main(["run", "--script"]) == 0
+    folder, script = ("win", "02_start.bat") if sys.platform == "win32" else ("mac", "02_start.sh")
+    assert calls == [(str(Path(master.project_root) / "tools" / folder / script), ())]
+    assert Path(calls[0][0]).exists()
+
+    args = master.parse_args(["run", "--exit-when-ready"])
+    assert args.func is master._run and args.argv == ["--exit-when-ready"]
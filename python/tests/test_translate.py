@@ -0,0 +1,80 @@
+"""Tests for the batch translation command."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from python.bench.standin import StandInServer
+from python.cli import translate
+from python.cli.cache import DiskCache
+from python.cli.sqlapi import SqlApiClient
+
+
+def test_parse_languages() -> None:
+    assert translate.parse_languages("FR, de,fr,pt-BR") == ["fr", "de", "pt-br"]
+    with pytest.raises(Exception, match="language codes"):
+        translate.parse_languages("french!")
+
+
+def test_translator_caches_by_text_hash(standin: StandInServer, tmp_path: Path) -> None:
+    """Unchanged text is served from the cache; edited text is translated again."""
+
+    client = SqlApiClient("acct", "t", base_url=standin.url)
+    cache = DiskCache(tmp_path / "cache")
+    jobs, missing = translate.plan_jobs(client, ["fr", "de"], paths=["doc_00001.pdf", "doc_00002.pdf", "nope.pdf"])
+    assert missing == ["nope.pdf"] and len(jobs) == 4
+
+    first = translate.Translator(client, concurrency=3, cache=cache)
+    results = list(first.run(jobs))
+    assert first.calls == 4 and not any(result.cached or result.error for result in results)
+    assert {result.text.split()[0] for result in results} == {"[fr]", "[de]"}
+    assert standin.state.counts["translate"] == 4
+
+    standin.state.documents[1]["EXTRACTED_TEXT"] += " amended"
+    jobs, _ = translate.plan_jobs(client, ["fr", "de"], paths=["doc_00001.pdf", "doc_00002.pdf"])
+    second = translate.Translator(client, cache=cache)
+    results = list(second.run(jobs))
+    assert (second.calls, second.cache_hits) == (2, 2)
+    assert sorted(result.job.file_path for result in results if not result.cached) == ["doc_00001.pdf"] * 2
+
+
+def test_translate_main_writes_files(
+    standin: StandInServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(translate, "get_cache_dir", lambda name: tmp_path / name)
+    argv = ["--base-url", standin.url, "--token", "t", "-l", "es", "--output-dir", str(tmp_path / "out"), "--json"]
+
+    assert translate.main(argv) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 3 and not any(record["cached"] for record in records)
+    assert (tmp_path / "out" / "doc_00000.pdf.es.txt").read_text(encoding="utf-8").startswith("[es] ")
+
+    assert translate.main(argv) == 0
+    assert all(json.loads(line)["cached"] for line in capsys.readouterr().out.splitlines())
+
+
+def test_text_changed_during_the_call_is_not_cached(standin: StandInServer, tmp_path: Path) -> None:
+    """A translation of re-extracted text is returned but not filed under the planned hash."""
+
+    client = SqlApiClient("acct", "t", base_url=standin.url)
+    cache = DiskCache(tmp_path / "cache")
+    jobs, _ = translate.plan_jobs(client, ["fr"], paths=["doc_00001.pdf"])
+    standin.state.documents[1]["EXTRACTED_TEXT"] = "re-extracted between planning and the call"
+
+    translator = translate.Translator(client, cache=cache)
+    (result,) = translator.run(jobs)
+    assert result.text == "[fr] re-extracted between planning and the call" and result.error is None
+    assert cache.get(translator.cache_key(jobs[0].text_sha256, "fr")) is None
+
+
+def test_unexpected_client_error_is_an_error_result(tmp_path: Path) -> None:
+    class BrokenClient:
+        def execute(self, statement: str, bindings: object = None) -> list:
+            raise KeyError("data")
+
+    job = translate.TranslationJob("a.pdf", "fr", "abc")
+    (result,) = translate.Translator(BrokenClient(), cache=DiskCache(tmp_path)).run([job])  # type: ignore[arg-type]
+    assert (result.text, result.error) == ("", "'data'")
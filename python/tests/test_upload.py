@@ -0,0 +1,194 @@
+"""Tests for the bulk upload command."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from python.cli import upload
+from python.cli.dedup import DedupIndex, hash_file
+from python.cli.utils import Backoff
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length)
+        boundary = self.headers["Content-Type"].split("boundary=", 1)[1].encode("ascii")
+        assert body.endswith(b"\r\n--" + boundary + b"--\r\n")
+        name = body.split(b'filename="', 1)[1].split(b'"', 1)[0].decode("utf-8")
+        content = body.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n--", 1)[0]
+        self.server.received.append((name, content))  # type: ignore[attr-defined]
+        reply = json.dumps({"success": True, "stagePath": name}).encode("utf-8")
+        if name.startswith("proxy-"):
+            reply = b"<html>upstream proxy page</html>"
+        elif name.startswith("null-"):
+            reply = b"null"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        # Each uploaded file is "extracted" on the second listing after it arrives.
+        server = self.server
+        server.listings += 1  # type: ignore[attr-defined]
+        for name, _ in server.received:  # type: ignore[attr-defined]
+            seen = server.seen[name] = server.seen.get(name, 0) + 1  # type: ignore[attr-defined]
+            if seen == 2:
+                server.documents[name] = f"extracted-{server.listings}"  # type: ignore[attr-defined]
+        rows = [{"path": name, "extractedAt": value} for name, value in server.documents.items()]  # type: ignore[attr-defined]
+        reply = json.dumps(rows).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def backend() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UploadHandler)
+    server.received = []  # type: ignore[attr-defined]
+    server.documents = {}  # type: ignore[attr-defined]
+    server.seen = {}  # type: ignore[attr-defined]
+    server.listings = 0  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_upload_streams_files_and_resumes_from_manifest(backend: ThreadingHTTPServer, tmp_path: Path) -> None:
+    """Each file is uploaded once; edited files are picked up on the next run."""
+
+    docs = tmp_path / "docs"
+    (docs / "nested").mkdir(parents=True)
+    (docs / "a.txt").write_bytes(b"alpha")
+    (docs / "nested" / "b.pdf").write_bytes(os.urandom(300_000))
+    (docs / ".hidden").write_bytes(b"skip me")
+    argv = [
+        str(docs),
+        "--backend-url",
+        f"http://127.0.0.1:{backend.server_address[1]}",
+        "--manifest",
+        str(tmp_path / "manifest.jsonl"),
+        "--index",
+        str(tmp_path / "index.sqlite"),
+    ]
+    received: List[tuple[str, bytes]] = backend.received  # type: ignore[attr-defined]
+
+    assert upload.main(argv) == 0
+    assert sorted(name for name, _ in received) == ["a.txt", "b.pdf"]
+    assert dict(received)["b.pdf"] == (docs / "nested" / "b.pdf").read_bytes()
+
+    assert upload.main(argv) == 0
+    assert len(received) == 2
+
+    # Without the manifest the content index still recognises identical files.
+    assert upload.main(argv + ["--restart"]) == 0
+    assert len(received) == 2
+
+    (docs / "a.txt").write_bytes(b"alpha v2")
+    assert upload.main(argv) == 0
+    assert received[-1] == ("a.txt", b"alpha v2")
+
+
+def test_malformed_reply_fails_one_file_not_the_batch(backend: ThreadingHTTPServer, tmp_path: Path) -> None:
+    """A non-JSON or ``null`` 200 counts as a failure; the other files are still recorded."""
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_bytes(b"alpha")
+    (docs / "proxy-b.txt").write_bytes(b"beta")
+    (docs / "null-c.txt").write_bytes(b"gamma")
+    manifest = tmp_path / "manifest.jsonl"
+    argv = [str(docs), "--backend-url", f"http://127.0.0.1:{backend.server_address[1]}", "--manifest", str(manifest)]
+
+    assert upload.main(argv + ["--index", str(tmp_path / "index.sqlite")]) == 1
+    assert [json.loads(line)["stagePath"] for line in manifest.read_text().splitlines()] == ["a.txt"]
+
+
+def test_dedup_index_skips_identical_content(tmp_path: Path) -> None:
+    """Touching a file forces a hash; only changed bytes count as changed."""
+
+    document = tmp_path / "report.pdf"
+    document.write_bytes(b"quarterly numbers")
+    with DedupIndex(tmp_path / "index.sqlite") as index:
+        assert index.is_unchanged(document, "report.pdf") == (False, None)
+        index.record(document, "report.pdf")
+
+        assert index.is_unchanged(document, "report.pdf") == (True, None)
+
+        os.utime(document, ns=(1, 1))
+        unchanged, digest = index.is_unchanged(document, "report.pdf")
+        assert unchanged and digest == hash_file(document)
+
+        document.write_bytes(b"quarterly NUMBERS")
+        unchanged, digest = index.is_unchanged(document, "report.pdf")
+        assert not unchanged and digest == hash_file(document)
+
+
+def test_upload_wait_reports_searchable_latency(
+    backend: ThreadingHTTPServer, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """--wait polls one listing for the whole batch until new extractions appear."""
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (docs / name).write_text(name, encoding="utf-8")
+    backend.documents["a.txt"] = "from an earlier upload"  # type: ignore[attr-defined]
+    argv = [
+        str(docs),
+        "--backend-url",
+        f"http://127.0.0.1:{backend.server_address[1]}",
+        "--manifest",
+        str(tmp_path / "manifest.jsonl"),
+        "--no-dedup",
+        "--wait",
+        "--poll-interval",
+        "0.01",
+        "--poll-max",
+        "0.02",
+    ]
+
+    assert upload.main(argv) == 0
+    out = capsys.readouterr().out
+
+    assert sorted(line.split()[1] for line in out.splitlines() if line.startswith("READY")) == ["a.txt", "b.txt", "c.txt"]
+    assert "Upload-to-searchable latency over 3 file(s)" in out
+    # One baseline listing, then two polls cover all three files.
+    assert backend.listings == 3  # type: ignore[attr-defined]
+    assert backend.documents["a.txt"].startswith("extracted-")  # type: ignore[attr-defined]
+
+
+def test_backoff_grows_with_jitter_and_resets() -> None:
+    """Delays double up to the cap, stay within the jitter band and reset on progress."""
+
+    backoff = Backoff(1.0, 4.0, rng=random.Random(3))
+    delays = [backoff.next() for _ in range(5)]
+    for delay, nominal in zip(delays, (1, 2, 4, 4, 4)):
+        assert nominal / 2 <= delay <= nominal
+    backoff.reset()
+    assert backoff.next() <= 1.0
+
+
+def test_extraction_snapshot_rejects_a_non_list_reply(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A listing that is not a list of rows is a ValueError, which --wait counts as a failed poll."""
+
+    monkeypatch.setattr(upload, "request_json", lambda *args, **kwargs: {"error": "busy"})
+    with pytest.raises(ValueError, match="Unexpected document listing"):
+        upload.extraction_snapshot("http://backend/api/documents")
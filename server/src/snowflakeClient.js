@@ -37,6 +37,9 @@ export function getSnowflakeConnection() {
   const role = getOptionalEnv('SNOWFLAKE_ROLE');
   const warehouse = getOptionalEnv('SNOWFLAKE_WAREHOUSE');
   const region = getOptionalEnv('SNOWFLAKE_REGION');
+  // Point the driver at another endpoint, e.g. the local stand-in server
+  // (python -m python.bench.standin) for offline performance testing.
+  const accessUrl = getOptionalEnv('SNOWFLAKE_ACCESS_URL');
   const authType = getOptionalEnv('SNOWFLAKE_AUTH_TYPE') || 'password';
 
   const connectionConfig = {
@@ -67,6 +70,9 @@ export function getSnowflakeConnection() {
   if (region) {
     connectionConfig.region = region;
   }
+  if (accessUrl) {
+    connectionConfig.accessUrl = accessUrl;
+  }
 
   const connection = snowflake.createConnection(connectionConfig);
 
@@ -67,6 +67,8 @@ stop_by_port() {
 
 # Try to stop using PID files first
 if [ -d "$PIDS_DIR" ]; then
+    # 'master.py run' supervisor first, so it does not restart the services
+    stop_by_pid_file "Supervisor" "$PIDS_DIR/supervisor.pid"
     stop_by_pid_file "Backend" "$PIDS_DIR/backend.pid"
     stop_by_pid_file "Frontend" "$PIDS_DIR/frontend.pid"
 fi
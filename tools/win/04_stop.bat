@@ -20,6 +20,17 @@ echo   Stopping All Services
 echo ================================================================================
 echo.
 
+REM Stop the 'master.py run' supervisor and its children first, so nothing is restarted
+set PIDS_DIR=%~dp0..\..\.pids
+set SUPERVISOR_PID=
+if exist "%PIDS_DIR%\supervisor.pid" set /p SUPERVISOR_PID=<"%PIDS_DIR%\supervisor.pid"
+if defined SUPERVISOR_PID (
+    echo Stopping Supervisor, PID %SUPERVISOR_PID%
+    taskkill /F /T /PID %SUPERVISOR_PID% >nul 2>&1
+    del "%PIDS_DIR%\supervisor.pid" >nul 2>&1
+    set STOPPED_ANY=1
+)
+
 REM Stop Backend (Port 4000)
 for /f "tokens=5" %%a in ('netstat -ano ^| findstr ":%BACKEND_PORT% " ^| findstr "LISTENING"') do (
     echo Stopping Backend (PID: %%a)...